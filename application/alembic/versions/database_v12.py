@@ -0,0 +1,32 @@
+"""Switch the database to incremental auto vacuum.
+
+Revision ID: database_v12
+Revises:
+Create Date: 2026-10-19 09:40:02.281936
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "database_v12"
+down_revision = "database_v10"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # The mode of an existing database only changes with a full VACUUM, which would block startup
+    # for as long as it takes to rewrite the file. The actions retention job runs it once, the
+    # first time the agent is idle.
+    op.execute("PRAGMA auto_vacuum=INCREMENTAL")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != "sqlite":
+        return
+
+    # Takes effect with the next full VACUUM.
+    op.execute("PRAGMA auto_vacuum=NONE")
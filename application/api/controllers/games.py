@@ -1,9 +1,14 @@
+import sqlalchemy.exc as exc
+
 from flask import request
 from sqlalchemy import desc
 
 from application.common import logger, toolbox
+from application.common.constants import FileModes
+from application.common.exceptions import InvalidUsage
 from application.extensions import DATABASE
 from application.models.actions import Actions
+from application.models.game_arguments import GameArguments
 from application.models.games import Games
 
 
@@ -12,36 +17,31 @@ def get_all_games(add_server_status=False):
     page = request.args.get("page", 1, type=int)
     per_page = min(request.args.get("per_page", 10, type=int), 1000000)
 
+    # Ordered by the primary key, so the pages include cursors for keyset pagination.
     games_dict = Games.to_collection_dict(
-        Games.query, page, per_page, "game.get_all_games"
+        Games.query.order_by(Games.game_id), page, per_page, "game.get_all_games"
     )
 
-    # For a server with 2-5 games, this for loop is not a problem.  The author knows that
-    # a join is more optimal for database items.
     game_items = games_dict["items"]
 
-    # Mixin other items, like actions
-    for game in game_items:
-        actions_qry = Actions.query.filter_by(game_id=game["game_id"]).order_by(
-            desc(Actions.timestamp)
-        )
+    # Keyset pages have no page number, like the games, their actions start at the latest.
+    actions_page = games_dict["_meta"]["page"] or 1
 
-        # This wil get the first per_page items (10 by default)
-        actions_dict = Actions.to_collection_dict(
-            actions_qry, page, per_page, "game.get_all_games"
-        )
-        game["actions"] = actions_dict["items"]
+    # Mixin other items, like actions. This wil get the first per_page items (10 by default) of
+    # every game with one query.
+    latest_actions = Actions.get_latest_by_game(
+        [game["game_id"] for game in game_items], actions_page, per_page
+    )
+
+    for game in game_items:
+        game["actions"] = latest_actions[game["game_id"]]
 
     if add_server_status:
+        # Resolve every game server in one go, rather than one process table scan per game.
+        statuses = toolbox._get_game_server_statuses(game_items)
+
         for game in game_items:
-            # From .py file not db.
-            game_obj = toolbox._get_supported_game_object(game["game_name"])
-            game["game_exe"] = game_obj._game_executable
-            has_pid = True if game["game_pid"] != "null" else False
-            is_exe_found = toolbox._get_proc_by_name(game_obj._game_executable)
-            game["game_status"] = (
-                "Running" if is_exe_found and has_pid else "Not Running"
-            )
+            game.update(statuses[game["game_name"]])
 
     return games_dict
 
@@ -50,7 +50,12 @@ def get_all_games(add_server_status=False):
 def get_game_by_name(game_name):
     game_query = Games.query.filter_by(game_name=game_name)
     game_dict = Games.to_collection_dict(
-        game_query, 1, 1, "game.get_game_by_name", game_name=game_name
+        game_query,
+        1,
+        1,
+        "game.get_game_by_name",
+        from_request=False,
+        game_name=game_name,
     )
 
     if len(game_dict["items"]) == 0:
@@ -58,12 +63,19 @@ def get_game_by_name(game_name):
 
     game_item = game_dict["items"][0]
     actions_qry = Actions.query.filter_by(game_id=game_item["game_id"]).order_by(
-        desc(Actions.timestamp)
+        desc(Actions.timestamp), desc(Actions.action_id)
     )
 
     # This wil get the first per_page items (10 by default)
     actions_dict = Actions.to_collection_dict(
-        actions_qry, 1, 10, "game.get_game_by_name", game_name=game_name
+        actions_qry,
+        1,
+        10,
+        "game.get_game_by_name",
+        cursor_column=Actions.timestamp,
+        descending=True,
+        from_request=False,
+        game_name=game_name,
     )
     game_dict["actions"] = actions_dict["items"]
 
@@ -92,21 +104,15 @@ def get_game_server_status(game_name: str) -> str:
     if game_obj is None:
         return response
 
-    game_data = toolbox._get_supported_game_object(game_name)
-    exe_name = game_data._game_executable
-
-    game_pid = game_obj.game_pid
-    is_exe_found = True if toolbox._get_proc_by_name(exe_name) is not None else False
-    is_valid_pid = True if game_pid is not None else False
-    is_running = is_exe_found and is_valid_pid
-    status = "Running" if is_running else "Not Running"
+    game_status = toolbox._get_game_server_statuses([game_obj.to_dict()])[game_name]
 
     response.update(
         {
-            "is_exe_found": is_exe_found,
-            "is_valid_pid": is_valid_pid,
-            "is_running": is_running,
-            "status": status,
+            "is_exe_found": game_status["is_exe_found"],
+            "is_valid_pid": game_status["is_valid_pid"],
+            "is_pid_alive": game_status["is_pid_alive"],
+            "is_running": game_status["game_status"] == "Running",
+            "status": game_status["game_status"],
         }
     )
 
@@ -131,3 +137,168 @@ def update_game(game_id: int, request) -> bool:
         return False
 
     return True
+
+
+ARGUMENT_FLAG_FIELDS = ["required", "is_permanent", "use_equals", "use_quotes"]
+
+
+@staticmethod
+def _get_file_mode(file_mode) -> int:
+    try:
+        mode = int(file_mode)
+    except (TypeError, ValueError):
+        mode = None
+
+    if mode not in [m.value for m in FileModes]:
+        raise InvalidUsage("Bad Request: Invalid File Mode Provied!", status_code=400)
+
+    return mode
+
+
+@staticmethod
+def _apply_argument_fields(arg_obj: GameArguments, item: dict) -> bool:
+    """Copy the given fields of one bulk item onto an argument. Returns True if anything changed."""
+    new_values = {}
+
+    if "game_arg" in item:
+        new_values["game_arg"] = item["game_arg"]
+
+    if "game_arg_value" in item:
+        new_values["game_arg_value"] = str(item["game_arg_value"])
+
+    for field in ARGUMENT_FLAG_FIELDS:
+        if field in item:
+            new_values[field] = bool(item[field])
+
+    if "file_mode" in item:
+        new_values["file_mode"] = _get_file_mode(item["file_mode"])
+
+    is_changed = False
+
+    for field, value in new_values.items():
+        if getattr(arg_obj, field) != value:
+            setattr(arg_obj, field, value)
+            is_changed = True
+
+    return is_changed
+
+
+@staticmethod
+def bulk_update_arguments(game_name: str, arguments: list) -> dict:
+    """
+    Create, update and delete many arguments of one game in a single transaction.
+
+    Each item is matched to an existing argument by game_arg_id, otherwise by game_arg. Matched
+    arguments are updated, or deleted when the item has "delete": true, and the rest are created.
+    Either every item is applied or none are.
+    """
+    if not isinstance(arguments, list):
+        raise InvalidUsage("Bad Request: Expected a list of arguments", status_code=400)
+
+    game_obj = Games.query.filter_by(game_name=game_name).first()
+
+    if game_obj is None:
+        raise InvalidUsage(
+            f"Bad Request: Game Name {game_name} does not exist!", status_code=400
+        )
+
+    # One query for every existing argument of this game.
+    existing_args = GameArguments.query.filter_by(game_id=game_obj.game_id).all()
+    args_by_id = {arg.game_arg_id: arg for arg in existing_args}
+    args_by_name = {arg.game_arg: arg for arg in existing_args}
+
+    results = []
+
+    try:
+        for item in arguments:
+            if not isinstance(item, dict):
+                raise InvalidUsage(
+                    "Bad Request: Each argument must be an object", status_code=400
+                )
+
+            if "game_arg_id" in item:
+                arg_obj = args_by_id.get(item["game_arg_id"], None)
+
+                if arg_obj is None:
+                    raise InvalidUsage(
+                        f"Bad Request: Argument ID {item['game_arg_id']} does not exist "
+                        f"for {game_name}!",
+                        status_code=400,
+                    )
+            elif "game_arg" in item:
+                arg_obj = args_by_name.get(item["game_arg"], None)
+            else:
+                raise InvalidUsage(
+                    "Bad Request: Missing Argument Name", status_code=400
+                )
+
+            if item.get("delete", False):
+                if arg_obj is None:
+                    raise InvalidUsage(
+                        f"Bad Request: Argument {item['game_arg']} does not exist!",
+                        status_code=400,
+                    )
+
+                if arg_obj.is_permanent:
+                    raise InvalidUsage(
+                        "Bad Request: Cannot Delete a permanent Argument!",
+                        status_code=400,
+                    )
+
+                DATABASE.session.delete(arg_obj)
+                args_by_id.pop(arg_obj.game_arg_id, None)
+                args_by_name.pop(arg_obj.game_arg, None)
+                results.append((arg_obj, "deleted"))
+                continue
+
+            if arg_obj is None:
+                if "game_arg_value" not in item:
+                    raise InvalidUsage(
+                        "Bad Request: Missing Argument Value", status_code=400
+                    )
+
+                arg_obj = GameArguments()
+                arg_obj.game_id = game_obj.game_id
+                _apply_argument_fields(arg_obj, item)
+                DATABASE.session.add(arg_obj)
+                args_by_name[arg_obj.game_arg] = arg_obj
+                results.append((arg_obj, "created"))
+                continue
+
+            old_name = arg_obj.game_arg
+
+            if _apply_argument_fields(arg_obj, item):
+                args_by_name.pop(old_name, None)
+                args_by_name[arg_obj.game_arg] = arg_obj
+                results.append((arg_obj, "updated"))
+            else:
+                results.append((arg_obj, "unchanged"))
+
+        # Flush to assign the new IDs, and read them before the commit expires the objects.
+        DATABASE.session.flush()
+
+        response = {"created": [], "updated": [], "deleted": [], "unchanged": []}
+        items = []
+
+        for arg_obj, result in results:
+            response[result].append(arg_obj.game_arg_id)
+            items.append(
+                {
+                    "game_arg_id": arg_obj.game_arg_id,
+                    "game_arg": arg_obj.game_arg,
+                    "result": result,
+                }
+            )
+
+        response["items"] = items
+
+        DATABASE.session.commit()
+    except InvalidUsage:
+        DATABASE.session.rollback()
+        raise
+    except exc.DatabaseError as error:
+        logger.error(str(error))
+        DATABASE.session.rollback()
+        raise InvalidUsage("Bad Request: Unable to update arguments.", status_code=400)
+
+    return response
@@ -8,8 +8,9 @@ from application.common import logger, constants
 from application.common.authorization import _verify_bearer_token
 from application.common.decorators import authorization_required
 from application.common.exceptions import InvalidUsage
+from application.common.settings_cache import SETTINGS_CACHE
+from application.common.token_cache import TOKEN_CACHE
 from application.extensions import DATABASE
-from application.models.settings import Settings
 from application.models.tokens import Tokens
 
 access = Blueprint("access", __name__, url_prefix="/v1")
@@ -56,11 +57,9 @@ def token_generate():
     if token_obj:
         raise InvalidUsage("Error: Token by that name already exists!", status_code=400)
 
-    secret_obj = Settings.query.filter_by(
-        setting_name=constants.SETTING_NAME_APP_SECRET
-    ).first()
+    secret_value = SETTINGS_CACHE.get(constants.SETTING_NAME_APP_SECRET)
 
-    validator = TokenValidator(secret_obj.setting_value, constants.APP_NAME)
+    validator = TokenValidator(secret_value, constants.APP_NAME)
 
     computed_token = validator.generate_access_token(new_token_name)
 
@@ -139,6 +138,8 @@ def token_invalidate():
             "Error: Database error while invalidating token!", status_code=500
         )
 
+    TOKEN_CACHE.invalidate(token_to_invalidate)
+
     return "Success", 200
 
 
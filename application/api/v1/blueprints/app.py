@@ -7,10 +7,13 @@ from flask import Blueprint, jsonify, request, current_app
 from flask.views import MethodView
 
 from application.api.controllers import app as app_controller
-from application.common import logger
+from application.common import constants, logger
 from application.common.decorators import authorization_required
 from application.common.exceptions import InvalidUsage
+from application.common.settings_cache import SETTINGS_CACHE
+from application.common.token_cache import TOKEN_CACHE
 from application.extensions import DATABASE
+from application.managers.install_scheduler import INSTALL_SCHEDULER
 from application.models.settings import Settings
 
 app = Blueprint("app", __name__, url_prefix="/v1")
@@ -28,8 +31,25 @@ def get_version():
 
 @app.route("/thread/status/<int:ident>", methods=["GET"])
 def is_thread_alive(ident: int):
+    """
+    Whether a thread, or install job, is still running. With the wait query parameter, in seconds,
+    this blocks until it is done or the wait runs out, instead of answering right away.
+    """
     logger.debug("Checking thread!")
-    is_alive = any([th for th in threading.enumerate() if th.ident == ident])
+    wait_sec = request.args.get("wait", 0.0, type=float)
+    wait_sec = min(max(wait_sec, 0.0), constants.LONG_POLL_MAX_SECONDS)
+
+    # Steam installs and updates hand out their install job id as the thread ident.
+    if INSTALL_SCHEDULER.is_job_active(ident):
+        is_alive = not INSTALL_SCHEDULER.wait_for_job(ident, wait_sec)
+    else:
+        thread = next((th for th in threading.enumerate() if th.ident == ident), None)
+
+        if thread is not None and wait_sec > 0:
+            thread.join(wait_sec)
+
+        is_alive = thread is not None and thread.is_alive()
+
     message = f"Thread ID - Still alive: {is_alive}"
     logger.debug(message)
     return jsonify({"alive": is_alive})
@@ -45,14 +65,24 @@ class SettingsApi(MethodView):
     def __init__(self, model):
         self.model = model
 
+    def _get_all(self):
+        # The settings version is kept by the agent itself, clients cannot see or change it.
+        return self.model.query.filter(
+            self.model.setting_name != constants.SETTING_NAME_SETTINGS_VERSION
+        )
+
     def _get_setting(self, setting_id: int):
-        return self.model.query.filter_by(setting_id=setting_id)
+        return self._get_all().filter_by(setting_id=setting_id)
 
     def _get_setting_by_name(self, setting_name: str):
-        return self.model.query.filter_by(setting_name=setting_name)
+        return self._get_all().filter_by(setting_name=setting_name)
 
-    def _get_all(self):
-        return self.model.query
+    @staticmethod
+    def _check_not_protected(setting_name: str) -> None:
+        if setting_name == constants.SETTING_NAME_SETTINGS_VERSION:
+            raise InvalidUsage(
+                "Forbidden: The settings version cannot be changed.", status_code=403
+            )
 
     @authorization_required
     def get(self, setting_id=None, setting_name=None):
@@ -92,18 +122,26 @@ class SettingsApi(MethodView):
         elif "setting_value" not in payload:
             raise InvalidUsage("Bad Request: Missing Setting Value", status_code=400)
 
+        self._check_not_protected(payload["setting_name"])
+
         new_setting = Settings()
         new_setting.setting_name = payload["setting_name"]
         new_setting.setting_value = payload["setting_value"]
 
         try:
             DATABASE.session.add(new_setting)
+            SETTINGS_CACHE.bump_version()
             DATABASE.session.commit()
         except exc.DatabaseError as err:
             logger.error(str(err))
             DATABASE.session.rollback()
             return "Cannot add duplicate entry.", 400
 
+        SETTINGS_CACHE.reload()
+
+        if new_setting.setting_name == constants.SETTING_NAME_APP_SECRET:
+            TOKEN_CACHE.clear()
+
         return jsonify({"setting_id": new_setting.setting_id})
 
     @authorization_required
@@ -120,15 +158,34 @@ class SettingsApi(MethodView):
         elif "setting_value" not in payload:
             raise InvalidUsage("Bad Request: Missing Setting Value", status_code=400)
 
+        self._check_not_protected(setting_name)
+        self._check_not_protected(payload["setting_name"])
+
         qry.update(payload)
+        SETTINGS_CACHE.bump_version()
         DATABASE.session.commit()
 
+        SETTINGS_CACHE.reload()
+
+        # Tokens verified with the old secret must be verified again.
+        if constants.SETTING_NAME_APP_SECRET in [setting_name, payload["setting_name"]]:
+            TOKEN_CACHE.clear()
+
         return "Success"
 
-    def delete(self, setting_id):
-        qry = self._get_setting(setting_id)
-        DATABASE.session.delete(qry)
+    @authorization_required
+    def delete(self, setting_id=None, setting_name=None):
+        setting_obj = self._get_setting(setting_id).first()
+
+        if setting_obj is None:
+            raise InvalidUsage("Not Found: No such setting", status_code=404)
+
+        DATABASE.session.delete(setting_obj)
+        SETTINGS_CACHE.bump_version()
         DATABASE.session.commit()
+
+        SETTINGS_CACHE.reload()
+
         return "", 204
 
 
@@ -5,7 +5,7 @@ from flask import Blueprint, jsonify, current_app
 
 from application.common import logger
 from application.common.decorators import authorization_required
-from application.managers.steam_manager import SteamUpdateManager
+from application.managers.update_checker import UPDATE_CHECKER
 from application.api.controllers import architect as architect_controller
 from application.api.controllers import games as games_controller
 
@@ -29,7 +29,6 @@ def health_secure():
 @architect.route("/agent/info", methods=["GET"])
 @authorization_required
 def agent_info():
-    steam_mgr = SteamUpdateManager()
     info = {}
 
     platform_dict = architect_controller.get_platform_info()
@@ -42,24 +41,21 @@ def agent_info():
     with open(version_file, "r") as file:
         version_data = yaml.safe_load(file)
 
-    # TODO - Tech Debt: Update agent info page to get this info over websocket. Works for now
-    # but does not scale.
-    for game in games:
-        game_steam_id = game["game_steam_id"]
-        try:
-            update_dict = steam_mgr.is_update_required(
-                game["game_steam_build_id"],
-                game["game_steam_build_branch"],
-                game_steam_id,
-            )
-            game["update_required"] = update_dict["is_required"]
-            game["update_required_error"] = update_dict["error"]
-        except Exception:
+    # Served from the latest scheduled update checks. A game that could not be checked is marked
+    # as an error, one that was not checked yet as pending.
+    update_dicts = UPDATE_CHECKER.get_update_dicts(games)
+
+    for game, update_dict in zip(games, update_dicts):
+        if update_dict is None:
             game["update_required"] = "ERROR"
-            logger.error(
-                f"Unable to retrieve game info for game_steam_id: {game_steam_id}",
-                exc_info=True,
-            )
+            continue
+
+        if update_dict["is_pending"]:
+            game["update_required"] = "PENDING"
+            continue
+
+        game["update_required"] = update_dict["is_required"]
+        game["update_required_error"] = update_dict["error"]
 
     info: dict = platform_dict
     info.update({"games": games})
@@ -10,7 +10,8 @@ from application.common.decorators import authorization_required
 from application.common.exceptions import InvalidUsage
 from application.common.game_base import BaseGame
 from application.extensions import DATABASE
-from application.managers.steam_manager import SteamUpdateManager
+from application.managers.game_supervisor import GAME_SUPERVISOR
+from application.managers.update_checker import UPDATE_CHECKER
 from application.models.games import Games
 from application.models.game_arguments import GameArguments
 
@@ -91,6 +92,9 @@ def game_startup(game_name):
 
     game.startup()
 
+    # Let the supervisor notice right away if the game server exits on its own.
+    GAME_SUPERVISOR.watch_game(game_name)
+
     return jsonify("Success")
 
 
@@ -106,6 +110,7 @@ def game_shutdown(game_name):
         logger.error(message)
         raise InvalidUsage(message, status_code=400)
 
+    GAME_SUPERVISOR.unwatch_game(game_name)
     game.shutdown()
 
     return jsonify("Success")
@@ -123,10 +128,23 @@ def game_uninstall(game_name):
         raise InvalidUsage(message, status_code=400)
 
     # Going to issue shutdown command... just because.
+    GAME_SUPERVISOR.unwatch_game(game_name)
     game.shutdown()
 
-    if game.uninstall():
-        return jsonify("Success")
+    # The installation files are deleted in the background, the caller can poll the thread
+    # status with the thread ident. The tombstone is gone once the files are, files a crash
+    # leaves behind are swept at the next startup.
+    delete_thread = game.uninstall()
+
+    if delete_thread:
+        return jsonify(
+            {
+                "thread_name": delete_thread.name,
+                "thread_ident": delete_thread.ident,
+                "tombstone": delete_thread.tombstone_path,
+                "activity": "uninstall",
+            }
+        )
     else:
         message = (
             f"/game/uninstall - Error: {game_name} did not uninstall sucessfully..."
@@ -147,16 +165,19 @@ def game_check_for_update(game_id: int):
         logger.critical(message)
         raise InvalidUsage(message, status_code=400)
 
-    steam_mgr = SteamUpdateManager()
-
-    try:
-        app_info = steam_mgr.is_update_required(
-            game_obj.game_steam_build_id,
-            game_obj.game_steam_build_branch,
-            game_obj.game_steam_id,
-        )
-    except Exception as error:
-        logger.critical(error)
+    # Served from the latest scheduled update check. Until the first check of a new game is done,
+    # is_pending is True and is_required is None.
+    app_info = UPDATE_CHECKER.get_update_dicts(
+        [
+            {
+                "game_steam_id": game_obj.game_steam_id,
+                "game_steam_build_id": game_obj.game_steam_build_id,
+                "game_steam_build_branch": game_obj.game_steam_build_branch,
+            }
+        ]
+    )[0]
+
+    if app_info is None:
         raise InvalidUsage(
             "Unable to determine if update is required.", status_code=500
         )
@@ -216,9 +237,13 @@ class GameArgumentsApi(MethodView):
             )
 
     @authorization_required
-    def post(self):
+    def post(self, game_name=None):
         payload = request.json
 
+        # Bulk create, update and delete of a game's arguments in one transaction.
+        if game_name:
+            return jsonify(games_controller.bulk_update_arguments(game_name, payload))
+
         if "game_arg" not in payload:
             raise InvalidUsage("Bad Request: Missing Argument Name", status_code=400)
         if "game_arg_value" not in payload:
@@ -336,3 +361,8 @@ game.add_url_rule(
     defaults={"game_arg_id": None},
     methods=["GET", "PATCH"],
 )
+game.add_url_rule(
+    "/game/<string:game_name>/arguments/bulk",
+    view_func=GameArgumentsApi.as_view("game_arguments_bulk", GameArguments),
+    methods=["POST"],
+)
@@ -1,17 +1,42 @@
+import orjson
+
 from datetime import datetime
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 
-from application.common import logger
+from application.common import constants, logger
 from application.common.constants import GameActionTypes
 from application.common.decorators import authorization_required
 from application.common.exceptions import InvalidUsage
 from application.extensions import DATABASE
+from application.managers.install_progress import INSTALL_PROGRESS
+from application.managers.install_scheduler import ACTIVE_STATES, INSTALL_SCHEDULER
 from application.managers.steam_manager import SteamManager
 from application.models.actions import Actions
 from application.models.games import Games
+from application.models.install_jobs import InstallJobs
 
 steam = Blueprint("steam", __name__, url_prefix="/v1")
 
+# Comment lines keep idle event streams from being closed by proxies.
+JOB_EVENTS_KEEPALIVE_SECONDS = 15.0
+
+
+def _get_validate(payload: dict) -> bool:
+    """Read the optional validate flag of a payload, as a JSON boolean or "true", "false", 1, 0."""
+    validate = payload.get("validate", False)
+
+    if isinstance(validate, bool):
+        return validate
+
+    if str(validate).lower() in ["1", "true"]:
+        return True
+    elif str(validate).lower() in ["0", "false"]:
+        return False
+
+    message = f"Error: Invalid value for validate: {validate}"
+    logger.error(message)
+    raise InvalidUsage(message, status_code=400)
+
 
 ###############################################################################
 ###############################################################################
@@ -42,18 +67,20 @@ def steam_app_install():
         raise InvalidUsage(message, status_code=400)
 
     steam_id = payload["steam_id"]
+    validate = _get_validate(payload)
 
     try:
-        steam_mgr = SteamManager(payload["steam_install_path"])
+        steam_mgr = SteamManager.get_instance(payload["steam_install_path"])
     except Exception as error:
         logger.critical(error)
         return "Error", 500
 
-    install_thread = steam_mgr.install_steam_app(
+    job = steam_mgr.install_steam_app(
         steam_id,
         payload["install_dir"],
         payload["user"],
         payload["password"],
+        validate=validate,
     )
 
     game_obj = Games.query.filter_by(
@@ -64,7 +91,7 @@ def steam_app_install():
         new_action = Actions()
         new_action.type = GameActionTypes.INSTALLING.value
         new_action.game_id = game_obj.game_id
-        new_action.result = install_thread.native_id
+        new_action.result = job["job_id"]
         DATABASE.session.add(new_action)
         DATABASE.session.commit()
     except Exception:
@@ -82,8 +109,11 @@ def steam_app_install():
 
     return jsonify(
         {
-            "thread_name": install_thread.name,
-            "thread_ident": install_thread.native_id,
+            "job_id": job["job_id"],
+            "is_coalesced": job["is_coalesced"],
+            "is_validate_applied": job["is_validate_applied"],
+            # Older clients poll /thread/status with this, which also knows job ids.
+            "thread_ident": job["job_id"],
             "activity": "install",
         }
     )
@@ -111,18 +141,20 @@ def steam_app_update():
         raise InvalidUsage(message, status_code=400)
 
     steam_id = payload["steam_id"]
+    validate = _get_validate(payload)
 
     try:
-        steam_mgr = SteamManager(payload["steam_install_path"])
+        steam_mgr = SteamManager.get_instance(payload["steam_install_path"])
     except Exception as error:
         logger.critical(error)
         return "Error", 500
 
-    update_thread = steam_mgr.update_steam_app(
+    job = steam_mgr.update_steam_app(
         steam_id,
         payload["install_dir"],
         payload["user"],
         payload["password"],
+        validate=validate,
     )
 
     game_qry = Games.query.filter_by(
@@ -134,7 +166,7 @@ def steam_app_update():
         new_action = Actions()
         new_action.type = GameActionTypes.UPDATING.value
         new_action.game_id = game_obj.game_id
-        new_action.result = update_thread.native_id
+        new_action.result = job["job_id"]
         game_obj.game_last_update = datetime.now()
         DATABASE.session.add(new_action)
         DATABASE.session.commit()
@@ -153,13 +185,121 @@ def steam_app_update():
 
     return jsonify(
         {
-            "thread_name": update_thread.name,
-            "thread_ident": update_thread.native_id,
-            "activity": "install",
+            "job_id": job["job_id"],
+            "is_coalesced": job["is_coalesced"],
+            "is_validate_applied": job["is_validate_applied"],
+            # Older clients poll /thread/status with this, which also knows job ids.
+            "thread_ident": job["job_id"],
+            "activity": "update",
         }
     )
 
 
+@steam.route("/steam/app/progress", methods=["GET"])
+@authorization_required
+def steam_app_progress_all():
+    """Progress of the latest install and update jobs, without their output lines."""
+    return jsonify(
+        [
+            progress.to_dict(include_lines=False)
+            for progress in INSTALL_PROGRESS.get_all()
+        ]
+    )
+
+
+@steam.route("/steam/app/progress/<int:job_id>", methods=["GET"])
+@authorization_required
+def steam_app_progress(job_id):
+    """Live progress of one install or update job, while the agent still has it in memory."""
+    progress = INSTALL_PROGRESS.get(job_id)
+
+    if progress is None:
+        message = f"Error: No install progress for job {job_id}"
+        logger.error(message)
+        raise InvalidUsage(message, status_code=404)
+
+    return jsonify(progress.to_dict())
+
+
+@steam.route("/steam/app/job/<int:job_id>", methods=["GET"])
+@authorization_required
+def steam_app_job(job_id):
+    """Stored state of one install or update job."""
+    job_obj = InstallJobs.query.filter_by(job_id=job_id).first()
+
+    if job_obj is None:
+        message = f"Error: No install job {job_id}"
+        logger.error(message)
+        raise InvalidUsage(message, status_code=404)
+
+    return jsonify(job_obj.to_dict())
+
+
+@steam.route("/steam/app/job/<int:job_id>/wait", methods=["GET"])
+@authorization_required
+def steam_app_job_wait(job_id):
+    """
+    Long poll for one install or update job. Blocks until the job is done or the timeout, in
+    seconds, runs out, then returns the stored job. Check is_finished to tell the two apart.
+    """
+    timeout = request.args.get(
+        "timeout", constants.LONG_POLL_DEFAULT_SECONDS, type=float
+    )
+    timeout = min(max(timeout, 0.0), constants.LONG_POLL_MAX_SECONDS)
+
+    job_obj = InstallJobs.query.filter_by(job_id=job_id).first()
+
+    if job_obj is None:
+        message = f"Error: No install job {job_id}"
+        logger.error(message)
+        raise InvalidUsage(message, status_code=404)
+
+    if job_obj.state in ACTIVE_STATES:
+        INSTALL_SCHEDULER.wait_for_job(job_id, timeout)
+        DATABASE.session.refresh(job_obj)
+
+    job_dict = job_obj.to_dict()
+    job_dict["is_finished"] = job_obj.state not in ACTIVE_STATES
+
+    return jsonify(job_dict)
+
+
+@steam.route("/steam/app/job/events", methods=["GET"])
+@authorization_required
+def steam_app_job_events():
+    """
+    Server-sent event stream of install and update job state changes. Reconnecting clients send
+    the Last-Event-ID header, or the after query parameter, to pick up where they left off.
+    """
+    after_event_id = request.headers.get("Last-Event-ID", type=int)
+
+    if after_event_id is None:
+        after_event_id = request.args.get(
+            "after", INSTALL_SCHEDULER.get_last_event_id(), type=int
+        )
+
+    def generate(last_event_id: int):
+        while True:
+            events = INSTALL_SCHEDULER.get_events(
+                last_event_id, JOB_EVENTS_KEEPALIVE_SECONDS
+            )
+
+            if len(events) == 0:
+                yield ": keepalive\n\n"
+                continue
+
+            for event in events:
+                last_event_id = event["event_id"]
+                data = orjson.dumps(event).decode("utf-8")
+                yield f"id: {last_event_id}\nevent: job\ndata: {data}\n\n"
+
+    return Response(
+        generate(after_event_id),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 # TODO - Deprecate this - Was implemented in game_base. No longer needed.
 @steam.route("/steam/app/remove", methods=["POST"])
 @authorization_required
@@ -187,7 +327,7 @@ def steam_app_get_build_id():
     steam_install_path = payload["steam_install_path"]
     game_install_path = payload["game_install_path"]
 
-    steam_mgr = SteamManager(steam_install_path, force_steam_install=False)
+    steam_mgr = SteamManager.get_instance(steam_install_path, force_steam_install=False)
     app_info = steam_mgr.get_build_id_from_app_manifest(game_install_path, steam_id)
 
     return jsonify(app_info)
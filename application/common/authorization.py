@@ -3,7 +3,8 @@ import jwt
 from flask.wrappers import Request
 
 from application.common import constants
-from application.models.settings import Settings
+from application.common.settings_cache import SETTINGS_CACHE
+from application.common.token_cache import TOKEN_CACHE
 from application.models.tokens import Tokens
 
 
@@ -14,9 +15,8 @@ def _get_token(bearer_token: str) -> Tokens:
     return token_lookup
 
 
-def _get_setting(setting_name: str) -> Settings:
-    setting_lookup = Settings.query.filter_by(setting_name=setting_name).first()
-    return setting_lookup
+def _get_setting(setting_name: str) -> str:
+    return SETTINGS_CACHE.get(setting_name)
 
 
 def _verify_bearer_token(request: Request) -> int:
@@ -36,6 +36,10 @@ def _verify_bearer_token(request: Request) -> int:
 
     bearer_token = auth.split("Bearer")[-1].strip()
 
+    # Already verified recently, no need to hit the database or decode it again.
+    if TOKEN_CACHE.get(bearer_token) is not None:
+        return 200
+
     # Make sure it's there first...
     token_lookup = _get_token(bearer_token)
 
@@ -43,12 +47,10 @@ def _verify_bearer_token(request: Request) -> int:
         return 403
 
     # Next decode this bad thing...
-    secret_obj = _get_setting(constants.SETTING_NAME_APP_SECRET)
+    secret_value = _get_setting(constants.SETTING_NAME_APP_SECRET)
 
     try:
-        decoded_token = jwt.decode(
-            bearer_token, secret_obj.setting_value, algorithms="HS256"
-        )
+        decoded_token = jwt.decode(bearer_token, secret_value, algorithms="HS256")
     except jwt.exceptions.DecodeError:
         return 403
 
@@ -57,4 +59,6 @@ def _verify_bearer_token(request: Request) -> int:
     if decoded_token_name != token_lookup.token_name:
         return 403
 
+    TOKEN_CACHE.put(bearer_token, token_lookup.token_name)
+
     return 200
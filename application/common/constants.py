@@ -20,6 +20,15 @@ class GameActionTypes(Enum):
     STOPPING = "stopping"
     RESTARTING = "restarting"
     UNINSTALLING = "uninstalling"
+    EXITED = "exited"
+
+
+class InstallJobStates(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    SKIPPED = "skipped"
+    FAILED = "failed"
 
 
 class GameStates(Enum):
@@ -55,6 +64,12 @@ SETTING_NAME_APP_SECRET: str = "application_secret"
 SETTING_NGINX_PROXY_PORT: str = "nginx_proxy_port"
 SETTING_NGINX_PROXY_HOSTNAME: str = "nginx_proxy_hostname"
 SETTING_NGINX_ENABLE: str = "nginx_enable"
+SETTING_ACTIONS_RETENTION_ENABLE: str = "actions_retention_enable"
+SETTING_ACTIONS_RETENTION_COUNT: str = "actions_retention_count"
+SETTING_ACTIONS_RETENTION_INTERVAL: str = "actions_retention_interval_sec"
+SETTING_NAME_SETTINGS_VERSION: str = "settings_version"
+SETTING_UPDATE_CHECK_ENABLE: str = "update_check_enable"
+SETTING_UPDATE_CHECK_INTERVAL: str = "update_check_interval_sec"
 
 # Nginx
 NGINX_VERSION = "nginx-1.24.0"
@@ -71,6 +86,10 @@ MILIS_PER_SECOND = 1000
 BYTES_PER_KB = 1024
 KB_PER_MB = 1024
 
+# Long polls are capped so a client cannot hold a server thread forever.
+LONG_POLL_DEFAULT_SECONDS: float = 30.0
+LONG_POLL_MAX_SECONDS: float = 60.0
+
 # Logging
 DEFAULT_LOG_LEVEL = logging.NOTSET
 DEFAULT_LOG_DATE_FORMAT = "%m/%d/%Y %I:%M:%S %p"
@@ -1,7 +1,85 @@
+import os
+
 from application.common.constants import FileModes
 
 
+class GameArgumentSpec:
+    """
+    Immutable, class level declaration of one of a game's built in arguments.
+
+    Each game declares its schema once and shares it across all of its instances. If default_path
+    is given, the value is a path (built from those parts) inside the game's default folder.
+    """
+
+    __slots__ = (
+        "argument",
+        "value",
+        "required",
+        "use_equals",
+        "use_quotes",
+        "is_permanent",
+        "file_mode",
+        "default_path",
+    )
+
+    def __init__(
+        self,
+        argument,
+        value=None,
+        required=False,
+        use_equals=False,
+        use_quotes=True,
+        is_permanent=False,
+        file_mode=FileModes.NOT_A_FILE.value,
+        default_path=None,
+    ) -> None:
+        object.__setattr__(self, "argument", argument)
+        object.__setattr__(self, "value", value)
+        object.__setattr__(self, "required", required)
+        object.__setattr__(self, "use_equals", use_equals)
+        object.__setattr__(self, "use_quotes", use_quotes)
+        object.__setattr__(self, "is_permanent", is_permanent)
+        object.__setattr__(self, "file_mode", file_mode)
+        object.__setattr__(self, "default_path", default_path)
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"GameArgumentSpec: {self.argument} is read only.")
+
+    def __delattr__(self, name) -> None:
+        raise AttributeError(f"GameArgumentSpec: {self.argument} is read only.")
+
+    def get_default_value(self, game_folder: str = None):
+        if self.default_path is None:
+            return self.value
+        elif game_folder:
+            return os.path.join(game_folder, *self.default_path)
+        else:
+            return None
+
+    def to_argument(self, game_folder: str = None):
+        return GameArgument(
+            self.argument,
+            value=self.get_default_value(game_folder),
+            required=self.required,
+            use_equals=self.use_equals,
+            use_quotes=self.use_quotes,
+            is_permanent=self.is_permanent,
+            file_mode=self.file_mode,
+        )
+
+
 class GameArgument:
+    __slots__ = (
+        "_arg",
+        "_value",
+        "_required",
+        "_is_permanent",
+        "_file_mode",
+        "_use_equals",
+        "_use_quotes",
+        "_formatted_arg",
+    )
+
     FORMAT_STR = "{arg} {val}"
     FORMAT_STR_NO_EQUAL_WITH_QUOTES = '{arg} "{val}"'
     FORMAT_STR_WITH_EQUALS = "{arg}={val}"
@@ -27,9 +105,12 @@ class GameArgument:
 
         self._formatted_arg = ""
 
-    def is_requried(self) -> bool:
+    def is_required(self) -> bool:
         return self._required
 
+    # Kept for backwards compatibility with the original (misspelled) name.
+    is_requried = is_required
+
     def _format_string(self) -> str:
         """
         Four possibilities / combos
@@ -1,39 +1,59 @@
 import abc
+import functools
+import os
 import time
-import shutil
 import subprocess
+import threading
+
+from types import MappingProxyType
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgument, GameArgumentSpec
 from application.common.exceptions import InvalidUsage
 from application.extensions import DATABASE
+from application.managers.tombstone_manager import TOMBSTONE_MANAGER
+from application.models.action_summaries import ActionSummaries
+from application.models.actions import Actions
 from application.models.games import Games
+from application.models.install_jobs import InstallJobs
 from application.models.game_arguments import GameArguments
 
 
 class BaseGame:
     DEFAULT_WAIT_PERIOD = 5
 
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        self._game_args: dict = {}
-        self._game_name: str = None
-        self._game_pretty_name: str = None
-        self._game_executable: str = None
-        self._game_steam_id: str = None
-        self._game_installed: bool = False
-        self._game_info_url: str = ""
+    # Game implementations declare these once, at the class level.
+    _game_name: str = None
+    _game_pretty_name: str = None
+    _game_executable: str = None
+    _game_steam_id: str = None
+    _game_info_url: str = ""
 
-        self._defaults = defaults_dict
-        self._game_default_install_dir = None
+    # Whether or not users are alloed to add additional args.
+    # Allowed by default. Game implementations will have to disable it.
+    _allow_user_args: bool = True
 
-        # Whether or not users are alloed to add additional args.
-        # Allowed by default. Game implementations will have to disable it.
-        self._allow_user_args = True
+    # The built in arguments, shared by every instance of the game.
+    _game_argument_schema: tuple = ()
 
-        if constants.SETTING_NAME_DEFAULT_PATH in self._defaults:
-            self._game_default_install_dir = defaults_dict[
-                constants.SETTING_NAME_DEFAULT_PATH
-            ]
+    __slots__ = (
+        "_defaults",
+        "_game_default_install_dir",
+        "_game_installed",
+        "_game_args_overlay",
+        "_use_argument_schema",
+    )
+
+    def __init__(self, defaults_dict: dict = {}) -> None:
+        self._defaults = defaults_dict
+        self._game_default_install_dir = defaults_dict.get(
+            constants.SETTING_NAME_DEFAULT_PATH, None
+        )
+        self._game_installed: bool = False
+
+        # Instances only hold the user's arguments, the defaults come from the class schema.
+        self._game_args_overlay: dict = {}
+        self._use_argument_schema: bool = True
 
     @abc.abstractmethod
     def startup(self) -> None:
@@ -45,42 +65,41 @@ class BaseGame:
         """Implementation Specific shutdown Routine."""
         self._input_check_routine()
 
-    def uninstall(self) -> bool:
+    def uninstall(self) -> threading.Thread:
+        """
+        Remove the game from the database and delete its installation files. The files are deleted
+        on a background thread, which is returned. Returns None if the uninstall failed.
+        """
         logger.info("BaseGame: Uninstall Called!")
 
-        is_successful = True
-
-        # Eliminate database objects
         game_obj = Games.query.filter_by(game_name=self._game_name).first()
-        game_arg_objs = GameArguments.query.filter_by(game_id=game_obj.game_id).all()
-
-        actions = game_obj.get_all_actions()
 
         # But first save off the installation path.
+        game_id = game_obj.game_id
         game_install_dir = game_obj.game_install_dir
 
+        # Eliminate database objects, with one statement per table.
         try:
-            for argument in game_arg_objs:
-                DATABASE.session.delete(argument)
-            for action in actions:
-                DATABASE.session.delete(action)
-            DATABASE.session.delete(game_obj)
+            for model in [GameArguments, Actions, ActionSummaries, Games]:
+                model.query.filter_by(game_id=game_id).delete(synchronize_session=False)
+            InstallJobs.query.filter_by(
+                steam_id=game_obj.game_steam_id, install_dir=game_install_dir
+            ).delete(synchronize_session=False)
             DATABASE.session.commit()
         except Exception as e:
+            DATABASE.session.rollback()
             logger.critical("BaseGame: Uninstall - Database Error.")
             logger.error(e)
-            is_successful = False
+            return None
 
         try:
-            shutil.rmtree(game_install_dir, ignore_errors=True)
+            return TOMBSTONE_MANAGER.delete_in_background(game_install_dir)
         except Exception as e:
             logger.critical(
                 "BaseGame: Uninstall - Unable to remove installation files."
             )
             logger.error(e)
-            is_successful = False
-
-        return is_successful
+            return None
 
     def restart(self, wait_period=DEFAULT_WAIT_PERIOD) -> None:
         """Simple Routine to shutdown and re-run the startup routines."""
@@ -144,15 +163,61 @@ class BaseGame:
                 logger.error(message)
                 raise InvalidUsage(message, status_code=400)
 
+    def _get_default_game_folder(self) -> str:
+        if self._game_default_install_dir is None:
+            return None
+
+        return os.path.join(
+            self._game_default_install_dir,
+            constants.GAME_INSTALL_FOLDER,
+            self._game_name,
+        )
+
+    def _get_schema_spec(self, arg_name) -> GameArgumentSpec:
+        if not self._use_argument_schema:
+            return None
+
+        for spec in self._game_argument_schema:
+            if spec.argument == arg_name:
+                return spec
+
+        return None
+
+    def _is_schema_argument(self, arg_name) -> bool:
+        return self._get_schema_spec(arg_name) is not None
+
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _get_default_arguments(cls, game_folder: str) -> MappingProxyType:
+        """
+        The built in arguments of the game class, built once per game folder and shared by every
+        instance. The arguments must not be changed, _update_argument works on a copy.
+        """
+        return MappingProxyType(
+            {
+                spec.argument: spec.to_argument(game_folder)
+                for spec in cls._game_argument_schema
+            }
+        )
+
     def _get_argument_list(self) -> []:
-        return list(self._game_args.keys())
+        return list(self._get_argument_dict().keys())
 
-    def _get_argument_dict(self) -> []:
-        return self._game_args
+    def _get_argument_dict(self) -> dict:
+        game_args = {}
+
+        if self._use_argument_schema:
+            game_args.update(
+                self._get_default_arguments(self._get_default_game_folder())
+            )
+
+        game_args.update(self._game_args_overlay)
+
+        return game_args
 
     def _get_command_str(self, args_only=False) -> str:
         arg_string = ""
-        for _, arg in self._game_args.items():
+        for _, arg in self._get_argument_dict().items():
             arg_string += str(arg) + " "
 
         if args_only:
@@ -181,18 +246,30 @@ class BaseGame:
             self._add_argument(game_arg)
 
     def _reset_arguments(self) -> None:
-        self._game_args.clear()
+        self._game_args_overlay.clear()
+        self._use_argument_schema = False
 
     def _update_argument(self, arg_name, value) -> None:
-        if arg_name not in self._game_args.keys():
-            logger.error("BaseGame: Argument does not exist!")
+        game_arg = self._game_args_overlay.get(arg_name, None)
+
+        if game_arg is None:
+            spec = self._get_schema_spec(arg_name)
+
+            if spec is None:
+                logger.error("BaseGame: Argument does not exist!")
+                return
+
+            # The default argument is shared, so the instance changes its own copy.
+            game_arg = spec.to_argument(self._get_default_game_folder())
+            self._game_args_overlay[arg_name] = game_arg
 
-        game_arg = self._game_args[arg_name]
         game_arg._value = value
 
     def _add_argument(self, arg: GameArgument) -> None:
-        if arg._arg not in self._game_args:
-            self._game_args[arg._arg] = arg
+        if arg._arg not in self._game_args_overlay and not self._is_schema_argument(
+            arg._arg
+        ):
+            self._game_args_overlay[arg._arg] = arg
         else:
             logger.warning(f"BaseGame: Argument: {arg._arg} - Already Exists! Skipping")
 
@@ -213,7 +290,7 @@ class BaseGame:
     def _check_args(self) -> bool:
         is_arg_missing = False
 
-        for arg_name, arg in self._game_args.items():
+        for arg_name, arg in self._get_argument_dict().items():
             if arg._value is None and arg.is_required():
                 is_arg_missing = True
                 break
@@ -0,0 +1,212 @@
+import os
+import inspect
+import importlib.util
+import threading
+import yaml
+
+from application import games
+from application.common import logger
+from application.common.decorators import timeit
+from application.common.game_base import BaseGame
+
+MANIFEST_FILE_NAME = "manifest.yml"
+MANIFEST_HEADER = "# Generated by game_manifest.py - Do not edit by hand.\n"
+
+
+class GameRegistry:
+    """
+    Process wide registry of the supported game plugins found in application/games.
+
+    Game names, steam ids and executables come from a static manifest, so the agent can list and
+    route games without importing any plugin. A game module is only imported the first time an
+    object for that game is actually needed. Without a manifest, every module is loaded instead.
+    """
+
+    def __init__(self, package=games) -> None:
+        self._package = package
+        self._lock = threading.RLock()
+        self._is_loaded = False
+
+        self._games_by_name: dict = {}
+        self._games_by_steam_id: dict = {}
+        self._game_classes: dict = {}
+
+    @staticmethod
+    def _find_conforming_modules(package) -> {}:
+        package_location = package.__path__
+
+        files_in_package = os.listdir(package_location[0])
+
+        conforming_modules = {}
+
+        for myfile in files_in_package:
+            if myfile == "__init__.py" or not myfile.endswith(".py"):
+                continue
+
+            module_name = myfile.split(".py")[0]
+            full_path = os.path.join(package_location[0], myfile)
+
+            this_module = GameRegistry._load_module(module_name, full_path)
+
+            for x in dir(this_module):
+                if inspect.isclass(getattr(this_module, x)):
+                    if x == "BaseGame":
+                        conforming_modules.update({module_name: this_module})
+                        break
+
+        return conforming_modules
+
+    @staticmethod
+    def _load_module(module_name, full_path):
+        # Load the module from file
+        spec = importlib.util.spec_from_file_location(module_name, full_path)
+        this_module = importlib.util.module_from_spec(spec)
+        _ = spec.loader.exec_module(this_module)
+        return this_module
+
+    @staticmethod
+    def _find_game_class(module_name, module):
+        game_class = None
+        for item in inspect.getmembers(module, inspect.isclass):
+            if item[1].__module__ == module_name:
+                game_class = item[1]
+        return game_class
+
+    def _get_manifest_path(self) -> str:
+        return os.path.join(self._package.__path__[0], MANIFEST_FILE_NAME)
+
+    def _read_manifest(self) -> list:
+        manifest_path = self._get_manifest_path()
+
+        if not os.path.exists(manifest_path):
+            logger.warning(f"GameRegistry: No game manifest found at {manifest_path}")
+            return None
+
+        with open(manifest_path, "r") as manifest_file:
+            manifest_data = yaml.safe_load(manifest_file)
+
+        return manifest_data["games"]
+
+    def _load_all_modules(self) -> list:
+        manifest = []
+
+        modules_dict = self._find_conforming_modules(self._package)
+
+        for module_name, module in modules_dict.items():
+            game_class = self._find_game_class(module_name, module)
+
+            if game_class is None:
+                continue
+
+            self._game_classes[game_class._game_name] = game_class
+
+            manifest.append(
+                {
+                    "name": game_class._game_name,
+                    "pretty_name": game_class._game_pretty_name,
+                    "steam_id": str(game_class._game_steam_id),
+                    "executable": game_class._game_executable,
+                    "module": module_name,
+                }
+            )
+
+        return sorted(manifest, key=lambda entry: entry["name"])
+
+    def build_manifest(self) -> list:
+        """Load every game module and describe each game, for writing out the manifest."""
+        with self._lock:
+            return self._load_all_modules()
+
+    def write_manifest(self) -> str:
+        manifest_path = self._get_manifest_path()
+
+        with open(manifest_path, "w") as manifest_file:
+            manifest_file.write(MANIFEST_HEADER)
+            yaml.dump({"games": self.build_manifest()}, manifest_file)
+
+        return manifest_path
+
+    @timeit
+    def load(self, force=False) -> None:
+        """Index the game plugins. Only does work the first time unless forced to."""
+        with self._lock:
+            if self._is_loaded and not force:
+                return
+
+            self._game_classes.clear()
+
+            manifest = self._read_manifest()
+
+            if manifest is None:
+                manifest = self._load_all_modules()
+
+            self._games_by_name = {entry["name"]: entry for entry in manifest}
+            self._games_by_steam_id = {
+                str(entry["steam_id"]): entry for entry in manifest
+            }
+            self._is_loaded = True
+
+            logger.debug(f"GameRegistry: Indexed {len(manifest)} game plugins.")
+
+    def _get_index(self, by_steam_id=False) -> dict:
+        if not self._is_loaded:
+            self.load()
+
+        return self._games_by_steam_id if by_steam_id else self._games_by_name
+
+    def _get_game_class(self, game_info: dict):
+        game_name = game_info["name"]
+        game_class = self._game_classes.get(game_name, None)
+
+        if game_class:
+            return game_class
+
+        with self._lock:
+            if game_name not in self._game_classes:
+                module_name = game_info["module"]
+                full_path = os.path.join(self._package.__path__[0], f"{module_name}.py")
+                module = self._load_module(module_name, full_path)
+                self._game_classes[game_name] = self._find_game_class(
+                    module_name, module
+                )
+                logger.debug(f"GameRegistry: Imported game plugin: {module_name}")
+
+        return self._game_classes[game_name]
+
+    def get_game_names(self) -> list:
+        return list(self._get_index().keys())
+
+    def get_game_info(self, game_name: str) -> dict:
+        """Return the manifest entry for a game without importing the game module."""
+        return self._get_index().get(game_name, None)
+
+    def get_game_info_by_steam_id(self, steam_id) -> dict:
+        return self._get_index(by_steam_id=True).get(str(steam_id), None)
+
+    def get_all_game_info(self) -> list:
+        return list(self._get_index().values())
+
+    def get_game_object(self, game_name: str, defaults_dict: dict = {}) -> BaseGame:
+        """Return a new game object for the given game name, or None if not supported."""
+        game_info = self.get_game_info(game_name)
+        if game_info is None:
+            return None
+        return self._get_game_class(game_info)(defaults_dict)
+
+    def get_game_object_by_steam_id(
+        self, steam_id, defaults_dict: dict = {}
+    ) -> BaseGame:
+        """Return a new game object for the given steam id, or None if not supported."""
+        game_info = self.get_game_info_by_steam_id(steam_id)
+        if game_info is None:
+            return None
+        return self._get_game_class(game_info)(defaults_dict)
+
+    def get_all_game_objects(self, defaults_dict: dict = {}) -> list:
+        return [
+            self._get_game_class(game_info)(defaults_dict)
+            for game_info in self.get_all_game_info()
+        ]
+
+
+GAME_REGISTRY = GameRegistry()
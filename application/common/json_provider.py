@@ -0,0 +1,25 @@
+import orjson
+
+from flask.json.provider import DefaultJSONProvider
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Flask JSON provider backed by orjson, used by jsonify. Output matches the default provider:
+    keys are sorted, and dates and other non-native types go through the default provider's
+    conversions, e.g. datetimes are still formatted as HTTP dates.
+    """
+
+    OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+    )
+
+    def dumps(self, obj, **kwargs) -> str:
+        # Pretty printing, e.g. in debug mode, is left to the default provider.
+        if kwargs.get("indent", None) is not None:
+            return super().dumps(obj, **kwargs)
+
+        return orjson.dumps(obj, default=self.default, option=self.OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
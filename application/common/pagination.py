@@ -1,7 +1,76 @@
+import base64
+import binascii
+import json
+import operator
 import sqlalchemy as db
 
-from flask import url_for
+from datetime import datetime
+from flask import has_request_context, request, url_for
 from math import ceil
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+
+from application.common.exceptions import InvalidUsage
+
+# Model class -> (column keys, columns, attribute getter), filled in once per model.
+_SERIALIZER_CACHE: dict = {}
+
+
+def _encode_cursor(item, cursor_columns: list) -> str:
+    values = []
+
+    for column in cursor_columns:
+        value = getattr(item, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+
+    cursor = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(cursor).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, cursor_columns: list) -> list:
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+
+        if not isinstance(values, list) or len(values) != len(cursor_columns):
+            raise ValueError("Cursor does not match the cursor columns")
+
+        decoded = []
+
+        for column, value in zip(cursor_columns, values):
+            if isinstance(column.type, db.DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, db.Integer):
+                value = int(value)
+            elif isinstance(column.type, db.Float):
+                value = float(value)
+            decoded.append(value)
+    except (binascii.Error, TypeError, ValueError):
+        raise InvalidUsage(f"Invalid pagination cursor: {cursor}", status_code=400)
+
+    return decoded
+
+
+def _is_ordered_by(query, cursor_columns: list, descending: bool) -> bool:
+    """Whether the query is ordered by the cursor columns, in the given direction, first."""
+    order_by = query._order_by_clauses
+    direction = operators.desc_op if descending else operators.asc_op
+
+    if len(order_by) < len(cursor_columns):
+        return False
+
+    for clause, column in zip(order_by, cursor_columns):
+        if isinstance(clause, UnaryExpression):
+            if clause.modifier is not direction:
+                return False
+            clause = clause.element
+        elif descending:
+            return False
+
+        if not clause.compare(column.expression):
+            return False
+
+    return True
 
 
 class Pagination(object):
@@ -14,54 +83,226 @@ class Pagination(object):
     prev_num = 0
     query = None
     total = None
+    next_cursor = None
+    prev_cursor = None
 
-    def paginate(query, page, per_page, unused):
+    def paginate(query, page, per_page, unused, with_total=True):
         data = Pagination()
 
-        if page == 0:
-            page - 1
+        if page < 1:
+            page = 1
 
-        data.total = query.count()
-        data.pages = int(ceil(data.total / float(per_page)))
+        # Fetch one extra row to find out if there is a next page without counting.
+        newQuery = query.limit(per_page + 1).offset((page - 1) * per_page)
+        items = newQuery.all()
 
-        newQuery = query.limit(per_page).offset((page - 1) * per_page)
-        data.items = newQuery.all()
+        data.items = items[:per_page]
+        data.has_prev = page > 1
+        data.has_next = len(items) > per_page
 
-        if page == 1:
-            data.has_prev = False
-        else:
-            data.has_prev = True
+        if with_total:
+            data.total = query.count()
+            data.pages = int(ceil(data.total / float(per_page)))
 
-        if page >= data.total:
-            data.has_next = False
-        else:
+        return data
+
+    def paginate_keyset(
+        query,
+        per_page,
+        cursor_columns,
+        after=None,
+        before=None,
+        descending=False,
+        with_total=True,
+    ):
+        """
+        Pages through the query by seeking past the cursor columns of the last row seen, instead
+        of using an offset, so every page costs the same however deep it is.
+        """
+        data = Pagination()
+
+        key = (
+            db.tuple_(*cursor_columns) if len(cursor_columns) > 1 else cursor_columns[0]
+        )
+
+        # Going backwards, walk the index in reverse order and flip the page afterwards.
+        backwards = before is not None and after is None
+        reverse = descending != backwards
+
+        keyset_query = query.order_by(None)
+
+        if after is not None or before is not None:
+            values = _decode_cursor(
+                after if after is not None else before, cursor_columns
+            )
+            value = db.tuple_(*values) if len(values) > 1 else values[0]
+            keyset_query = keyset_query.filter(key < value if reverse else key > value)
+
+        order_by = [
+            column.desc() if reverse else column.asc() for column in cursor_columns
+        ]
+        items = keyset_query.order_by(*order_by).limit(per_page + 1).all()
+
+        has_more = len(items) > per_page
+        items = items[:per_page]
+
+        if backwards:
+            items.reverse()
+            data.has_prev = has_more
             data.has_next = True
+        else:
+            data.has_prev = after is not None
+            data.has_next = has_more
+
+        data.items = items
+
+        if with_total:
+            data.total = query.count()
+            data.pages = int(ceil(data.total / float(per_page)))
 
         return data
 
 
 class PaginatedApi(object):
-    @staticmethod
-    def to_collection_dict(query, page, per_page, endpoint, **kwargs):
-        resources = Pagination.paginate(query, page, per_page, False)
+    @classmethod
+    def _get_serializer(cls) -> tuple:
+        serializer = _SERIALIZER_CACHE.get(cls, None)
+
+        if serializer is None:
+            columns = tuple(cls.__table__.columns)
+            keys = tuple(column.key for column in columns)
+            serializer = (keys, columns, operator.attrgetter(*keys))
+            _SERIALIZER_CACHE[cls] = serializer
+
+        return serializer
+
+    def to_dict(self):
+        keys, _, getter = self._get_serializer()
+        values = getter(self)
+        return dict(zip(keys, values if len(keys) > 1 else (values,)))
+
+    @classmethod
+    def rows_to_dicts(cls, rows) -> list:
+        """Serialize row tuples holding the model's columns, in order, without ORM objects."""
+        keys = cls._get_serializer()[0]
+        return [dict(zip(keys, row)) for row in rows]
+
+    @classmethod
+    def select_rows(cls, query):
+        """Make the query return plain row tuples of the model's columns, for rows_to_dicts."""
+        return query.with_entities(*cls._get_serializer()[1])
+
+    @classmethod
+    def _get_cursor_columns(cls, cursor_column=None) -> list:
+        primary_keys = list(cls.__table__.primary_key.columns)
+
+        if cursor_column is None:
+            return primary_keys
+
+        # The primary key breaks ties between rows with the same cursor column value.
+        return [cursor_column] + primary_keys
+
+    @classmethod
+    def to_collection_dict(
+        cls,
+        query,
+        page,
+        per_page,
+        endpoint,
+        cursor_column=None,
+        descending=False,
+        from_request=True,
+        **kwargs,
+    ):
+        """
+        Paginate the query and describe the page. Pass ?after=<cursor> or ?before=<cursor> for
+        keyset pagination instead of page numbers, and ?with_total=0 to skip counting the rows.
+        Cursors follow cursor_column, then the primary key. Page number pages only include
+        cursors when the query is ordered the same way.
+        """
+        after = None
+        before = None
+        with_total = True
+
+        if from_request and has_request_context():
+            after = request.args.get("after", None, type=str)
+            before = request.args.get("before", None, type=str)
+            with_total = request.args.get("with_total", 1, type=int) != 0
+
+        # Serialize straight from the rows, no ORM objects are built for the page.
+        query = cls.select_rows(query)
+
+        cursor_columns = cls._get_cursor_columns(cursor_column)
+        is_keyset = after is not None or before is not None
+
+        if is_keyset:
+            resources = Pagination.paginate_keyset(
+                query,
+                per_page,
+                cursor_columns,
+                after=after,
+                before=before,
+                descending=descending,
+                with_total=with_total,
+            )
+        else:
+            resources = Pagination.paginate(
+                query, page, per_page, False, with_total=with_total
+            )
+
+        # A cursor from a page in another order would skip or repeat rows.
+        has_cursors = is_keyset or _is_ordered_by(query, cursor_columns, descending)
+
+        if resources.items and has_cursors:
+            if resources.has_next:
+                resources.next_cursor = _encode_cursor(
+                    resources.items[-1], cursor_columns
+                )
+            if resources.has_prev:
+                resources.prev_cursor = _encode_cursor(
+                    resources.items[0], cursor_columns
+                )
+
+        if not with_total:
+            kwargs["with_total"] = 0
+
+        if is_keyset:
+            cursor_arg = {"after": after} if after is not None else {"before": before}
+            links = {
+                "self": url_for(endpoint, per_page=per_page, **cursor_arg, **kwargs),
+                "next": url_for(
+                    endpoint, per_page=per_page, after=resources.next_cursor, **kwargs
+                )
+                if resources.next_cursor
+                else None,
+                "prev": url_for(
+                    endpoint, per_page=per_page, before=resources.prev_cursor, **kwargs
+                )
+                if resources.prev_cursor
+                else None,
+            }
+        else:
+            links = {
+                "self": url_for(endpoint, page=page, per_page=per_page, **kwargs),
+                "next": url_for(endpoint, page=page + 1, per_page=per_page, **kwargs)
+                if resources.has_next
+                else None,
+                "prev": url_for(endpoint, page=page - 1, per_page=per_page, **kwargs)
+                if resources.has_prev
+                else None,
+            }
 
         data = {
-            "items": [item.to_dict() for item in resources.items],
+            "items": cls.rows_to_dicts(resources.items),
             "_meta": {
-                "page": page,
+                "page": None if is_keyset else page,
                 "per_page": per_page,
                 "total_pages": resources.pages,
                 "total_items": resources.total,
+                "next_cursor": resources.next_cursor,
+                "prev_cursor": resources.prev_cursor,
             },
-            "_links": {
-                "self": url_for(endpoint, page=page, per_page=page, **kwargs),
-                "next": url_for(endpoint, page=page + 1, per_page=page, **kwargs)
-                if resources.has_next
-                else None,
-                "prev": url_for(endpoint, page=page - 1, per_page=page, **kwargs)
-                if resources.has_next
-                else None,
-            },
+            "_links": links,
         }
 
         return data
@@ -0,0 +1,112 @@
+import psutil
+import threading
+import time
+
+from application.common import logger
+
+
+class ProcessIndex:
+    """
+    Shared index of the host's processes, keyed by process name.
+
+    A single scan of the process table prefetches the attributes that callers need and builds a
+    name -> processes map. The index is re-scanned once it is older than the TTL, or on demand.
+    Processes that exited since the last scan are filtered out at lookup time.
+
+    psutil measures CPU usage between two calls on the same Process object, so the index also
+    keeps one sampling object per PID that outlives the scans.
+    """
+
+    DEFAULT_TTL_SECONDS = 2.0
+    PROCESS_ATTRS = ["name", "pid", "create_time", "exe"]
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._refresh_lock = threading.Lock()
+        self._procs_by_name: dict = {}
+        self._last_refresh: float = None
+        self._cpu_lock = threading.Lock()
+        self._cpu_samplers: dict = {}  # pid -> (create_time, psutil.Process)
+
+    def _is_expired(self) -> bool:
+        if self._last_refresh is None:
+            return True
+
+        return (time.monotonic() - self._last_refresh) > self._ttl_seconds
+
+    def refresh(self) -> None:
+        """Scan the process table once and rebuild the index."""
+        procs_by_name = {}
+
+        for proc in psutil.process_iter(attrs=self.PROCESS_ATTRS, ad_value=None):
+            proc_name = proc.info["name"]
+
+            if proc_name is None or proc_name.strip() == "":
+                continue
+
+            procs_by_name.setdefault(proc_name, []).append(proc)
+
+        self._procs_by_name = procs_by_name
+        self._last_refresh = time.monotonic()
+
+        # Forget the CPU samplers of processes that are gone.
+        live_pids = {proc.pid for procs in procs_by_name.values() for proc in procs}
+
+        with self._cpu_lock:
+            for pid in list(self._cpu_samplers.keys()):
+                if pid not in live_pids:
+                    del self._cpu_samplers[pid]
+
+    def invalidate(self) -> None:
+        self._last_refresh = None
+
+    def _get_index(self, refresh=False) -> dict:
+        if refresh or self._is_expired():
+            with self._refresh_lock:
+                # Another thread may have already refreshed while waiting on the lock.
+                if refresh or self._is_expired():
+                    self.refresh()
+
+        return self._procs_by_name
+
+    def get_processes(self, process_name: str, refresh=False) -> list:
+        processes = []
+
+        for proc in self._get_index(refresh=refresh).get(process_name, []):
+            try:
+                if proc.is_running():
+                    processes.append(proc)
+            except psutil.Error as error:
+                logger.error(error)
+
+        return processes
+
+    def get_process(self, process_name: str, refresh=False) -> psutil.Process:
+        processes = self.get_processes(process_name, refresh=refresh)
+        return processes[0] if processes else None
+
+    def get_cpu_percent(self, process: psutil.Process) -> float:
+        """
+        CPU usage of a process since the previous call for the same process. The first call only
+        starts the measurement and returns None.
+        """
+        try:
+            create_time = process.create_time()
+
+            with self._cpu_lock:
+                sampler = self._cpu_samplers.get(process.pid, None)
+
+                # A PID that was reused by another process starts over.
+                if sampler is None or sampler[0] != create_time:
+                    sampler = (create_time, psutil.Process(process.pid))
+                    self._cpu_samplers[process.pid] = sampler
+                    sampler[1].cpu_percent(interval=None)
+                    return None
+
+            return sampler[1].cpu_percent(interval=None)
+        except psutil.Error as error:
+            logger.error(error)
+            return None
+
+
+PROCESS_INDEX = ProcessIndex()
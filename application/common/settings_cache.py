@@ -0,0 +1,127 @@
+import threading
+import time
+
+from contextlib import nullcontext
+from flask import Flask, has_app_context
+from sqlalchemy import Integer, String, cast, select, update
+
+from application.common import constants
+from application.extensions import DATABASE
+from application.models.settings import Settings
+
+
+class SettingsCache:
+    """
+    In-process copy of the settings table, loaded with a single query.
+
+    Every write to the settings also increments the settings version row in the same transaction.
+    The version is checked against the database at most once per check interval, or on demand,
+    so copies held by other threads and processes notice a change and reload. Reads in between
+    are dictionary lookups.
+    """
+
+    DEFAULT_CHECK_INTERVAL_SEC = 5.0
+
+    def __init__(self) -> None:
+        self._app: Flask = None
+        self._lock = threading.Lock()
+        self._check_interval_sec = self.DEFAULT_CHECK_INTERVAL_SEC
+        self._settings: dict = None
+        self._version: int = None
+        self._last_check: float = None
+
+    def init_app(self, flask_app: Flask) -> None:
+        self._app = flask_app
+        self._check_interval_sec = float(flask_app.config["SETTINGS_CACHE_CHECK_SEC"])
+        self.invalidate()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def _app_context(self):
+        if has_app_context() or self._app is None:
+            return nullcontext()
+        return self._app.app_context()
+
+    @staticmethod
+    def _to_version(value) -> int:
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return 0
+
+    def _read_version(self) -> int:
+        with self._app_context():
+            value = DATABASE.session.execute(
+                select(Settings.setting_value).where(
+                    Settings.setting_name == constants.SETTING_NAME_SETTINGS_VERSION
+                )
+            ).scalar()
+
+        return self._to_version(value)
+
+    def reload(self) -> None:
+        """Load every setting from the database."""
+        with self._app_context():
+            rows = DATABASE.session.execute(
+                select(Settings.setting_name, Settings.setting_value)
+            ).all()
+
+        settings = {name: value for name, value in rows}
+
+        with self._lock:
+            self._settings = settings
+            self._version = self._to_version(
+                settings.get(constants.SETTING_NAME_SETTINGS_VERSION, None)
+            )
+            self._last_check = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._settings = None
+            self._version = None
+            self._last_check = None
+
+    def _ensure_fresh(self, verify: bool) -> None:
+        if self._settings is None:
+            self.reload()
+            return
+
+        if (
+            not verify
+            and (time.monotonic() - self._last_check) < self._check_interval_sec
+        ):
+            return
+
+        db_version = self._read_version()
+        self._last_check = time.monotonic()
+
+        if db_version != self._version:
+            self.reload()
+
+    def get(self, setting_name: str, default=None, verify: bool = False) -> str:
+        """
+        Return a setting value, as stored in the database. Use verify=True to check the version
+        first, e.g. for a read that must see a write made by another process.
+        """
+        self._ensure_fresh(verify)
+        return self._settings.get(setting_name, default)
+
+    def get_all(self, verify: bool = False) -> dict:
+        self._ensure_fresh(verify)
+        return dict(self._settings)
+
+    @staticmethod
+    def bump_version() -> None:
+        """Increment the stored settings version. Call before committing a write to settings."""
+        DATABASE.session.execute(
+            update(Settings)
+            .where(Settings.setting_name == constants.SETTING_NAME_SETTINGS_VERSION)
+            .values(
+                setting_value=cast(cast(Settings.setting_value, Integer) + 1, String)
+            )
+        )
+
+
+SETTINGS_CACHE = SettingsCache()
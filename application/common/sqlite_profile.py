@@ -0,0 +1,44 @@
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from application.common import logger
+
+
+def get_sqlite_pragmas(config) -> list:
+    """Build the PRAGMA statements of the SQLite profile from the configuration."""
+    pragmas = [
+        # Only changes the mode of a new, empty database file.
+        f"PRAGMA auto_vacuum={config['SQLITE_AUTO_VACUUM']}",
+        f"PRAGMA journal_mode={config['SQLITE_JOURNAL_MODE']}",
+        f"PRAGMA synchronous={config['SQLITE_SYNCHRONOUS']}",
+        f"PRAGMA busy_timeout={int(config['SQLITE_BUSY_TIMEOUT_MS'])}",
+        f"PRAGMA temp_store={config['SQLITE_TEMP_STORE']}",
+        f"PRAGMA mmap_size={int(config['SQLITE_MMAP_SIZE_BYTES'])}",
+        # A negative cache size is in KiB rather than in pages.
+        f"PRAGMA cache_size=-{int(config['SQLITE_CACHE_SIZE_KB'])}",
+    ]
+
+    return pragmas
+
+
+def init_sqlite_profile(engine: Engine, config) -> None:
+    """
+    Apply the SQLite profile to every new connection of the engine. Journal mode is stored in the
+    database file, the other pragmas only last as long as the connection does.
+    """
+    if engine.dialect.name != "sqlite" or not config["SQLITE_PROFILE_ENABLED"]:
+        return
+
+    pragmas = get_sqlite_pragmas(config)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+    logger.debug(f"SQLite profile applied: {pragmas}")
@@ -0,0 +1,88 @@
+import hashlib
+import threading
+import time
+
+from collections import OrderedDict
+
+from flask import Flask
+
+
+class TokenCache:
+    """
+    In-process cache of bearer tokens that already passed verification.
+
+    Entries are keyed by a SHA-256 hash of the token, so raw tokens are never kept in memory
+    longer than the request. Entries expire after a TTL and the least recently used entry is
+    evicted once the cache is full. Invalidating a token or rotating the app secret must clear
+    the matching entries explicitly.
+    """
+
+    DEFAULT_TTL_SECONDS = 300.0
+    DEFAULT_MAX_SIZE = 1024
+
+    def __init__(
+        self, ttl_seconds: float = DEFAULT_TTL_SECONDS, max_size: int = DEFAULT_MAX_SIZE
+    ) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = (
+            OrderedDict()
+        )  # token hash -> (expires_at, token_name)
+
+    def init_app(self, flask_app: Flask) -> None:
+        self._ttl_seconds = float(flask_app.config["TOKEN_CACHE_TTL_SEC"])
+        self._max_size = int(flask_app.config["TOKEN_CACHE_MAX_SIZE"])
+        self.clear()
+
+    @staticmethod
+    def _hash_token(bearer_token: str) -> str:
+        return hashlib.sha256(bearer_token.encode("utf-8")).hexdigest()
+
+    def get(self, bearer_token: str) -> str:
+        """Return the token name of a verified token, or None if it is not cached."""
+        if self._max_size < 1:
+            return None
+
+        token_hash = self._hash_token(bearer_token)
+
+        with self._lock:
+            entry = self._entries.get(token_hash, None)
+
+            if entry is None:
+                return None
+
+            if entry[0] < time.monotonic():
+                del self._entries[token_hash]
+                return None
+
+            self._entries.move_to_end(token_hash)
+            return entry[1]
+
+    def put(self, bearer_token: str, token_name: str) -> None:
+        if self._max_size < 1:
+            return
+
+        token_hash = self._hash_token(bearer_token)
+        expires_at = time.monotonic() + self._ttl_seconds
+
+        with self._lock:
+            self._entries[token_hash] = (expires_at, token_name)
+            self._entries.move_to_end(token_hash)
+
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, token_name: str) -> None:
+        """Drop every cached token with the given name."""
+        with self._lock:
+            for token_hash, entry in list(self._entries.items()):
+                if entry[1] == token_name:
+                    del self._entries[token_hash]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+TOKEN_CACHE = TokenCache()
@@ -1,100 +1,261 @@
 import os
-import inspect
-import importlib.util
 import platform
 import psutil
+import stat
 import sys
 
-from application import games
 from application.common import logger
 from application.common.constants import GameStates
-from application.common.decorators import timeit
 from application.common.exceptions import InvalidUsage
 from application.common.game_base import BaseGame
+from application.common.game_registry import GAME_REGISTRY
+from application.common.process_index import PROCESS_INDEX
 from application.extensions import DATABASE
+from application.managers.game_supervisor import GAME_SUPERVISOR
 from application.models.games import Games
 
-
-@staticmethod
-def recursive_chmod(parent_path: str) -> None:
-    for root, dirs, files in os.walk(parent_path):
-        for d in dirs:
-            os.chmod(os.path.join(root, d), 0o777)
-        for f in files:
-            os.chmod(os.path.join(root, f), 0o777)
+# Create times are floats and only need to match to within the clock resolution.
+PID_CREATE_TIME_TOLERANCE = 0.01
 
 
 @staticmethod
-def _get_proc_by_name(process_name: str):
-    process = None
-    current_procs = list((p for p in psutil.process_iter()))
+def recursive_chmod(parent_path: str, mode: int = 0o777) -> int:
+    """
+    Give every directory and file below parent_path the given mode. Entries that already have the
+    mode are skipped, so running this over a tree that was fixed before only costs the walk.
+    Symbolic links are not followed. Returns the number of entries that were changed.
+    """
+    num_changed = 0
+    dirs_to_walk = [parent_path]
+
+    while dirs_to_walk:
+        current_dir = dirs_to_walk.pop()
 
-    for proc in current_procs:
         try:
-            proc_name = proc.name()
-        except psutil.NoSuchProcess as error:
+            with os.scandir(current_dir) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        entry_mode = entry.stat(follow_symlinks=False).st_mode
+
+                        if (
+                            not stat.S_ISLNK(entry_mode)
+                            and stat.S_IMODE(entry_mode) != mode
+                        ):
+                            os.chmod(entry.path, mode)
+                            num_changed += 1
+                    except OSError as error:
+                        logger.error(error)
+                        continue
+
+                    if is_dir:
+                        dirs_to_walk.append(entry.path)
+        except OSError as error:
             logger.error(error)
-            continue
 
-        if proc_name == "" or proc_name == " ":
-            continue
+    return num_changed
 
-        if proc_name == process_name:
-            process = proc
-            break
+
+@staticmethod
+def _get_proc_by_name(process_name: str, refresh: bool = False) -> psutil.Process:
+    """
+    Look up a running process by name in the shared process index. Use refresh=True right after
+    launching a process, otherwise the index may be up to its TTL old.
+    """
+    return PROCESS_INDEX.get_process(process_name, refresh=refresh)
+
+
+@staticmethod
+def _get_proc_by_pid(
+    pid: int, create_time: float = None, process_name: str = None
+) -> psutil.Process:
+    """
+    Look up a process by PID, and only return it if it is still the process that was recorded.
+    Operating systems reuse PIDs, so the create time and name must match too when given.
+    """
+    if pid is None:
+        return None
+
+    try:
+        process = psutil.Process(pid)
+
+        if create_time is not None:
+            if abs(process.create_time() - create_time) > PID_CREATE_TIME_TOLERANCE:
+                return None
+
+        if process_name is not None and process.name() != process_name:
+            return None
+    except psutil.Error:
+        return None
 
     return process
 
 
 @staticmethod
-def get_resources_dir(this_file) -> str:
-    current_file = os.path.abspath(this_file)
-    current_folder = os.path.dirname(current_file)
-    resources_folder = os.path.join(current_folder, "resources")
-    return resources_folder
+def _get_game_proc(
+    game_pid: int,
+    game_pid_create_time: float,
+    process_name: str,
+    game_install_dir: str,
+) -> psutil.Process:
+    """
+    Find a game server process. The stored PID is checked first, which is a single lookup. Only
+    when the PID is stale does this fall back to scanning for the executable name, and then only
+    a process running from the game's install directory is returned.
+    """
+    process = _get_proc_by_pid(game_pid, game_pid_create_time, process_name)
+
+    if process is not None:
+        return process
+
+    for candidate in PROCESS_INDEX.get_processes(process_name):
+        if _is_proc_in_dir(candidate, game_install_dir):
+            return candidate
+
+    return None
 
 
 @staticmethod
-@timeit
-def _find_conforming_modules(package) -> {}:
-    package_location = package.__path__
+def _is_proc_in_dir(process: psutil.Process, install_dir: str) -> bool:
+    """Whether the executable of a process lives below the given install directory."""
+    if not install_dir:
+        return False
 
-    files_in_package = os.listdir(package_location[0])
+    # Processes from the process index have the executable prefetched.
+    info = getattr(process, "info", None)
+    exe = info.get("exe", None) if info else None
 
-    conforming_modules = {}
+    try:
+        if exe is None:
+            exe = process.exe()
 
-    for myfile in files_in_package:
-        if myfile == "__init__.py" or myfile == "__pycache__":
-            continue
+        if not exe:
+            return False
+
+        install_dir = os.path.normcase(os.path.abspath(install_dir))
+        exe = os.path.normcase(os.path.abspath(exe))
 
-        module_name = myfile.split(".py")[0]
-        full_path = os.path.join(package_location[0], myfile)
+        return os.path.commonpath([install_dir, exe]) == install_dir
+    except (psutil.Error, ValueError):
+        # ValueError: the paths are on different drives.
+        return False
 
-        if os.path.isdir(full_path):
+
+@staticmethod
+def _get_game_procs(games: list) -> dict:
+    """
+    Resolve the processes of many installed games at once. Each game dictionary needs the
+    game_name, game_pid, game_pid_create_time and game_install_dir keys. Stored PIDs are checked
+    first, then the remaining games are resolved against a single scan of the process table.
+    Games watched by the game supervisor need no lookup at all. A process found by the scan is
+    only assigned to a game if its executable is inside the game's install directory, and a
+    process is only ever assigned to one game, so servers that share an executable name are told
+    apart.
+    """
+    game_procs = {}
+    game_exes = {}
+    game_dirs = {}
+    claimed_pids = set()
+
+    for game in games:
+        game_name = game["game_name"]
+        game_info = _get_supported_game_info(game_name)
+        game_exes[game_name] = game_info["executable"]
+        game_dirs[game_name] = game.get("game_install_dir", None)
+
+        # Processes the supervisor is watching are known to be alive, no lookup needed.
+        process = GAME_SUPERVISOR.get_process(game["game_pid"])
+
+        if process is None:
+            process = _get_proc_by_pid(
+                game["game_pid"],
+                game.get("game_pid_create_time"),
+                game_info["executable"],
+            )
+
+        game_procs[game_name] = process
+
+        if process is not None:
+            claimed_pids.add(process.pid)
+
+    for game_name, process in game_procs.items():
+        if process is not None:
             continue
 
-        # Load the module from file
-        spec = importlib.util.spec_from_file_location(module_name, full_path)
-        this_module = importlib.util.module_from_spec(spec)
-        _ = spec.loader.exec_module(this_module)
+        for candidate in PROCESS_INDEX.get_processes(game_exes[game_name]):
+            if candidate.pid in claimed_pids:
+                continue
+
+            if not _is_proc_in_dir(candidate, game_dirs[game_name]):
+                continue
+
+            game_procs[game_name] = candidate
+            claimed_pids.add(candidate.pid)
+            break
+
+    return game_procs
+
+
+@staticmethod
+def _get_game_server_statuses(games: list) -> dict:
+    """
+    Same as _get_game_procs, but returns the status, PID, CPU and memory usage of each game
+    server, keyed by game name. CPU usage is measured between calls, so it is None the first
+    time a server is seen.
+    """
+    statuses = {}
+    game_procs = _get_game_procs(games)
+
+    for game in games:
+        game_name = game["game_name"]
+        process = game_procs[game_name]
+
+        is_exe_found = process is not None
+        is_valid_pid = game["game_pid"] is not None
+        is_running = is_exe_found and is_valid_pid
+
+        status = {
+            "game_exe": _get_supported_game_info(game_name)["executable"],
+            "game_status": "Running" if is_running else "Not Running",
+            "is_exe_found": is_exe_found,
+            "is_valid_pid": is_valid_pid,
+            "is_pid_alive": is_exe_found and process.pid == game["game_pid"],
+            "process_pid": None,
+            "cpu_percent": None,
+            "memory_usage": None,
+        }
+
+        if process is not None:
+            try:
+                with process.oneshot():
+                    status["process_pid"] = process.pid
+                    status["memory_usage"] = get_size(process.memory_info().rss)
+            except psutil.Error as error:
+                logger.error(error)
+
+            # None until a second sample of the process exists.
+            status["cpu_percent"] = PROCESS_INDEX.get_cpu_percent(process)
+
+        statuses[game_name] = status
+
+    return statuses
 
-        for x in dir(this_module):
-            if inspect.isclass(getattr(this_module, x)):
-                if x == "BaseGame":
-                    conforming_modules.update({module_name: this_module})
-                    break
 
-    return conforming_modules
+@staticmethod
+def _get_pid_update_dict(process: psutil.Process) -> dict:
+    """Return the game columns that identify a running game server process."""
+    if process is None:
+        return {"game_pid": None, "game_pid_create_time": None}
+
+    return {"game_pid": int(process.pid), "game_pid_create_time": process.create_time()}
 
 
 @staticmethod
-@timeit
-def _instantiate_object(module_name, module, defaults_dict={}):
-    return_obj = None
-    for item in inspect.getmembers(module, inspect.isclass):
-        if item[1].__module__ == module_name:
-            return_obj = item[1](defaults_dict)
-    return return_obj
+def get_resources_dir(this_file) -> str:
+    current_file = os.path.abspath(this_file)
+    current_folder = os.path.dirname(current_file)
+    resources_folder = os.path.join(current_folder, "resources")
+    return resources_folder
 
 
 @staticmethod
@@ -110,18 +271,10 @@ def _get_application_path():
 @staticmethod
 def _get_supported_game_object(game_name: str) -> BaseGame:
     """
-    Instead of hardcoding a bunch of if/elif, can dynamically import the game module,
-    and search it for the game_name provided.
+    Instead of hardcoding a bunch of if/elif, look the game_name up in the game registry. The
+    registry imports the game module the first time that game is needed.
     """
-    game: BaseGame = None
-    supported_game_modules = _find_conforming_modules(games)
-    for module_name in supported_game_modules.keys():
-        check_game: BaseGame = _instantiate_object(
-            module_name, supported_game_modules[module_name]
-        )
-        if check_game._game_name == game_name:
-            game = check_game
-            break
+    game: BaseGame = GAME_REGISTRY.get_game_object(game_name)
 
     if game is None:
         message = f"/game/startup - Error: {game_name} is not a supported game!"
@@ -131,6 +284,22 @@ def _get_supported_game_object(game_name: str) -> BaseGame:
     return game
 
 
+@staticmethod
+def _get_supported_game_info(game_name: str) -> dict:
+    """
+    Same as _get_supported_game_object, but only returns the game manifest entry (name,
+    pretty_name, steam_id, executable) so that the game module does not have to be imported.
+    """
+    game_info: dict = GAME_REGISTRY.get_game_info(game_name)
+
+    if game_info is None:
+        message = f"Error: {game_name} is not a supported game!"
+        logger.error(message)
+        raise InvalidUsage(message, status_code=400)
+
+    return game_info
+
+
 @staticmethod
 def get_size(bytes, suffix="B"):
     """
@@ -27,6 +27,39 @@ class DefaultConfig:
     NGINX_DEFAULT_PORT = "53128"
     NGINX_DEFAULT_ENABLED = True
 
+    # Verified bearer tokens are cached so authenticated requests skip the database and decode.
+    TOKEN_CACHE_TTL_SEC = 300
+    TOKEN_CACHE_MAX_SIZE = 1024
+
+    # Settings are served from memory, the stored settings version is checked this often.
+    SETTINGS_CACHE_CHECK_SEC = 5
+
+    # Actions retention. Keeps the latest actions of each game, older ones are rolled up into
+    # daily summaries.
+    ACTIONS_RETENTION_DEFAULT_ENABLED = True
+    ACTIONS_RETENTION_DEFAULT_COUNT = 100
+    ACTIONS_RETENTION_DEFAULT_INTERVAL_SEC = 3600
+
+    # Scheduled update checks. The published build id of every installed game is refreshed on
+    # this interval, update checks by clients read the stored result. Set UPDATE_CHECK_ENABLED to
+    # False to never start the job, whatever the settings say.
+    UPDATE_CHECK_ENABLED = True
+    UPDATE_CHECK_DEFAULT_ENABLED = True
+    UPDATE_CHECK_DEFAULT_INTERVAL_SEC = 900
+
+    # Only the process that serves the API runs the startup checks and background jobs. Set to
+    # False in any other process that creates the app, like a GUI that connects to an agent.
+    BACKGROUND_JOBS_ENABLED = True
+
+    # Steam install and update jobs. Jobs wait in a bounded queue for one of the workers.
+    INSTALL_JOB_WORKERS = 2
+    INSTALL_JOB_QUEUE_SIZE = 64
+
+    # Updates only run steamcmd when the installed build is not the published one, and only
+    # validate the game files on request, or when the last validation is older than this. Set to
+    # 0 to only ever validate on request.
+    INSTALL_JOB_VALIDATE_INTERVAL_DAYS = 30
+
     # Designate where the database file is stored based on platform.
     if platform.system() == "Windows":
         base_folder = DEFAULT_INSTALL_PATH
@@ -38,6 +71,25 @@ class DefaultConfig:
         # Right now, this is for testing since GitHub actions uses linux
         SQLALCHEMY_DATABASE_URI = f"sqlite:///{DEFAULT_INSTALL_PATH}/{APP_NAME}.db"
 
+    # SQLite profile, applied to every database connection. The Flask server is threaded and
+    # background threads write to the database too, so use WAL and wait on locks.
+    SQLITE_PROFILE_ENABLED = True
+    SQLITE_AUTO_VACUUM = "INCREMENTAL"
+    SQLITE_JOURNAL_MODE = "WAL"
+    SQLITE_SYNCHRONOUS = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS = 5000
+    SQLITE_TEMP_STORE = "MEMORY"
+    SQLITE_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+    SQLITE_CACHE_SIZE_KB = 16 * 1024
+
+    # One pooled connection per concurrent request or background thread.
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        "connect_args": {"check_same_thread": False},
+    }
+
     def __init__(self, deploy_type):
         configuration_options = [el.value for el in _DeployTypes]
 
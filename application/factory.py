@@ -9,9 +9,19 @@ from concurrent_log_handler import ConcurrentRotatingFileHandler
 from flask import Flask
 
 from application.common import logger, constants, toolbox
+from application.common.game_registry import GAME_REGISTRY
+from application.common.json_provider import OrjsonProvider
+from application.common.settings_cache import SETTINGS_CACHE
+from application.common.sqlite_profile import init_sqlite_profile
+from application.common.token_cache import TOKEN_CACHE
 from application.config.config import DefaultConfig
 from application.debugger import init_debugger
 from application.extensions import DATABASE
+from application.managers.actions_retention import ACTIONS_RETENTION
+from application.managers.game_supervisor import GAME_SUPERVISOR
+from application.managers.install_scheduler import INSTALL_SCHEDULER
+from application.managers.tombstone_manager import TOMBSTONE_MANAGER
+from application.managers.update_checker import UPDATE_CHECKER
 from application.api.v1.blueprints.access import access
 from application.api.v1.blueprints.app import app
 from application.api.v1.blueprints.architect import architect
@@ -33,20 +43,68 @@ def _startup_checks():
     # Keep track of the number of updates.
     num_updates = 0
 
-    for this_game in installed_games:
-        # The DB has a PID for the game.
-        if this_game.game_pid:
-            # Check that the game is actually running. If not, delete the PID.
-            game_object = toolbox._get_supported_game_object(this_game.game_name)
-            if not toolbox._get_proc_by_name(game_object._game_executable):
-                game_qry = Games.query.filter_by(game_id=this_game.game_id)
-                game_qry.update({"game_pid": None})
-                num_updates += 1
+    # The DB has a PID for these games. Resolve all of them with a single process table scan.
+    games_with_pid = [game.to_dict() for game in installed_games if game.game_pid]
+    game_procs = toolbox._get_game_procs(games_with_pid)
+
+    for this_game in games_with_pid:
+        # Check that the game is actually running. If not, delete the PID. If the PID is stale
+        # but the executable is still running from the game's install directory, store the PID
+        # of the running process.
+        update_dict = toolbox._get_pid_update_dict(game_procs[this_game["game_name"]])
+
+        if (
+            update_dict["game_pid"] != this_game["game_pid"]
+            or update_dict["game_pid_create_time"] != this_game["game_pid_create_time"]
+        ):
+            game_qry = Games.query.filter_by(game_id=this_game["game_id"])
+            game_qry.update(update_dict)
+            num_updates += 1
+
+        # Servers that survived an agent restart are supervised again.
+        if update_dict["game_pid"] is not None:
+            GAME_SUPERVISOR.watch(
+                this_game["game_id"], game_procs[this_game["game_name"]]
+            )
 
     # Only update database if needed.
     if num_updates > 0:
         DATABASE.session.commit()
 
+    # Finish deleting the game files of uninstalls that a crash or restart interrupted.
+    # Tombstones are renamed in place, next to the install directories of the games.
+    parent_dirs = {
+        os.path.dirname(os.path.normpath(game.game_install_dir))
+        for game in installed_games
+        if game.game_install_dir
+    }
+    parent_dirs.add(constants.DEFAULT_INSTALL_PATH)
+    parent_dirs.add(
+        SETTINGS_CACHE.get(
+            constants.SETTING_NAME_DEFAULT_PATH, constants.DEFAULT_INSTALL_PATH
+        )
+    )
+
+    TOMBSTONE_MANAGER.sweep(sorted(parent_dirs))
+
+
+def _start_background_jobs(flask_app: Flask):
+    # Run other startup checks.
+    with flask_app.app_context():
+        _startup_checks()
+
+    # Notice game servers exiting on their own, without waiting for a poll.
+    GAME_SUPERVISOR.init_app(flask_app)
+
+    # Keep the actions table from growing without bound.
+    ACTIONS_RETENTION.init_app(flask_app)
+
+    # Refresh the published build ids in the background, so update checks never wait on Steam.
+    UPDATE_CHECKER.init_app(flask_app)
+
+    # Run steam installs and updates on a bounded pool of workers, one job per game at a time.
+    INSTALL_SCHEDULER.init_app(flask_app)
+
 
 def _handle_migrations(flask_app: Flask):
     alembic_init = os.path.join(ALEMBIC_FOLDER, "alembic.ini")
@@ -131,6 +189,11 @@ def create_app(config=None):
 
     flask_app.config.from_object(config)
 
+    # Faster jsonify for the large collection endpoints.
+    flask_app.json = OrjsonProvider(flask_app)
+
+    TOKEN_CACHE.init_app(flask_app)
+
     # Set up debugging if the user asked for it.
     init_debugger(flask_app)
 
@@ -148,8 +211,14 @@ def create_app(config=None):
 
     DATABASE.init_app(flask_app)
 
+    with flask_app.app_context():
+        init_sqlite_profile(DATABASE.engine, flask_app.config)
+
     _handle_migrations(flask_app)
 
+    # Load the game plugins once, all other game lookups are served from the registry.
+    GAME_REGISTRY.load()
+
     startup_settings: dict = {
         constants.SETTING_NAME_STEAM_PATH: os.path.join(
             constants.DEFAULT_INSTALL_PATH, "steam"
@@ -161,22 +230,43 @@ def create_app(config=None):
             "NGINX_DEFAULT_HOSTNAME"
         ],
         constants.SETTING_NGINX_ENABLE: flask_app.config["NGINX_DEFAULT_ENABLED"],
+        constants.SETTING_ACTIONS_RETENTION_ENABLE: flask_app.config[
+            "ACTIONS_RETENTION_DEFAULT_ENABLED"
+        ],
+        constants.SETTING_ACTIONS_RETENTION_COUNT: flask_app.config[
+            "ACTIONS_RETENTION_DEFAULT_COUNT"
+        ],
+        constants.SETTING_ACTIONS_RETENTION_INTERVAL: flask_app.config[
+            "ACTIONS_RETENTION_DEFAULT_INTERVAL_SEC"
+        ],
+        constants.SETTING_UPDATE_CHECK_ENABLE: flask_app.config[
+            "UPDATE_CHECK_DEFAULT_ENABLED"
+        ],
+        constants.SETTING_UPDATE_CHECK_INTERVAL: flask_app.config[
+            "UPDATE_CHECK_DEFAULT_INTERVAL_SEC"
+        ],
+        constants.SETTING_NAME_SETTINGS_VERSION: "0",
     }
 
+    SETTINGS_CACHE.init_app(flask_app)
+
     with flask_app.app_context():
         # Here just going to initialize some settings. TODO - Make into a function.
-        for setting_name, setting_value in startup_settings.items():
-            setting_obj = Settings.query.filter_by(setting_name=setting_name).first()
+        existing_settings = SETTINGS_CACHE.get_all()
 
-            if setting_obj is None:
+        for setting_name, setting_value in startup_settings.items():
+            if setting_name not in existing_settings:
                 new_setting = Settings()
                 new_setting.setting_name = setting_name
                 new_setting.setting_value = setting_value
                 DATABASE.session.add(new_setting)
-                DATABASE.session.commit()
 
-        # Run other startup checks.
-        _startup_checks()
+        DATABASE.session.commit()
+        SETTINGS_CACHE.reload()
+
+    # Only the process that serves the API checks the games and runs the background jobs.
+    if flask_app.config["BACKGROUND_JOBS_ENABLED"]:
+        _start_background_jobs(flask_app)
 
     _handle_logging(logger_level=config.LOG_LEVEL)
 
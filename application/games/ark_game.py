@@ -4,88 +4,76 @@ import time
 from jinja2 import Environment, FileSystemLoader
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgumentSpec
 from application.common.game_base import BaseGame
-from application.common.toolbox import _get_proc_by_name, get_resources_dir
+from application.common.toolbox import (
+    _get_game_proc,
+    _get_pid_update_dict,
+    _get_proc_by_name,
+    get_resources_dir,
+)
 from application.extensions import DATABASE
 from application.models.games import Games
 
 
 class ArkGame(BaseGame):
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        super(ArkGame, self).__init__(defaults_dict)
-
-        self._game_name = "ark"
-        self._game_pretty_name = "Ark: Survival Evolved"
-        self._game_executable = "ShooterGameServer.exe"
-        self._game_steam_id = "376030"
-        self._game_info_url = "https://ark.fandom.com/wiki/Dedicated_server_setup"
-
-        """
-        Reference:
-
-        start ShooterGameServer.exe TheIsland?listen?SessionName=<server_name>
-        ?ServerPassword=<join_password>
-        ?ServerAdminPassword=<admin_password>?Port=<port>
-        ?QueryPort=<query_port>?MaxPlayers=<max_players>
-        exit
-        """
-
-        # Add Args here, can update later.
-        self._add_argument(
-            GameArgument(
-                "server_name",
-                value="MyArkServer",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "join_password",
-                value="abc123",
-                required=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "admin_password",
-                value="abc123",
-                required=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "port",
-                value=7777,
-                required=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "query_port",
-                value=27015,
-                required=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "max_players",
-                value=4,
-                required=True,
-                is_permanent=True,
-            )
-        )
+    __slots__ = ()
+
+    _game_name = "ark"
+    _game_pretty_name = "Ark: Survival Evolved"
+    _game_executable = "ShooterGameServer.exe"
+    _game_steam_id = "376030"
+    _game_info_url = "https://ark.fandom.com/wiki/Dedicated_server_setup"
+
+    """
+    Reference:
+
+    start ShooterGameServer.exe TheIsland?listen?SessionName=<server_name>
+    ?ServerPassword=<join_password>
+    ?ServerAdminPassword=<admin_password>?Port=<port>
+    ?QueryPort=<query_port>?MaxPlayers=<max_players>
+    exit
+    """
+
+    _game_argument_schema = (
+        GameArgumentSpec(
+            "server_name",
+            value="MyArkServer",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "join_password",
+            value="abc123",
+            required=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "admin_password",
+            value="abc123",
+            required=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "port",
+            value=7777,
+            required=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "query_port",
+            value=27015,
+            required=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "max_players",
+            value=4,
+            required=True,
+            is_permanent=True,
+        ),
+    )
 
     def startup(self) -> None:
         # Run base class checks
@@ -147,13 +135,13 @@ class ArkGame(BaseGame):
 
         time.sleep(1)
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_proc_by_name(self._game_executable, refresh=True)
 
         logger.info(result)
         logger.info("Process:")
         logger.info(process)
 
-        update_dict = {"game_pid": int(process.pid)}
+        update_dict = _get_pid_update_dict(process)
 
         game_qry.update(update_dict)
         DATABASE.session.commit()
@@ -163,7 +151,12 @@ class ArkGame(BaseGame):
         game_obj = game_qry.first()
         game_pid = game_obj.game_pid
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_game_proc(
+            game_pid,
+            game_obj.game_pid_create_time,
+            self._game_executable,
+            game_obj.game_install_dir,
+        )
 
         if process:
             logger.info(process)
@@ -172,6 +165,6 @@ class ArkGame(BaseGame):
             process.terminate()
             process.wait()
 
-            update_dict = {"game_pid": None}
+            update_dict = _get_pid_update_dict(None)
             game_qry.update(update_dict)
             DATABASE.session.commit()
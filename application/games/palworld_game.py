@@ -4,70 +4,65 @@ import time
 from jinja2 import Environment, FileSystemLoader
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgumentSpec
 from application.common.game_base import BaseGame
-from application.common.toolbox import _get_proc_by_name, get_resources_dir
+from application.common.toolbox import (
+    _get_game_proc,
+    _get_pid_update_dict,
+    _get_proc_by_name,
+    get_resources_dir,
+)
 from application.extensions import DATABASE
 from application.models.games import Games
 
 
 class PalworldGame(BaseGame):
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        super(PalworldGame, self).__init__(defaults_dict)
-
-        self._game_name = "palworld"
-        self._game_pretty_name = "Palworld"
-        self._game_executable = "PalServer.exe"
-        self._game_steam_id = "2394010"
-        self._game_info_url = "https://tech.palworldgame.com/dedicated-server-guide"
-
-        # Add Args here, can update later.
-        self._add_argument(
-            GameArgument(
-                "-ServerName",
-                value="loverland's place",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "-AdminPasssword",
-                value="WithGreatPowerComesGreatResponsibility",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "-ServerPassword",
-                value="teamrocket",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "-MaxPlayers",
-                value="12",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
+    __slots__ = ()
+
+    _game_name = "palworld"
+    _game_pretty_name = "Palworld"
+    _game_executable = "PalServer.exe"
+    _game_steam_id = "2394010"
+    _game_info_url = "https://tech.palworldgame.com/dedicated-server-guide"
+
+    _game_argument_schema = (
+        GameArgumentSpec(
+            "-ServerName",
+            value="loverland's place",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-AdminPasssword",
+            value="WithGreatPowerComesGreatResponsibility",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-ServerPassword",
+            value="teamrocket",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-MaxPlayers",
+            value="12",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
         # Default is 27015
-        self._add_argument(
-            GameArgument(
-                "-serverPort",
-                value=8211,
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
+        GameArgumentSpec(
+            "-serverPort",
+            value=8211,
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+    )
 
     def startup(self) -> None:
         # Run base class checks
@@ -144,13 +139,13 @@ class PalworldGame(BaseGame):
 
         time.sleep(1)
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_proc_by_name(self._game_executable, refresh=True)
 
         logger.info(result)
         logger.info("Process:")
         logger.info(process)
 
-        update_dict = {"game_pid": int(process.pid)}
+        update_dict = _get_pid_update_dict(process)
 
         game_qry.update(update_dict)
         DATABASE.session.commit()
@@ -160,7 +155,12 @@ class PalworldGame(BaseGame):
         game_obj = game_qry.first()
         game_pid = game_obj.game_pid
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_game_proc(
+            game_pid,
+            game_obj.game_pid_create_time,
+            self._game_executable,
+            game_obj.game_install_dir,
+        )
 
         if process:
             logger.info(process)
@@ -169,12 +169,14 @@ class PalworldGame(BaseGame):
             process.terminate()
             process.wait()
 
-            update_dict = {"game_pid": None}
+            update_dict = _get_pid_update_dict(None)
             game_qry.update(update_dict)
             DATABASE.session.commit()
 
         # Pal server throws in an extra executable that needs to be shutdown.
-        process = _get_proc_by_name("PalServer-Win64-Test-Cmd.exe")
+        process = _get_game_proc(
+            None, None, "PalServer-Win64-Test-Cmd.exe", game_obj.game_install_dir
+        )
 
         if process:
             logger.info(process)
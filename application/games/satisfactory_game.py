@@ -4,97 +4,82 @@ import time
 from jinja2 import Environment, FileSystemLoader
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgumentSpec
 from application.common.game_base import BaseGame
-from application.common.toolbox import _get_proc_by_name, get_resources_dir
+from application.common.toolbox import (
+    _get_game_proc,
+    _get_pid_update_dict,
+    _get_proc_by_name,
+    get_resources_dir,
+)
 from application.extensions import DATABASE
 from application.models.games import Games
 
 
 class Satisfactory(BaseGame):
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        super(Satisfactory, self).__init__(defaults_dict)
+    __slots__ = ()
 
-        self._game_name = "satisfactory"
-        self._game_pretty_name = "Satisfactory"
-        self._game_executable = "FactoryServer.exe"
-        self._game_steam_id = "1690800"
-        self._game_info_url = "https://satisfactory.fandom.com/wiki/Dedicated_servers"
+    _game_name = "satisfactory"
+    _game_pretty_name = "Satisfactory"
+    _game_executable = "FactoryServer.exe"
+    _game_steam_id = "1690800"
+    _game_info_url = "https://satisfactory.fandom.com/wiki/Dedicated_servers"
 
-        # Add Args here, can update later.
+    _game_argument_schema = (
         # Default is 2456
-        self._add_argument(
-            GameArgument(
-                "-multihome",
-                value="0.0.0.0",
-                required=True,
-                use_quotes=False,
-                use_equals=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-Port",
-                value=15002,
-                required=True,
-                use_quotes=False,
-                use_equals=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-ServerQueryPort",
-                value=15000,
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-BeaconPort",
-                value=15001,
-                required=True,
-                use_quotes=False,
-                use_equals=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-log",
-                value=" ",
-                required=False,
-                use_quotes=False,
-                is_permanent=False,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-unattended",
-                value=" ",
-                required=False,
-                use_quotes=False,
-                is_permanent=False,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-DisablePacketRouting",
-                value=" ",
-                required=False,
-                use_quotes=False,
-                is_permanent=False,
-            )
-        )
+        GameArgumentSpec(
+            "-multihome",
+            value="0.0.0.0",
+            required=True,
+            use_quotes=False,
+            use_equals=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-Port",
+            value=15002,
+            required=True,
+            use_quotes=False,
+            use_equals=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-ServerQueryPort",
+            value=15000,
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-BeaconPort",
+            value=15001,
+            required=True,
+            use_quotes=False,
+            use_equals=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-log",
+            value=" ",
+            required=False,
+            use_quotes=False,
+            is_permanent=False,
+        ),
+        GameArgumentSpec(
+            "-unattended",
+            value=" ",
+            required=False,
+            use_quotes=False,
+            is_permanent=False,
+        ),
+        GameArgumentSpec(
+            "-DisablePacketRouting",
+            value=" ",
+            required=False,
+            use_quotes=False,
+            is_permanent=False,
+        ),
+    )
 
     def startup(self) -> None:
         # Run base class checks
@@ -140,13 +125,13 @@ class Satisfactory(BaseGame):
 
         time.sleep(1)
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_proc_by_name(self._game_executable, refresh=True)
 
         logger.info(result)
         logger.info("Process:")
         logger.info(process)
 
-        update_dict = {"game_pid": int(process.pid)}
+        update_dict = _get_pid_update_dict(process)
 
         game_qry.update(update_dict)
         DATABASE.session.commit()
@@ -156,7 +141,12 @@ class Satisfactory(BaseGame):
         game_obj = game_qry.first()
         game_pid = game_obj.game_pid
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_game_proc(
+            game_pid,
+            game_obj.game_pid_create_time,
+            self._game_executable,
+            game_obj.game_install_dir,
+        )
 
         if process:
             logger.info(process)
@@ -165,11 +155,13 @@ class Satisfactory(BaseGame):
             process.terminate()
             process.wait()
 
-            update_dict = {"game_pid": None}
+            update_dict = _get_pid_update_dict(None)
             game_qry.update(update_dict)
             DATABASE.session.commit()
 
-        process_2 = _get_proc_by_name("UnrealServer-Win64-Shipping.exe")
+        process_2 = _get_game_proc(
+            None, None, "UnrealServer-Win64-Shipping.exe", game_obj.game_install_dir
+        )
 
         if process:
             logger.info(process_2)
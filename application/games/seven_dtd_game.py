@@ -6,55 +6,47 @@ from jinja2 import Environment, FileSystemLoader
 from telnetlib import Telnet
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgumentSpec
 from application.common.game_base import BaseGame
-from application.common.toolbox import _get_proc_by_name, get_resources_dir
+from application.common.toolbox import (
+    _get_game_proc,
+    _get_pid_update_dict,
+    _get_proc_by_name,
+    get_resources_dir,
+)
 from application.extensions import DATABASE
 from application.models.games import Games
 
 
 class SevenDaysToDieGame(BaseGame):
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        super(SevenDaysToDieGame, self).__init__(defaults_dict)
-
-        self._game_name = "7dtd"
-        self._game_pretty_name = "7 Days To Die"
-        self._game_executable = "7DaysToDieServer.exe"
-        self._game_steam_id = "294420"
-        self._game_info_url = (
-            "https://developer.valvesoftware.com/wiki/7_Days_to_Die_Dedicated_Server"
-        )
-
-        self._telnet = Telnet()
-
-        if self._game_default_install_dir:
-            default_config_file_path = os.path.join(
-                self._game_default_install_dir,
-                constants.GAME_INSTALL_FOLDER,
-                self._game_name,
-                "serverconfig.xml",
-            )
-        else:
-            default_config_file_path = None
-
-        # Add Args here, can update later.
-        self._add_argument(
-            GameArgument(
-                "LogFileName", value="output_log", required=True, is_permanent=True
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "ServerConfigFilePath",
-                value=default_config_file_path,
-                required=True,
-                is_permanent=True,
-                file_mode=constants.FileModes.FILE.value,
-            )
-        )
-
-        # The user may not add additional arguments for this game server.
-        self._allow_user_args = False
+    __slots__ = ()
+
+    _game_name = "7dtd"
+    _game_pretty_name = "7 Days To Die"
+    _game_executable = "7DaysToDieServer.exe"
+    _game_steam_id = "294420"
+    _game_info_url = (
+        "https://developer.valvesoftware.com/wiki/7_Days_to_Die_Dedicated_Server"
+    )
+
+    # The user may not add additional arguments for this game server.
+    _allow_user_args = False
+
+    _game_argument_schema = (
+        GameArgumentSpec(
+            "LogFileName",
+            value="output_log",
+            required=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "ServerConfigFilePath",
+            default_path=("serverconfig.xml",),
+            required=True,
+            is_permanent=True,
+            file_mode=constants.FileModes.FILE.value,
+        ),
+    )
 
     def startup(self) -> None:
         # Run base class checks
@@ -103,14 +95,14 @@ class SevenDaysToDieGame(BaseGame):
 
         time.sleep(2)
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_proc_by_name(self._game_executable, refresh=True)
 
         logger.info(result)
         logger.info("Process:")
         logger.info(process)
 
         if process:
-            update_dict = {"game_pid": int(process.pid)}
+            update_dict = _get_pid_update_dict(process)
             game_qry.update(update_dict)
             DATABASE.session.commit()
         else:
@@ -130,6 +122,7 @@ class SevenDaysToDieGame(BaseGame):
         # In theory, the software has already check that the game is installed, so no check/guard
         # needed.
         game_qry = Games.query.filter_by(game_steam_id=self._game_steam_id)
+        game_install_dir = game_qry.first().game_install_dir
 
         # This refreshes the argument dictionary with the config file path in the database.
         self._rebuild_arguments_dict()
@@ -163,29 +156,30 @@ class SevenDaysToDieGame(BaseGame):
 
         # Open connection with timeout
         timeout = 5
+        telnet = Telnet()
 
         try:
-            self._telnet.open("localhost", int(telnet_port), timeout)
+            telnet.open("localhost", int(telnet_port), timeout)
         except ConnectionRefusedError as error:
             logger.error(error)
             logger.critical(
                 "Unable to shutdown 7DTD server because it's not actually running.."
             )
-            update_dict = {"game_pid": None}
+            update_dict = _get_pid_update_dict(None)
             game_qry.update(update_dict)
             DATABASE.session.commit()
             return
 
         # If the password is anything but a blank string.
         if telnet_pass != "":
-            self._telnet.write(telnet_pass.encode("ascii") + b"\n")
+            telnet.write(telnet_pass.encode("ascii") + b"\n")
 
         shutdown_command = "shutdown"
 
-        self._telnet.write(shutdown_command.encode("ascii") + b"\n")
+        telnet.write(shutdown_command.encode("ascii") + b"\n")
 
         # Mark PID None regardless.
-        update_dict = {"game_pid": None}
+        update_dict = _get_pid_update_dict(None)
         game_qry.update(update_dict)
         DATABASE.session.commit()
 
@@ -193,7 +187,7 @@ class SevenDaysToDieGame(BaseGame):
         time.sleep(2)
 
         # Check for the process
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_game_proc(None, None, self._game_executable, game_install_dir)
 
         if process:
             logger.critical(
@@ -4,176 +4,123 @@ import time
 from jinja2 import Environment, FileSystemLoader
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgumentSpec
 from application.common.game_base import BaseGame
-from application.common.toolbox import _get_proc_by_name, get_resources_dir
+from application.common.toolbox import (
+    _get_game_proc,
+    _get_pid_update_dict,
+    _get_proc_by_name,
+    get_resources_dir,
+)
 from application.extensions import DATABASE
 from application.models.games import Games
 
 
 class ValheimGame(BaseGame):
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        super(ValheimGame, self).__init__(defaults_dict)
-
-        self._game_name = "valheim"
-        self._game_pretty_name = "Valheim"
-        self._game_executable = "valheim_server.exe"
-        self._game_steam_id = "896660"
-        self._game_info_url = (
-            "https://valheim.com/support/a-guide-to-dedicated-servers/"
-        )
-
-        if self._game_default_install_dir:
-            default_persistent_data_path = os.path.join(
-                self._game_default_install_dir,
-                constants.GAME_INSTALL_FOLDER,
-                self._game_name,
-                "saves",
-            )
-            default_log_path = os.path.join(
-                self._game_default_install_dir,
-                constants.GAME_INSTALL_FOLDER,
-                self._game_name,
-                "logs",
-                "valheim.txt",
-            )
-        else:
-            default_persistent_data_path = None
-            default_log_path = None
-
-        # Add Args here, can update later.
-        # Default is 2456
-        self._add_argument(
-            GameArgument(
-                "-name",
-                value="Valheim",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-port",
-                value=2456,
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-world",
-                value="badlands",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-password",
-                value="abc123",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-savedir",
-                value=default_persistent_data_path,
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-                file_mode=constants.FileModes.DIRECTORY.value,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-public",
-                value="0",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
+    __slots__ = ()
 
-        self._add_argument(
-            GameArgument(
-                "-logFile",
-                value=default_log_path,
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-                file_mode=constants.FileModes.FILE.value,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-saveinterval",
-                value="1800",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-backups",
-                value="4",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-backupshort",
-                value="7200",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
+    _game_name = "valheim"
+    _game_pretty_name = "Valheim"
+    _game_executable = "valheim_server.exe"
+    _game_steam_id = "896660"
+    _game_info_url = "https://valheim.com/support/a-guide-to-dedicated-servers/"
 
-        self._add_argument(
-            GameArgument(
-                "-backuplong",
-                value="43200",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-crossplay",
-                value=" ",
-                required=False,
-                use_quotes=False,
-                is_permanent=False,
-            )
-        )
-
-        self._add_argument(
-            GameArgument(
-                "-preset",
-                value="normal",
-                required=True,
-                use_quotes=False,
-                is_permanent=True,
-            )
-        )
+    _game_argument_schema = (
+        # Default is 2456
+        GameArgumentSpec(
+            "-name",
+            value="Valheim",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-port",
+            value=2456,
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-world",
+            value="badlands",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-password",
+            value="abc123",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-savedir",
+            default_path=("saves",),
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+            file_mode=constants.FileModes.DIRECTORY.value,
+        ),
+        GameArgumentSpec(
+            "-public",
+            value="0",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-logFile",
+            default_path=("logs", "valheim.txt"),
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+            file_mode=constants.FileModes.FILE.value,
+        ),
+        GameArgumentSpec(
+            "-saveinterval",
+            value="1800",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-backups",
+            value="4",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-backupshort",
+            value="7200",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-backuplong",
+            value="43200",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-crossplay",
+            value=" ",
+            required=False,
+            use_quotes=False,
+            is_permanent=False,
+        ),
+        GameArgumentSpec(
+            "-preset",
+            value="normal",
+            required=True,
+            use_quotes=False,
+            is_permanent=True,
+        ),
+    )
 
     def startup(self) -> None:
         # Run base class checks
@@ -219,13 +166,13 @@ class ValheimGame(BaseGame):
 
         time.sleep(1)
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_proc_by_name(self._game_executable, refresh=True)
 
         logger.info(result)
         logger.info("Process:")
         logger.info(process)
 
-        update_dict = {"game_pid": int(process.pid)}
+        update_dict = _get_pid_update_dict(process)
 
         game_qry.update(update_dict)
         DATABASE.session.commit()
@@ -235,7 +182,12 @@ class ValheimGame(BaseGame):
         game_obj = game_qry.first()
         game_pid = game_obj.game_pid
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_game_proc(
+            game_pid,
+            game_obj.game_pid_create_time,
+            self._game_executable,
+            game_obj.game_install_dir,
+        )
 
         if process:
             logger.info(process)
@@ -244,6 +196,6 @@ class ValheimGame(BaseGame):
             process.terminate()
             process.wait()
 
-            update_dict = {"game_pid": None}
+            update_dict = _get_pid_update_dict(None)
             game_qry.update(update_dict)
             DATABASE.session.commit()
@@ -4,90 +4,68 @@ import time
 from jinja2 import Environment, FileSystemLoader
 
 from application.common import logger, constants
-from application.common.game_argument import GameArgument
+from application.common.game_argument import GameArgumentSpec
 from application.common.game_base import BaseGame
-from application.common.toolbox import _get_proc_by_name, get_resources_dir
+from application.common.toolbox import (
+    _get_game_proc,
+    _get_pid_update_dict,
+    _get_proc_by_name,
+    get_resources_dir,
+)
 from application.extensions import DATABASE
 from application.models.games import Games
 
 
 class VrisingGame(BaseGame):
-    def __init__(self, defaults_dict: dict = {}) -> None:
-        super(VrisingGame, self).__init__(defaults_dict)
-
-        self._game_name = "vrising"
-        self._game_pretty_name = "V Rising"
-        self._game_executable = "VRisingServer.exe"
-        self._game_steam_id = "1829350"
-        self._game_info_url = (
-            "https://github.com/StunlockStudios/vrising-dedicated-server-instructions"
-        )
-
-        if self._game_default_install_dir:
-            default_persistent_data_path = os.path.join(
-                self._game_default_install_dir,
-                constants.GAME_INSTALL_FOLDER,
-                self._game_name,
-            )
-            default_log_path = os.path.join(
-                self._game_default_install_dir,
-                constants.GAME_INSTALL_FOLDER,
-                self._game_name,
-                "logs",
-                "vrisinglog.txt",
-            )
-        else:
-            default_persistent_data_path = None
-            default_log_path = None
-
-        # Add Args here, can update later.
-        self._add_argument(
-            GameArgument(
-                "-persistentDataPath",
-                value=default_persistent_data_path,
-                required=True,
-                is_permanent=True,
-                file_mode=constants.FileModes.DIRECTORY.value,
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "-serverName",
-                value="Vrising World",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "-saveName",
-                value="AgentSave",
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
-        self._add_argument(
-            GameArgument(
-                "-logFile",
-                value=default_log_path,
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-                file_mode=constants.FileModes.FILE.value,
-            )
-        )
+    __slots__ = ()
+
+    _game_name = "vrising"
+    _game_pretty_name = "V Rising"
+    _game_executable = "VRisingServer.exe"
+    _game_steam_id = "1829350"
+    _game_info_url = (
+        "https://github.com/StunlockStudios/vrising-dedicated-server-instructions"
+    )
+
+    _game_argument_schema = (
+        GameArgumentSpec(
+            "-persistentDataPath",
+            default_path=(),
+            required=True,
+            is_permanent=True,
+            file_mode=constants.FileModes.DIRECTORY.value,
+        ),
+        GameArgumentSpec(
+            "-serverName",
+            value="Vrising World",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-saveName",
+            value="AgentSave",
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+        GameArgumentSpec(
+            "-logFile",
+            default_path=("logs", "vrisinglog.txt"),
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+            file_mode=constants.FileModes.FILE.value,
+        ),
         # Default is 27015
-        self._add_argument(
-            GameArgument(
-                "-serverPort",
-                value=27015,
-                required=True,
-                use_quotes=True,
-                is_permanent=True,
-            )
-        )
+        GameArgumentSpec(
+            "-serverPort",
+            value=27015,
+            required=True,
+            use_quotes=True,
+            is_permanent=True,
+        ),
+    )
 
     def startup(self) -> None:
         # Run base class checks
@@ -133,13 +111,13 @@ class VrisingGame(BaseGame):
 
         time.sleep(1)
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_proc_by_name(self._game_executable, refresh=True)
 
         logger.info(result)
         logger.info("Process:")
         logger.info(process)
 
-        update_dict = {"game_pid": int(process.pid)}
+        update_dict = _get_pid_update_dict(process)
 
         game_qry.update(update_dict)
         DATABASE.session.commit()
@@ -149,7 +127,12 @@ class VrisingGame(BaseGame):
         game_obj = game_qry.first()
         game_pid = game_obj.game_pid
 
-        process = _get_proc_by_name(self._game_executable)
+        process = _get_game_proc(
+            game_pid,
+            game_obj.game_pid_create_time,
+            self._game_executable,
+            game_obj.game_install_dir,
+        )
 
         if process:
             logger.info(process)
@@ -158,6 +141,6 @@ class VrisingGame(BaseGame):
             process.terminate()
             process.wait()
 
-            update_dict = {"game_pid": None}
+            update_dict = _get_pid_update_dict(None)
             game_qry.update(update_dict)
             DATABASE.session.commit()
@@ -0,0 +1,68 @@
+import requests
+
+from application.common import constants, logger
+
+
+class AgentClient:
+    """
+    Client for the agent endpoints that the operator client does not wrap yet.
+
+    - A whole set of argument changes is sent as one request, and the agent applies all of them in
+      a single transaction.
+    - Waiting on an install job is a long poll, the agent answers the moment the job is done.
+    """
+
+    def __init__(self, hostname: str, port: str, timeout: int = 10) -> None:
+        self._base_url = f"{hostname}:{port}/v1"
+        self._timeout = timeout
+
+    def _request(self, method: str, path: str, wait_seconds: float = 0, **kwargs):
+        """Send a request to the agent. Returns the decoded response, or None on failure."""
+        url = f"{self._base_url}{path}"
+
+        try:
+            response = requests.request(
+                method, url, timeout=wait_seconds + self._timeout, **kwargs
+            )
+        except requests.exceptions.RequestException as error:
+            logger.error(f"AgentClient: {method} {path} failed: {error}")
+            return None
+
+        if response.status_code != 200:
+            logger.error(
+                f"AgentClient: {method} {path} failed with status "
+                f"{response.status_code}: {response.text}"
+            )
+            return None
+
+        return response.json()
+
+    def bulk_update_arguments(self, game_name: str, arguments: list) -> dict:
+        """Create, update or delete the given arguments. Returns None on failure."""
+        return self._request(
+            "POST", f"/game/{game_name}/arguments/bulk", json=arguments
+        )
+
+    def wait_for_job(
+        self, job_id: int, wait_seconds: float = constants.LONG_POLL_DEFAULT_SECONDS
+    ) -> dict:
+        """Wait up to wait_seconds for a job to finish. Returns the job, or None on failure."""
+        return self._request(
+            "GET",
+            f"/steam/app/job/{job_id}/wait",
+            wait_seconds=wait_seconds,
+            params={"timeout": wait_seconds},
+        )
+
+    def wait_until_finished(self, job_id: int) -> dict:
+        """
+        Wait for a job to finish, however long it takes. Returns the job, or None on failure. This
+        blocks, so GUI code runs it on a JobWaiter thread.
+        """
+        job = self.wait_for_job(job_id)
+
+        while job is not None and not job["is_finished"]:
+            logger.debug(f"AgentClient: Waiting for job {job_id} to finish....")
+            job = self.wait_for_job(job_id)
+
+        return job
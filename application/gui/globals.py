@@ -1,6 +1,7 @@
 from flask import Flask
 from PyQt5.QtGui import QClipboard
 
+from application.gui.agent_client import AgentClient
 from application.gui.intalled_games_menu import InstalledGameMenu
 from application.gui.widgets.add_argument_widget import AddArgumentWidget
 from application.managers.nginx_manager import NginxManager
@@ -28,6 +29,7 @@ class GuiGlobals:
         # Objects
         self._FLASK_APP: Flask = None
         self._client: Operator = None
+        self._agent_client: AgentClient = None
         self._installed_games_menu: InstalledGameMenu = None
         self._add_arguments_widget: AddArgumentWidget = None
         self._global_clipboard: QClipboard = None
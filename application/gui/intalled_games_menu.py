@@ -2,7 +2,6 @@ import time
 
 from PyQt5.QtWidgets import QMenu, QWidget, QWidgetAction, QPushButton
 
-from application import games
 from application.common import toolbox, logger
 from application.common.decorators import timeit
 from operator_client import Operator
@@ -21,7 +20,6 @@ class InstalledGameMenu(QMenu):
         self._parent = parent
         self._init_data = init_data
         self._buttons: dict = {}
-        self._modules_dict = toolbox._find_conforming_modules(games)
 
         # Must call update_menu_list as opposed to update_menu to avoid overloading built in
         # function name!
@@ -49,19 +47,20 @@ class InstalledGameMenu(QMenu):
 
             all_games = all_games["items"]
 
+        # Resolve every game server with a single process table scan.
+        game_statuses = toolbox._get_game_server_statuses(all_games)
+
         for game in all_games:
             game_name = game["game_name"]
             game_pretty_name = game["game_pretty_name"]
             game_pid = game["game_pid"]
 
-            game_exe = self._get_executable_name(game_name)
-
             action = QWidgetAction(self)
 
             button = QPushButton(game_pretty_name)
 
             is_game_running = self._is_running(game_pid)
-            is_exe_found = self._executable_is_found(game_exe)
+            is_exe_found = game_statuses[game_name]["is_exe_found"]
 
             if is_game_running and is_exe_found:
                 button.setStyleSheet(BACKGROUND_STR.format(color=COLOR_RUNNING))
@@ -84,22 +83,6 @@ class InstalledGameMenu(QMenu):
     def _is_running(self, game_pid):
         return True if game_pid else False
 
-    def _get_executable_name(self, game_name) -> str:
-        game_obj = None
-        game_executable = ""
-
-        for module_name in self._modules_dict.keys():
-            game_obj = toolbox._instantiate_object(
-                module_name, self._modules_dict[module_name]
-            )
-            if game_obj._game_name == game_name:
-                game_executable = game_obj._game_executable
-
-        return game_executable
-
-    def _executable_is_found(self, exe_name: str) -> bool:
-        return True if toolbox._get_proc_by_name(exe_name) else False
-
     def _handle_click(self):
         game_pretty_name = self.sender().text()
 
@@ -115,12 +98,14 @@ class InstalledGameMenu(QMenu):
             f"PID: {game_pid}"
         )
 
-        game_exe = self._get_executable_name(game_name)
+        is_exe_found = toolbox._get_game_server_statuses([game_info])[game_name][
+            "is_exe_found"
+        ]
 
-        if self._is_running(game_pid) and self._executable_is_found(game_exe):
+        if self._is_running(game_pid) and is_exe_found:
             # In this case, the game exe is found on the host, and the database is correct.
             self._client.game.game_shutdown(game_name)
-        elif not self._is_running(game_pid) and self._executable_is_found(game_exe):
+        elif not self._is_running(game_pid) and is_exe_found:
             # Catch the situation where the game pid in the DB is None/False, but the game exe is
             # still found on the host.
             self._client.game.game_shutdown(game_name)
@@ -0,0 +1,23 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from application.gui.agent_client import AgentClient
+
+
+class JobWaiter(QThread):
+    """
+    Waits for an install job on its own thread, so the GUI stays responsive while steamcmd runs.
+    job_finished is emitted with the finished job, or None on failure, and its slots run on the
+    GUI thread. The parent widget keeps the waiter alive, it deletes itself once it is done.
+    """
+
+    job_finished = pyqtSignal(object)
+
+    def __init__(self, agent_client: AgentClient, job_id: int, parent=None) -> None:
+        super().__init__(parent)
+        self._agent_client = agent_client
+        self._job_id = job_id
+
+        self.finished.connect(self.deleteLater)
+
+    def run(self) -> None:
+        self.job_finished.emit(self._agent_client.wait_until_finished(self._job_id))
@@ -12,6 +12,7 @@ from application.config.config import DefaultConfig
 from application.common import logger, constants
 from application.common.decorators import timeit
 from application.common.toolbox import _get_application_path
+from application.gui.agent_client import AgentClient
 from application.gui.globals import GuiGlobals
 from application.gui.game_install_window import GameInstallWindow
 from application.gui.game_manager_window import GameManagerWindow
@@ -29,13 +30,17 @@ class GuiApp:
     def __init__(self, globals_obj: GuiGlobals) -> None:
         # Globals
         self._globals = globals_obj
-        self._globals._FLASK_APP = self._create_backend()
         self._globals._client = Operator(
             "http://" + self._globals._server_host,
             self._globals._server_port,
             verbose=False,
             timeout=10,
         )
+        self._globals._agent_client = AgentClient(
+            "http://" + self._globals._server_host,
+            self._globals._server_port,
+            timeout=10,
+        )
         self._globals._nginx_manager = NginxManager(self._globals._client)
 
         # Declare variables
@@ -51,10 +56,13 @@ class GuiApp:
         self._timer.timeout.connect(self._refresh_on_timer)
 
     @timeit
-    def _create_backend(self) -> Flask:
+    def _create_backend(self, with_server: bool) -> Flask:
         config = DefaultConfig("python")
         config.obtain_environment_variables()
 
+        # Without the server, the agent running on its own runs the background jobs.
+        config.BACKGROUND_JOBS_ENABLED = with_server
+
         config.DEBUG = False
         config.LOG_LEVEL = logging.INFO
         config.ENV = "production"
@@ -140,10 +148,13 @@ class GuiApp:
                 return
 
             # Launch Flask Server
+            self._globals._FLASK_APP = self._create_backend(with_server)
             self._spawn_server_on_thread()
 
             # Give server a chance to start before proceeding...
             time.sleep(1)
+        else:
+            self._globals._FLASK_APP = self._create_backend(with_server)
 
         initialization_data = self._globals._client.app.get_gui_initialization_data()
 
@@ -16,6 +16,7 @@ from PyQt5.QtCore import Qt
 
 from application.common import logger
 from application.common.constants import FileModes
+from application.gui.agent_client import AgentClient
 from application.gui.widgets.file_select_widget import FileSelectWidget
 from operator_client import Operator
 
@@ -33,6 +34,8 @@ class GameArgumentsWidget(QWidget):
         parent: QWidget,
         disable_cols: list = [],
         built_in_args=None,
+        game_name: str = None,
+        agent_client: AgentClient = None,
     ) -> None:
         super(QWidget, self).__init__(parent)
 
@@ -46,6 +49,9 @@ class GameArgumentsWidget(QWidget):
         # Args on this widget
         self._args_dict: dict = {}
         self._disable_cols = disable_cols
+        # Saves go through the bulk endpoint when the game and a client for it are known.
+        self._game_name = game_name
+        self._agent_client = agent_client
 
         self.init_ui()
 
@@ -55,6 +61,11 @@ class GameArgumentsWidget(QWidget):
         self._table_layout = QVBoxLayout()
         self._table_layout.addWidget(self._table)
 
+        if self._agent_client and "Actions" not in self._disable_cols:
+            save_all_button = QPushButton("Save All", self)
+            save_all_button.clicked.connect(self._update_all_arguments)
+            self._table_layout.addWidget(save_all_button)
+
         self._table.setSizeAdjustPolicy(
             QAbstractScrollArea.SizeAdjustPolicy.AdjustToContents
         )
@@ -215,12 +226,30 @@ class GameArgumentsWidget(QWidget):
 
         return arg_edit_widget
 
+    def _bulk_update(self, arguments: list) -> bool:
+        return (
+            self._agent_client.bulk_update_arguments(self._game_name, arguments)
+            is not None
+        )
+
+    def _get_arg_value(self, arg_name):
+        value_widget = self._args_dict[arg_name]
+        if isinstance(value_widget, FileSelectWidget):
+            return value_widget.get_line_edit().text()
+        else:
+            return value_widget.text()
+
     def _delete_argument(self, arg_id):
         logger.debug(f"Deleting Argument id: {arg_id}!")
 
         message = QMessageBox()
 
-        if self._client.game.delete_argument_by_id(arg_id):
+        if self._agent_client:
+            is_deleted = self._bulk_update([{"game_arg_id": arg_id, "delete": True}])
+        else:
+            is_deleted = self._client.game.delete_argument_by_id(arg_id)
+
+        if is_deleted:
             message.setText("Argument Deleted.")
         else:
             message.setText("Error: Argument not deleted...")
@@ -229,16 +258,39 @@ class GameArgumentsWidget(QWidget):
     def _update_argument(self, arg_id, arg_name):
         logger.debug(f"Updating Argument id: {arg_id}!")
 
-        value_widget = self._args_dict[arg_name]
-        if isinstance(value_widget, FileSelectWidget):
-            new_arg_value = value_widget.get_line_edit().text()
-        else:
-            new_arg_value = value_widget.text()
+        new_arg_value = self._get_arg_value(arg_name)
 
         message = QMessageBox()
 
-        if self._client.game.update_argument_by_id(arg_id, new_arg_value):
+        if self._agent_client:
+            is_updated = self._bulk_update(
+                [{"game_arg_id": arg_id, "game_arg_value": new_arg_value}]
+            )
+        else:
+            is_updated = self._client.game.update_argument_by_id(arg_id, new_arg_value)
+
+        if is_updated:
             message.setText(f"Updated Argument: {arg_name} to: {new_arg_value}.")
         else:
             message.setText("Error: Argument not updated...")
         message.exec()
+
+    def _update_all_arguments(self):
+        logger.debug(f"Updating all arguments of {self._game_name}!")
+
+        arguments = [
+            {
+                "game_arg_id": arg["game_arg_id"],
+                "game_arg_value": self._get_arg_value(arg["game_arg"]),
+            }
+            for arg in self._arg_data
+            if "game_arg_id" in arg
+        ]
+
+        message = QMessageBox()
+
+        if self._bulk_update(arguments):
+            message.setText(f"Updated {len(arguments)} arguments.")
+        else:
+            message.setText("Error: Arguments not updated...")
+        message.exec()
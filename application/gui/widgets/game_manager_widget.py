@@ -1,5 +1,6 @@
 import time
 
+from functools import partial
 from PyQt5.QtWidgets import (
     QWidget,
     QVBoxLayout,
@@ -13,9 +14,11 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QTimer
 
-from application import games
 from application.common import constants, toolbox, logger
 from application.common.game_base import BaseGame
+from application.common.game_registry import GAME_REGISTRY
+from application.gui.agent_client import AgentClient
+from application.gui.job_waiter import JobWaiter
 from application.gui.widgets.add_argument_widget import AddArgumentWidget
 from application.gui.intalled_games_menu import InstalledGameMenu
 from application.gui.widgets.game_arguments_widget import GameArgumentsWidget
@@ -40,13 +43,13 @@ class GameManagerWidget(QWidget):
         self._install_games_menu: InstalledGameMenu = globals._installed_games_menu
         self._current_game_frame: QFrame = None
         self._add_arguments_widget: AddArgumentWidget = globals._add_arguments_widget
+        self._agent_client: AgentClient = globals._agent_client
         self._current_arg_widget: GameArgumentsWidget = None
 
         self._add_arguments_widget._parent = self
 
         # Primitives
         self._installed_supported_games: dict = {}
-        self._modules_dict: dict = toolbox._find_conforming_modules(games)
         self._current_game_name: str = None
         self._current_game_exe: str = None
 
@@ -67,13 +70,7 @@ class GameManagerWidget(QWidget):
         self._game_update_required: QLabel = None
 
     def _get_game_object(self, game_name):
-        for module_name in self._modules_dict.keys():
-            game_obj = toolbox._instantiate_object(
-                module_name, self._modules_dict[module_name]
-            )
-            if game_obj._game_name == game_name:
-                return game_obj
-        return None
+        return GAME_REGISTRY.get_game_object(game_name)
 
     def init_ui(self, game_data):
         self._layout.sizeConstraint = QLayout.SetDefaultConstraint
@@ -176,7 +173,9 @@ class GameManagerWidget(QWidget):
 
         update_data = self._client.game.check_for_update(game_id)
 
-        if update_data:  # not None
+        if update_data and update_data.get("is_pending", False):
+            self._game_update_required.setText("Checking...")
+        elif update_data:  # not None
             is_required = update_data["is_required"]
             required_text = "Yes" if is_required else "No"
             self._game_update_required.setText(required_text)
@@ -190,7 +189,7 @@ class GameManagerWidget(QWidget):
             self._game_pid_label.setText(f"{game_pid}")
             is_game_pid = True
 
-        is_exe_found = self._executable_is_found(self._current_game_exe)
+        is_exe_found = self._executable_is_found(game_data)
 
         if is_exe_found:
             self._game_exe_found_label.setText("Executable Running!")
@@ -311,7 +310,12 @@ class GameManagerWidget(QWidget):
         built_in_args = game_object._get_argument_list()
         game_args = self._client.game.get_argument_by_game_name(game_object._game_name)
         self._current_arg_widget = GameArgumentsWidget(
-            self._client, game_args, game_frame, built_in_args=built_in_args
+            self._client,
+            game_args,
+            game_frame,
+            built_in_args=built_in_args,
+            game_name=game_object._game_name,
+            agent_client=self._agent_client,
         )
 
         game_frame_main_layout.addWidget(game_args_label)
@@ -398,8 +402,9 @@ class GameManagerWidget(QWidget):
         self._disable_all_btns()
         self._refresh_on_timer()
 
-    def _executable_is_found(self, exe_name: str) -> bool:
-        return True if toolbox._get_proc_by_name(exe_name) else False
+    def _executable_is_found(self, game_data: dict) -> bool:
+        game_status = toolbox._get_game_server_statuses([game_data])
+        return game_status[game_data["game_name"]]["is_exe_found"]
 
     def _show_add_argument_widget(self, game_name):
         logger.info(f"Showing Add Arg Widget for game: {game_name}")
@@ -458,17 +463,30 @@ class GameManagerWidget(QWidget):
         steam_id = game_info["items"][0]["game_steam_id"]
         install_path = game_info["items"][0]["game_install_dir"]
 
-        thread_ident = self._client.steam.update_steam_app(
+        job_id = self._client.steam.update_steam_app(
             steam_install_dir, steam_id, install_path
         )
-        thread_alive = self._client.app.is_thread_alive(thread_ident)
 
-        logger.debug(f"Update Thread Ident: {thread_ident}, Alive: {thread_alive}")
+        logger.debug(f"Update Job ID: {job_id}, waiting for update to finish.")
+
+        # The agent answers the moment the update is done, wait for it off the GUI thread.
+        job_waiter = JobWaiter(self._agent_client, job_id, self)
+        job_waiter.job_finished.connect(
+            partial(
+                self._finish_update,
+                job_id,
+                game_id,
+                steam_id,
+                install_path,
+                steam_install_dir,
+            )
+        )
+        job_waiter.start()
 
-        while thread_alive:
-            logger.debug("Waiting for update to finish....")
-            thread_alive = self._client.app.is_thread_alive(thread_ident)
-            time.sleep(1)
+    def _finish_update(
+        self, job_id, game_id, steam_id, install_path, steam_install_dir, job
+    ):
+        logger.debug(f"Update Job ID: {job_id}, Finished: {job}")
 
         steam_build_id = self._client.steam.get_steam_app_build_id(
             steam_install_dir, install_path, steam_id
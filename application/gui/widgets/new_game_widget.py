@@ -1,6 +1,6 @@
 import os
-import time
 
+from functools import partial
 from PyQt5.QtWidgets import (
     QWidget,
     QComboBox,
@@ -14,13 +14,14 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 
-from application.common import constants, toolbox, logger
+from application.common import constants, logger
 from application.common.game_argument import GameArgument
 from application.common.game_base import BaseGame
+from application.common.game_registry import GAME_REGISTRY
 from application.gui.globals import GuiGlobals
+from application.gui.job_waiter import JobWaiter
 from application.gui.widgets.file_select_widget import FileSelectWidget
 from application.gui.widgets.game_arguments_widget import GameArgumentsWidget
-from application import games
 
 
 class NewGameWidget(QWidget):
@@ -134,12 +135,7 @@ class NewGameWidget(QWidget):
 
         self._combo_box = QComboBox()
 
-        modules_dict = toolbox._find_conforming_modules(games)
-
-        for module_name in modules_dict.keys():
-            game_obj = toolbox._instantiate_object(
-                module_name, modules_dict[module_name], self._defaults
-            )
+        for game_obj in GAME_REGISTRY.get_all_game_objects(self._defaults):
             self._supported_games[game_obj._game_pretty_name] = game_obj
             self._combo_box.addItem(game_obj._game_pretty_name)
 
@@ -235,35 +231,66 @@ class NewGameWidget(QWidget):
 
             input_dict[arg] = line_edit.text()
 
-        thread_ident = self._client.steam.install_steam_app(
+        job_id = self._client.steam.install_steam_app(
             steam_install_dir,
             steam_id,
             install_path,
         )
-        thread_alive = self._client.app.is_thread_alive(thread_ident)
 
-        logger.debug(f"Install Thread Ident: {thread_ident}, Alive: {thread_alive}")
+        logger.debug(f"Install Job ID: {job_id}, waiting for installation to finish.")
 
-        while thread_alive:
-            logger.debug("Waiting for installation to finish....")
-            thread_alive = self._client.app.is_thread_alive(thread_ident)
-            time.sleep(1)
+        # The arguments are added once the install is done, in a single request.
+        arguments = []
 
-        # Add arguments after install
         for arg_name, arg_val in input_dict.items():
             arg_object: GameArgument = default_argument_dict[
                 arg_name
             ]  # Use this to get other attributes.
-            self._client.game.create_argument(
+            arguments.append(
+                {
+                    "game_arg": arg_name,
+                    "game_arg_value": arg_val,
+                    "is_permanent": arg_object._is_permanent,
+                    "required": arg_object._required,
+                    "file_mode": arg_object._file_mode,
+                    "use_equals": arg_object._use_equals,
+                    "use_quotes": arg_object._use_quotes,
+                }
+            )
+
+        # The agent answers the moment the install is done, wait for it off the GUI thread.
+        job_waiter = JobWaiter(self._globals._agent_client, job_id, self)
+        job_waiter.job_finished.connect(
+            partial(
+                self._finish_install,
+                job_id,
+                game_pretty_name,
                 game_name,
-                arg_name,
-                arg_val,
-                is_permanent=arg_object._is_permanent,
-                required=arg_object._required,
-                file_mode=arg_object._file_mode,
-                use_equals=arg_object._use_equals,
-                use_quotes=arg_object._use_quotes,
+                arguments,
+                steam_id,
+                install_path,
+                steam_install_dir,
             )
+        )
+        job_waiter.start()
+
+    def _finish_install(
+        self,
+        job_id,
+        game_pretty_name,
+        game_name,
+        arguments,
+        steam_id,
+        install_path,
+        steam_install_dir,
+        job,
+    ):
+        logger.debug(f"Install Job ID: {job_id}, Finished: {job}")
+
+        agent_client = self._globals._agent_client
+
+        if agent_client.bulk_update_arguments(game_name, arguments) is None:
+            logger.error(f"Unable to add the arguments of {game_name}.")
 
         self._install_games_menu.update_menu_list()
 
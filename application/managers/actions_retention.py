@@ -0,0 +1,240 @@
+import threading
+
+from flask import Flask
+from sqlalchemy import delete, desc, func, select, tuple_
+from sqlalchemy.dialects.sqlite import insert
+
+from application.common import constants, logger
+from application.common.constants import InstallJobStates
+from application.common.settings_cache import SETTINGS_CACHE
+from application.extensions import DATABASE
+from application.models.action_summaries import ActionSummaries
+from application.models.actions import Actions
+from application.models.games import Games
+from application.models.install_jobs import InstallJobs
+
+
+class ActionsRetention:
+    """
+    Background job that keeps the actions table bounded.
+
+    Only the latest actions of every game are kept. Older actions are rolled up into daily counts
+    per action type in the action summaries table, then deleted in small batches so the database
+    is never locked for long. Freed pages are returned to the file system with an incremental
+    vacuum. The settings table controls whether the job runs, how many actions are kept per game,
+    and how often it runs.
+    """
+
+    BATCH_SIZE = 5000
+    VACUUM_PAGES = 1000
+    RETRY_INTERVAL_SEC = 60
+
+    def __init__(self) -> None:
+        self._app: Flask = None
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread = None
+        self._is_auto_vacuum_incremental = False
+
+    def init_app(self, flask_app: Flask) -> None:
+        self._app = flask_app
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="ActionsRetention", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    @staticmethod
+    def _get_setting(setting_name: str, default):
+        return SETTINGS_CACHE.get(setting_name, default)
+
+    def _get_settings(self) -> tuple:
+        config = self._app.config
+
+        # DB stores these as strings.
+        is_enabled = self._get_setting(
+            constants.SETTING_ACTIONS_RETENTION_ENABLE,
+            config["ACTIONS_RETENTION_DEFAULT_ENABLED"],
+        )
+        retention_count = self._get_setting(
+            constants.SETTING_ACTIONS_RETENTION_COUNT,
+            config["ACTIONS_RETENTION_DEFAULT_COUNT"],
+        )
+        interval_sec = self._get_setting(
+            constants.SETTING_ACTIONS_RETENTION_INTERVAL,
+            config["ACTIONS_RETENTION_DEFAULT_INTERVAL_SEC"],
+        )
+
+        is_enabled = str(is_enabled).lower() in ["1", "true"]
+
+        return is_enabled, int(retention_count), float(interval_sec)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            interval_sec = self.RETRY_INTERVAL_SEC
+
+            try:
+                with self._app.app_context():
+                    is_enabled, retention_count, interval_sec = self._get_settings()
+
+                    if is_enabled:
+                        self._enable_incremental_vacuum()
+                        self.run_once(retention_count)
+            except Exception as error:
+                logger.error(f"ActionsRetention: Retention job failed: {error}")
+
+            self._stop_event.wait(interval_sec)
+
+    def run_once(self, retention_count: int) -> int:
+        """Prune every game down to its latest actions. Must run in an app context."""
+        if retention_count < 1:
+            logger.error(
+                f"ActionsRetention: Invalid retention count {retention_count}, skipping."
+            )
+            return 0
+
+        num_pruned = 0
+
+        game_ids = DATABASE.session.execute(
+            select(Actions.game_id).distinct()
+        ).scalars()
+
+        for game_id in list(game_ids):
+            num_pruned += self._prune_game(game_id, retention_count)
+
+        if num_pruned > 0:
+            logger.info(f"ActionsRetention: Rolled up {num_pruned} actions.")
+            self._incremental_vacuum()
+
+        return num_pruned
+
+    def _prune_game(self, game_id: int, retention_count: int) -> int:
+        # The oldest action to keep. Served by the (game_id, timestamp) index.
+        cutoff = DATABASE.session.execute(
+            select(Actions.timestamp, Actions.action_id)
+            .where(Actions.game_id == game_id)
+            .order_by(desc(Actions.timestamp), desc(Actions.action_id))
+            .offset(retention_count - 1)
+            .limit(1)
+        ).first()
+
+        if cutoff is None:
+            return 0
+
+        batch = (
+            select(Actions.action_id)
+            .where(Actions.game_id == game_id)
+            .where(
+                tuple_(Actions.timestamp, Actions.action_id)
+                < tuple_(cutoff.timestamp, cutoff.action_id)
+            )
+            .order_by(Actions.timestamp, Actions.action_id)
+            .limit(self.BATCH_SIZE)
+        )
+
+        day = func.date(Actions.timestamp)
+
+        rollup = insert(ActionSummaries).from_select(
+            ["game_id", "day", "type", "count"],
+            select(Actions.game_id, day, Actions.type, func.count())
+            .where(Actions.action_id.in_(batch))
+            .group_by(Actions.game_id, day, Actions.type),
+        )
+        rollup = rollup.on_conflict_do_update(
+            index_elements=["game_id", "day", "type"],
+            set_={"count": ActionSummaries.count + rollup.excluded["count"]},
+        )
+
+        num_pruned = 0
+
+        while True:
+            try:
+                DATABASE.session.execute(rollup)
+                result = DATABASE.session.execute(
+                    delete(Actions).where(Actions.action_id.in_(batch))
+                )
+                DATABASE.session.commit()
+            except Exception:
+                DATABASE.session.rollback()
+                raise
+
+            num_pruned += result.rowcount
+
+            if result.rowcount < self.BATCH_SIZE:
+                break
+
+        return num_pruned
+
+    @staticmethod
+    def _get_auto_vacuum(connection) -> int:
+        return connection.driver_connection.execute("PRAGMA auto_vacuum").fetchone()[0]
+
+    @staticmethod
+    def _is_idle() -> bool:
+        """Whether no game server is running and no install job is queued or running."""
+        num_running_games = Games.query.filter(Games.game_pid.isnot(None)).count()
+        num_active_jobs = InstallJobs.query.filter(
+            InstallJobs.state.in_(
+                [InstallJobStates.QUEUED.value, InstallJobStates.RUNNING.value]
+            )
+        ).count()
+
+        return num_running_games == 0 and num_active_jobs == 0
+
+    def _enable_incremental_vacuum(self) -> None:
+        """
+        Switch a database created before the database_v12 migration to incremental auto vacuum.
+        That takes a full VACUUM, which rewrites the whole file, so it only runs once, the first
+        time the agent is idle. New databases start out incremental.
+        """
+        if self._is_auto_vacuum_incremental or DATABASE.engine.dialect.name != "sqlite":
+            return
+
+        connection = DATABASE.engine.raw_connection()
+
+        try:
+            if self._get_auto_vacuum(connection) == 2:
+                self._is_auto_vacuum_incremental = True
+                return
+
+            if not self._is_idle():
+                logger.debug(
+                    "ActionsRetention: Not idle, not switching to incremental vacuum yet."
+                )
+                return
+
+            logger.info("ActionsRetention: Switching to incremental vacuum.")
+
+            # VACUUM cannot run in a transaction, executescript commits first.
+            connection.driver_connection.executescript(
+                "PRAGMA auto_vacuum=INCREMENTAL; VACUUM;"
+            )
+            self._is_auto_vacuum_incremental = self._get_auto_vacuum(connection) == 2
+        finally:
+            connection.close()
+
+    def _incremental_vacuum(self) -> None:
+        if DATABASE.engine.dialect.name != "sqlite":
+            return
+
+        connection = DATABASE.engine.raw_connection()
+
+        try:
+            if self._get_auto_vacuum(connection) != 2:
+                logger.debug("ActionsRetention: Incremental vacuum is not enabled.")
+                return
+
+            # The sqlite3 execute path steps a statement only once, which frees a single page.
+            # executescript steps it until all the pages are freed.
+            connection.driver_connection.executescript(
+                f"PRAGMA incremental_vacuum({int(self.VACUUM_PAGES)})"
+            )
+        finally:
+            connection.close()
+
+
+ACTIONS_RETENTION = ActionsRetention()
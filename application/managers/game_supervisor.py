@@ -0,0 +1,171 @@
+import psutil
+import threading
+
+from flask import Flask
+
+from application.common import logger
+from application.common.constants import GameActionTypes, GameStates
+from application.extensions import DATABASE
+from application.models.actions import Actions
+from application.models.games import Games
+
+
+class GameSupervisor:
+    """
+    Watches the game server processes that the agent launched, on a single background thread.
+
+    The thread blocks on the watched processes with psutil.wait_procs, so a game server that exits
+    on its own is noticed within milliseconds instead of at the next poll. The game's PID is then
+    cleared from the database, the game is marked stopped, and an action is recorded.
+    """
+
+    WAIT_TIMEOUT_SECONDS = 1.0
+    IDLE_WAIT_SECONDS = 5.0
+    ACTION_OWNER = "SUPERVISOR"
+
+    def __init__(self) -> None:
+        self._app: Flask = None
+        self._lock = threading.Lock()
+        self._watched: dict = {}  # pid -> (game_id, process)
+        self._wakeup_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: threading.Thread = None
+
+    def init_app(self, flask_app: Flask) -> None:
+        self._app = flask_app
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="GameSupervisor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wakeup_event.set()
+
+    def watch(self, game_id: int, process: psutil.Process) -> None:
+        with self._lock:
+            self._watched[process.pid] = (game_id, process)
+
+        logger.debug(f"GameSupervisor: Watching game ID {game_id}, PID {process.pid}")
+        self._wakeup_event.set()
+
+    def unwatch(self, pid: int) -> None:
+        with self._lock:
+            self._watched.pop(pid, None)
+
+    def watch_game(self, game_name: str) -> None:
+        """Start watching the process whose PID is stored for the given game."""
+        game_obj = Games.query.filter_by(game_name=game_name).first()
+
+        if game_obj is None or game_obj.game_pid is None:
+            return
+
+        try:
+            process = psutil.Process(game_obj.game_pid)
+        except psutil.Error as error:
+            logger.error(error)
+            return
+
+        self.watch(game_obj.game_id, process)
+
+    def unwatch_game(self, game_name: str) -> None:
+        """Stop watching a game, e.g. because the agent is about to shut it down itself."""
+        game_obj = Games.query.filter_by(game_name=game_name).first()
+
+        if game_obj is None or game_obj.game_pid is None:
+            return
+
+        self.unwatch(game_obj.game_pid)
+
+    def get_process(self, pid: int) -> psutil.Process:
+        """
+        Return the watched process for a PID, or None if it is not being watched or has exited.
+        Exits are only noticed once per wait timeout, so a process is checked before it is trusted.
+        """
+        with self._lock:
+            watched = self._watched.get(pid, None)
+
+        if watched is None:
+            return None
+
+        try:
+            is_running = watched[1].is_running()
+        except psutil.Error:
+            is_running = False
+
+        return watched[1] if is_running else None
+
+    def _get_watched_processes(self) -> list:
+        with self._lock:
+            return [process for _, process in self._watched.values()]
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            processes = self._get_watched_processes()
+
+            if len(processes) == 0:
+                self._wakeup_event.wait(self.IDLE_WAIT_SECONDS)
+                self._wakeup_event.clear()
+                continue
+
+            try:
+                gone, _ = psutil.wait_procs(
+                    processes, timeout=self.WAIT_TIMEOUT_SECONDS
+                )
+            except Exception as error:
+                logger.error(f"GameSupervisor: Error waiting on processes: {error}")
+                self._stop_event.wait(self.WAIT_TIMEOUT_SECONDS)
+                continue
+
+            for process in gone:
+                self._handle_exit(process)
+
+    def _handle_exit(self, process: psutil.Process) -> None:
+        with self._lock:
+            watched = self._watched.pop(process.pid, None)
+
+        # Unwatched while waiting, the agent shut the game down itself.
+        if watched is None or self._app is None:
+            return
+
+        game_id = watched[0]
+
+        logger.info(
+            f"GameSupervisor: Game ID {game_id}, PID {process.pid} exited with "
+            f"return code {process.returncode}"
+        )
+
+        with self._app.app_context():
+            # Only touch the game if the database still refers to this process.
+            game_qry = Games.query.filter_by(game_id=game_id, game_pid=process.pid)
+
+            if game_qry.first() is None:
+                return
+
+            try:
+                game_qry.update(
+                    {
+                        "game_pid": None,
+                        "game_pid_create_time": None,
+                        "game_state": GameStates.STOPPED.value,
+                    }
+                )
+
+                new_action = Actions()
+                new_action.type = GameActionTypes.EXITED.value
+                new_action.game_id = game_id
+                new_action.owner = self.ACTION_OWNER
+                new_action.result = str(process.returncode)
+                DATABASE.session.add(new_action)
+                DATABASE.session.commit()
+            except Exception as error:
+                DATABASE.session.rollback()
+                logger.critical(
+                    f"GameSupervisor: Unable to record exit of game ID {game_id}: {error}"
+                )
+
+
+GAME_SUPERVISOR = GameSupervisor()
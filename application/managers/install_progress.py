@@ -0,0 +1,181 @@
+import re
+import threading
+import time
+
+from collections import OrderedDict, deque
+
+# e.g. " Update state (0x61) downloading, progress: 45.23 (1234567 / 2729392)"
+PROGRESS_REGEX = re.compile(
+    r"Update state \((?P<code>0x[0-9a-fA-F]+)\) (?P<state>[^,]+), "
+    r"progress: (?P<percent>\d+(?:\.\d+)?) \((?P<done>\d+) / (?P<total>\d+)\)"
+)
+
+
+class InstallProgress:
+    """
+    Live progress of one steamcmd install or update job.
+
+    Output lines are fed in as steamcmd prints them. Progress lines are parsed into the current
+    state, bytes downloaded, total bytes and percent. Only the latest lines are kept, in a ring
+    buffer, so a job that runs for hours still uses a constant amount of memory.
+    """
+
+    MAX_LINES = 200
+
+    def __init__(self, steam_id, max_lines: int = MAX_LINES) -> None:
+        self._lock = threading.Lock()
+        self._lines = deque(maxlen=max_lines)
+        self._success_msg = f"Success! App '{steam_id}' fully installed."
+
+        self.job_id: int = None
+        self.steam_id = steam_id
+        self.state: str = "queued"
+        self.state_code: str = None
+        self.bytes_downloaded: int = None
+        self.total_bytes: int = None
+        self.percent: float = None
+        self.num_lines = 0
+        self.is_finished = False
+        self.is_successful = False
+        self.return_code: int = None
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+
+    @staticmethod
+    def parse_line(line: str) -> dict:
+        """Parse a steamcmd progress line, returns None for any other line."""
+        match = PROGRESS_REGEX.search(line)
+
+        if match is None:
+            return None
+
+        return {
+            "state": match.group("state").strip(),
+            "state_code": match.group("code"),
+            "bytes_downloaded": int(match.group("done")),
+            "total_bytes": int(match.group("total")),
+            "percent": float(match.group("percent")),
+        }
+
+    def feed_line(self, line: str) -> None:
+        line = line.strip()
+
+        if line == "":
+            return
+
+        progress = self.parse_line(line)
+
+        with self._lock:
+            self._lines.append(line)
+            self.num_lines += 1
+            self.updated_at = time.time()
+
+            if progress is not None:
+                for key, value in progress.items():
+                    setattr(self, key, value)
+
+            if self._success_msg in line:
+                self.is_successful = True
+                self.state = "installed"
+                self.percent = 100.0
+
+    def start(self) -> None:
+        with self._lock:
+            self.state = "starting"
+            self.started_at = time.time()
+            self.updated_at = self.started_at
+
+    def skip(self, message: str) -> None:
+        """Finish the job without running steamcmd, because there is nothing to do."""
+        with self._lock:
+            self._lines.append(message)
+            self.num_lines += 1
+            self.state = "up to date"
+            self.percent = 100.0
+            self.is_successful = True
+            self.is_finished = True
+            self.updated_at = time.time()
+
+    def finish(self, return_code: int) -> None:
+        with self._lock:
+            self.return_code = return_code
+            self.is_finished = True
+            self.updated_at = time.time()
+
+            if not self.is_successful:
+                self.state = "failed"
+
+    def get_lines(self) -> list:
+        with self._lock:
+            return list(self._lines)
+
+    def to_dict(self, include_lines: bool = True) -> dict:
+        with self._lock:
+            progress_dict = {
+                "job_id": self.job_id,
+                "steam_id": self.steam_id,
+                "state": self.state,
+                "state_code": self.state_code,
+                "bytes_downloaded": self.bytes_downloaded,
+                "total_bytes": self.total_bytes,
+                "percent": self.percent,
+                "num_lines": self.num_lines,
+                "is_finished": self.is_finished,
+                "is_successful": self.is_successful,
+                "return_code": self.return_code,
+                "started_at": self.started_at,
+                "updated_at": self.updated_at,
+            }
+
+            if include_lines:
+                progress_dict["lines"] = list(self._lines)
+
+        return progress_dict
+
+
+class InstallProgressRegistry:
+    """
+    Process wide registry of the install progress of steamcmd jobs, keyed by the job id of the
+    install scheduler. Only the latest jobs are kept.
+    """
+
+    MAX_JOBS = 128
+
+    def __init__(self, max_jobs: int = MAX_JOBS) -> None:
+        self._max_jobs = max_jobs
+        self._lock = threading.Lock()
+        self._jobs: OrderedDict = OrderedDict()
+
+    def register(self, job_id: int, progress: InstallProgress) -> None:
+        progress.job_id = job_id
+
+        with self._lock:
+            self._jobs[job_id] = progress
+            self._jobs.move_to_end(job_id)
+
+            while len(self._jobs) > self._max_jobs:
+                self._evict_one()
+
+    def _evict_one(self) -> None:
+        # Drop the oldest finished job, or the oldest job if all of them are still running.
+        for job_id, progress in self._jobs.items():
+            if progress.is_finished:
+                del self._jobs[job_id]
+                return
+
+        self._jobs.popitem(last=False)
+
+    def get(self, job_id: int) -> InstallProgress:
+        with self._lock:
+            return self._jobs.get(job_id, None)
+
+    def get_all(self) -> list:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+
+
+INSTALL_PROGRESS = InstallProgressRegistry()
@@ -0,0 +1,482 @@
+import os
+import psutil
+import queue
+import threading
+import time
+
+from collections import deque
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import func, select
+
+from application.common import logger, toolbox
+from application.common.constants import GameActionTypes, InstallJobStates
+from application.common.exceptions import InvalidUsage
+from application.extensions import DATABASE
+from application.managers.install_progress import INSTALL_PROGRESS, InstallProgress
+from application.models.games import Games
+from application.models.install_jobs import InstallJobs
+
+ACTIVE_STATES = [InstallJobStates.QUEUED.value, InstallJobStates.RUNNING.value]
+
+
+class _Job:
+    # Credentials only live here, they are never written to the database.
+    def __init__(
+        self,
+        job_id,
+        steam_mgr,
+        steam_id,
+        install_dir,
+        user,
+        password,
+        activity,
+        validate,
+    ):
+        self.job_id = job_id
+        self.activity = activity
+        self.validate = validate
+        self.is_started = False
+        self.progress = InstallProgress(steam_id)
+        self.done_event = threading.Event()
+        self.steam_mgr = steam_mgr
+        self.steam_id = steam_id
+        self.install_dir = install_dir
+        self.user = user
+        self.password = password
+
+
+class InstallScheduler:
+    """
+    Runs steam install and update jobs on a fixed pool of worker threads.
+
+    Jobs wait in a bounded queue and are stored in the install jobs table, so their id stays
+    valid after the job is done. A request for a game that already has a queued or running job
+    joins that job instead of running steamcmd into the same directory a second time. Workers run
+    each job in an app context of their own. The app config sets the number of workers and the
+    size of the queue. Jobs record the agent process that queued them, and only the jobs of a
+    process that is gone are failed at startup.
+
+    An update whose installed build, from the local app manifest, is already the published build
+    is skipped without running steamcmd. Game files are only validated on request, or when the
+    last validation of the game is older than the configured interval.
+
+    Clients can block until a job is done with wait_for_job, and every state change of a job is
+    kept in a short, numbered log that get_events waits on. Both wake up the moment a job
+    changes, so no client has to poll.
+    """
+
+    AGENT_RESTARTED_ERROR = "The agent restarted before the job finished."
+    MAX_EVENTS = 256
+
+    def __init__(self) -> None:
+        self._app: Flask = None
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._queue: queue.Queue = None
+        self._active_jobs: dict = {}  # (steam_id, install_dir) -> job_id
+        self._jobs: dict = {}  # job_id -> _Job, while queued or running
+        self._num_reserved = 0  # Queue slots of jobs that are being stored.
+        self._owner: dict = {}
+        self._events = deque(maxlen=self.MAX_EVENTS)
+        self._last_event_id = 0
+        self._workers: list = []
+
+    def init_app(self, flask_app: Flask) -> None:
+        self._app = flask_app
+
+        if any(worker.is_alive() for worker in self._workers):
+            return
+
+        # Config values from the environment are strings.
+        self._queue = queue.Queue(
+            maxsize=int(flask_app.config["INSTALL_JOB_QUEUE_SIZE"])
+        )
+
+        # Read here rather than at import, a forked server worker is a process of its own.
+        process = psutil.Process()
+        self._owner = {
+            "owner_pid": process.pid,
+            "owner_pid_create_time": process.create_time(),
+        }
+
+        with flask_app.app_context():
+            self._fail_interrupted_jobs()
+
+        self._workers = []
+
+        for index in range(int(flask_app.config["INSTALL_JOB_WORKERS"])):
+            worker = threading.Thread(
+                target=self._work, name=f"InstallScheduler-{index}", daemon=True
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def stop(self) -> None:
+        # Workers exit once they reach these, after the jobs queued before them.
+        for _ in self._workers:
+            self._queue.put(None)
+
+    @staticmethod
+    def _get_key(steam_id, install_dir: str) -> tuple:
+        return (str(steam_id), os.path.normcase(os.path.abspath(install_dir)))
+
+    @staticmethod
+    def _update_job(job_id: int, **values) -> None:
+        try:
+            InstallJobs.query.filter_by(job_id=job_id).update(values)
+            DATABASE.session.commit()
+        except Exception:
+            DATABASE.session.rollback()
+            raise
+
+    def _fail_interrupted_jobs(self) -> None:
+        # Jobs of an agent process that is gone are gone with its queue. Jobs of an agent that is
+        # still running, another one sharing the database, are left alone.
+        try:
+            owners = DATABASE.session.execute(
+                select(InstallJobs.owner_pid, InstallJobs.owner_pid_create_time)
+                .where(InstallJobs.state.in_(ACTIVE_STATES))
+                .distinct()
+            ).all()
+
+            for owner_pid, owner_pid_create_time in owners:
+                if toolbox._get_proc_by_pid(owner_pid, owner_pid_create_time):
+                    continue
+
+                InstallJobs.query.filter(
+                    InstallJobs.state.in_(ACTIVE_STATES),
+                    InstallJobs.owner_pid == owner_pid,
+                    InstallJobs.owner_pid_create_time == owner_pid_create_time,
+                ).update(
+                    {
+                        "state": InstallJobStates.FAILED.value,
+                        "error": self.AGENT_RESTARTED_ERROR,
+                        "finished_at": datetime.utcnow(),
+                    },
+                    synchronize_session=False,
+                )
+
+            DATABASE.session.commit()
+        except Exception as error:
+            DATABASE.session.rollback()
+            logger.error(f"InstallScheduler: Unable to fail interrupted jobs: {error}")
+
+    def submit(
+        self,
+        steam_mgr,
+        steam_id,
+        install_dir,
+        user,
+        password,
+        activity: str,
+        validate: bool = False,
+    ) -> dict:
+        """
+        Queue an install or update job. Returns the job id, whether the request joined a job that
+        was already queued or running for the same game, and whether the game files will be
+        validated as requested. A job that is already running does not pick up a request to
+        validate, queue the validate again once it is done.
+        """
+        key = self._get_key(steam_id, install_dir)
+
+        with self._changed:
+            # Another request is storing a job for this game, join it once it is queued.
+            self._changed.wait_for(lambda: self._active_jobs.get(key, 0) is not None)
+
+            job_id = self._active_jobs.get(key, None)
+
+            if job_id is not None:
+                job = self._jobs[job_id]
+
+                # A job that has not started yet picks up a request to validate.
+                if not job.is_started:
+                    job.validate |= validate
+
+                logger.info(
+                    f"InstallScheduler: Steam id {steam_id} already has job {job_id}."
+                )
+                return {
+                    "job_id": job_id,
+                    "is_coalesced": True,
+                    "is_validate_applied": job.validate or not validate,
+                }
+
+            if (
+                self._queue is None
+                or self._queue.qsize() + self._num_reserved >= self._queue.maxsize
+            ):
+                message = "InstallScheduler: Too many install jobs, try again later."
+                logger.error(message)
+                raise InvalidUsage(message, status_code=503)
+
+            # Hold the game and a queue slot while the job is stored, without the lock.
+            self._active_jobs[key] = None
+            self._num_reserved += 1
+
+        new_job = InstallJobs()
+        new_job.steam_id = int(steam_id)
+        new_job.install_dir = install_dir
+        new_job.activity = activity
+        new_job.state = InstallJobStates.QUEUED.value
+        new_job.created_at = datetime.utcnow()
+        new_job.owner_pid = self._owner.get("owner_pid", None)
+        new_job.owner_pid_create_time = self._owner.get("owner_pid_create_time", None)
+
+        try:
+            DATABASE.session.add(new_job)
+            DATABASE.session.commit()
+            job_id = new_job.job_id
+        except Exception:
+            DATABASE.session.rollback()
+
+            with self._changed:
+                self._active_jobs.pop(key)
+                self._num_reserved -= 1
+                self._changed.notify_all()
+
+            message = "InstallScheduler: Error: Failed to store the install job."
+            logger.critical(message)
+            raise InvalidUsage(message, status_code=500)
+
+        job = _Job(
+            job_id,
+            steam_mgr,
+            steam_id,
+            install_dir,
+            user,
+            password,
+            activity,
+            validate,
+        )
+
+        with self._lock:
+            INSTALL_PROGRESS.register(job_id, job.progress)
+            self._active_jobs[key] = job_id
+            self._jobs[job_id] = job
+            self._num_reserved -= 1
+            self._queue.put_nowait(job)
+            self._publish(job, InstallJobStates.QUEUED.value)
+
+        logger.info(f"InstallScheduler: Queued job {job_id} for steam id {steam_id}.")
+
+        return {"job_id": job_id, "is_coalesced": False, "is_validate_applied": True}
+
+    def is_job_active(self, job_id: int) -> bool:
+        with self._lock:
+            return job_id in self._jobs
+
+    def wait_for_job(self, job_id: int, timeout: float) -> bool:
+        """
+        Block until the job is done or the timeout runs out. Returns True if the job is done, which
+        includes jobs that are not queued or running at all.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id, None)
+
+        if job is None:
+            return True
+
+        return job.done_event.wait(timeout)
+
+    def _publish(self, job: _Job, state: str) -> None:
+        # Must hold the lock.
+        self._last_event_id += 1
+        self._events.append(
+            {
+                "event_id": self._last_event_id,
+                "job_id": job.job_id,
+                "steam_id": job.steam_id,
+                "activity": job.activity,
+                "state": state,
+                "timestamp": time.time(),
+            }
+        )
+        self._changed.notify_all()
+
+    def get_last_event_id(self) -> int:
+        with self._lock:
+            return self._last_event_id
+
+    def get_events(self, after_event_id: int, timeout: float) -> list:
+        """
+        Return the job state changes after the given event id, waiting up to the timeout for one
+        to happen. Only the latest changes are kept, older ones are skipped.
+        """
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._last_event_id > after_event_id, timeout
+            )
+
+            return [
+                event for event in self._events if event["event_id"] > after_event_id
+            ]
+
+    def get_num_queued(self) -> int:
+        return 0 if self._queue is None else self._queue.qsize()
+
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+
+            if job is None:
+                break
+
+            state = InstallJobStates.FAILED.value
+            error = None
+
+            try:
+                with self._app.app_context():
+                    state = self._run_job(job)
+            except Exception as job_error:
+                error = str(job_error)[:256]
+                logger.error(f"InstallScheduler: Job {job.job_id} failed: {error}")
+            finally:
+                # A job that did not get to store its result must not stay running.
+                if error is not None:
+                    self._fail_job(job, error)
+
+                with self._lock:
+                    self._active_jobs.pop(self._get_key(job.steam_id, job.install_dir))
+                    self._jobs.pop(job.job_id)
+                    self._publish(job, state)
+
+                job.done_event.set()
+                self._queue.task_done()
+
+    def _fail_job(self, job: _Job, error: str) -> None:
+        if not job.progress.is_finished:
+            job.progress.finish(None)
+
+        try:
+            with self._app.app_context():
+                self._update_job(
+                    job.job_id,
+                    state=InstallJobStates.FAILED.value,
+                    error=error,
+                    finished_at=datetime.utcnow(),
+                )
+        except Exception as update_error:
+            logger.error(
+                f"InstallScheduler: Unable to fail job {job.job_id}: {update_error}"
+            )
+
+    def _is_validate_due(self, job: _Job) -> bool:
+        """
+        Whether the game files of a job's game were last validated longer than the interval ago.
+        Games the agent has managed for less than one interval are not due yet.
+        """
+        interval_days = float(self._app.config["INSTALL_JOB_VALIDATE_INTERVAL_DAYS"])
+
+        if interval_days <= 0:
+            return False
+
+        cutoff = datetime.utcnow() - timedelta(days=interval_days)
+        game_jobs = select(InstallJobs).where(
+            InstallJobs.steam_id == int(job.steam_id),
+            InstallJobs.install_dir == job.install_dir,
+        )
+
+        first_created_at = DATABASE.session.execute(
+            game_jobs.with_only_columns(func.min(InstallJobs.created_at))
+        ).scalar()
+
+        if first_created_at is None or first_created_at > cutoff:
+            return False
+
+        last_validated_at = DATABASE.session.execute(
+            game_jobs.with_only_columns(func.max(InstallJobs.finished_at)).where(
+                InstallJobs.validate.is_(True),
+                InstallJobs.state == InstallJobStates.SUCCEEDED.value,
+            )
+        ).scalar()
+
+        return last_validated_at is None or last_validated_at < cutoff
+
+    @staticmethod
+    def _is_update_skippable(job: _Job) -> bool:
+        game_obj = Games.query.filter_by(
+            game_steam_id=int(job.steam_id), game_install_dir=job.install_dir
+        ).first()
+        branch = game_obj.game_steam_build_branch if game_obj else "public"
+
+        return job.steam_mgr.is_installed_build_current(
+            job.steam_id, job.install_dir, branch=branch
+        )
+
+    def _run_job(self, job: _Job) -> str:
+        progress = job.progress
+        progress.start()
+
+        # Requests to validate that come in from here on are not applied to this job.
+        with self._lock:
+            job.is_started = True
+
+        validate = job.validate or self._is_validate_due(job)
+        job.validate = validate
+
+        self._update_job(
+            job.job_id,
+            state=InstallJobStates.RUNNING.value,
+            validate=validate,
+            started_at=datetime.utcnow(),
+        )
+
+        with self._lock:
+            self._publish(job, InstallJobStates.RUNNING.value)
+
+        if (
+            job.activity == GameActionTypes.UPDATING.value
+            and not validate
+            and self._is_update_skippable(job)
+        ):
+            logger.info(
+                f"InstallScheduler: Job {job.job_id}, steam id {job.steam_id} already has "
+                "the published build, skipping steamcmd."
+            )
+            progress.skip("The installed build is the published build.")
+            self._update_job(
+                job.job_id,
+                state=InstallJobStates.SKIPPED.value,
+                finished_at=datetime.utcnow(),
+            )
+            return InstallJobStates.SKIPPED.value
+
+        error = None
+
+        try:
+            job.steam_mgr._install_gamefiles(
+                gameid=job.steam_id,
+                game_install_dir=job.install_dir,
+                user=job.user,
+                password=job.password,
+                validate=validate,
+                progress=progress,
+            )
+        except Exception as install_error:
+            error = str(install_error)[:256]
+            logger.error(f"InstallScheduler: Job {job.job_id} failed: {error}")
+
+            if not progress.is_finished:
+                progress.finish(None)
+
+        # steamcmd creates files with its own permissions. Entries fixed before are skipped.
+        toolbox.recursive_chmod(job.install_dir)
+
+        if progress.is_successful:
+            state = InstallJobStates.SUCCEEDED.value
+        else:
+            state = InstallJobStates.FAILED.value
+
+        self._update_job(
+            job.job_id,
+            state=state,
+            return_code=progress.return_code,
+            error=error,
+            finished_at=datetime.utcnow(),
+        )
+
+        return state
+
+
+INSTALL_SCHEDULER = InstallScheduler()
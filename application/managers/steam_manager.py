@@ -1,26 +1,109 @@
 import os
 import requests
 import subprocess
+import time
 
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
 from pysteamcmd.steamcmd import Steamcmd
 from sqlalchemy import exc
-from threading import Thread
+from threading import Lock
 
-from application import games
 from application.models.games import Games
 from application.common import logger, toolbox, constants
 from application.common.exceptions import InvalidUsage
+from application.common.game_registry import GAME_REGISTRY
 from application.common.steam_manifest_parser import read_acf
 from application.extensions import DATABASE
+from application.managers.install_progress import InstallProgress
+from application.managers.install_scheduler import INSTALL_SCHEDULER
+
+
+class SteamAppInfoCache:
+    """
+    Process wide cache of the build ids published on api.steamcmd.net, keyed by steam id and
+    branch.
+
+    All lookups share one requests session, so connections to the API are kept alive. An entry
+    is served from memory until its TTL runs out. After that it is revalidated with the ETag and
+    Last-Modified headers of the last response, and a 304 Not Modified renews it without a new
+    download. If the API cannot be reached, the last known build id is used.
+    """
+
+    DEFAULT_TTL_SECONDS = 300.0
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self._ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._entries: dict = {}  # (steam_id, branch) -> entry dict
+        self.session = requests.Session()
+
+    def get_entry(self, steam_id, branch: str) -> dict:
+        with self._lock:
+            return self._entries.get((str(steam_id), branch), None)
+
+    def is_fresh(self, entry: dict) -> bool:
+        return entry is not None and entry["expires_at"] > time.monotonic()
+
+    def put(
+        self, steam_id, branch: str, build_id: int, etag=None, last_modified=None
+    ) -> None:
+        with self._lock:
+            self._entries[(str(steam_id), branch)] = {
+                "build_id": build_id,
+                "etag": etag,
+                "last_modified": last_modified,
+                "expires_at": time.monotonic() + self._ttl_seconds,
+            }
+
+    def renew(self, steam_id, branch: str) -> None:
+        with self._lock:
+            entry = self._entries.get((str(steam_id), branch), None)
+            if entry is not None:
+                entry["expires_at"] = time.monotonic() + self._ttl_seconds
+
+    @staticmethod
+    def get_validator_headers(entry: dict) -> dict:
+        headers = {}
+
+        if entry is None:
+            return headers
+
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        return headers
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+STEAM_APP_INFO_CACHE = SteamAppInfoCache()
+
+# Shared by all update checks, so concurrent requests cannot flood steamcmd.net.
+UPDATE_CHECK_MAX_WORKERS = 8
+UPDATE_CHECK_DEADLINE_SECONDS = 15.0
+UPDATE_CHECK_EXECUTOR = ThreadPoolExecutor(
+    max_workers=UPDATE_CHECK_MAX_WORKERS, thread_name_prefix="SteamUpdateCheck"
+)
 
 
 class SteamUpdateManager:
     STATUS_SUCCESS = "success"
     STATUS_FAILED = "failed"
+    DEFAULT_BASE_FORMAT_URL = "https://api.steamcmd.net/v1/info/{STEAM_ID}"
+    REQUEST_TIMEOUT_SECONDS = 10
 
-    def __init__(self) -> None:
-        self._base_format_url = "https://api.steamcmd.net/v1/info/{STEAM_ID}"
+    def __init__(
+        self,
+        base_format_url: str = DEFAULT_BASE_FORMAT_URL,
+        cache: SteamAppInfoCache = STEAM_APP_INFO_CACHE,
+    ) -> None:
+        self._base_format_url = base_format_url
+        self._cache = cache
 
     def _get_info_url(self, steam_id: int) -> str:
         return self._base_format_url.format(STEAM_ID=steam_id)
@@ -28,14 +111,37 @@ class SteamUpdateManager:
     def _get_build_id(self, steam_id: int, branch: str = "public") -> int:
         build_id = None
 
-        response = requests.get(self._get_info_url(steam_id))
+        entry = self._cache.get_entry(steam_id, branch)
+
+        if self._cache.is_fresh(entry):
+            return entry["build_id"]
+
+        # Only the last known build id is available if steamcmd.net cannot be reached.
+        stale_build_id = entry["build_id"] if entry else None
+
+        try:
+            response = self._cache.session.get(
+                self._get_info_url(steam_id),
+                headers=self._cache.get_validator_headers(entry),
+                timeout=self.REQUEST_TIMEOUT_SECONDS,
+            )
+        except requests.exceptions.RequestException as error:
+            logger.critical(
+                "SteamUpdateManager: Unable to contact steamcmd.net to get build id "
+                f"for branch, {branch}: {error}"
+            )
+            return stale_build_id
+
+        if response.status_code == 304 and entry is not None:
+            self._cache.renew(steam_id, branch)
+            return stale_build_id
 
         if response.status_code != 200:
             logger.critical(
                 "SteamUpdateManager: Unable to contact steamcmd.net to get build id "
                 f"for branch, {branch}"
             )
-            return None
+            return stale_build_id
 
         json_data = response.json()
         data = json_data["data"]
@@ -46,30 +152,31 @@ class SteamUpdateManager:
             depots = app_data["depots"]
             branches = depots["branches"]
             inquery_branch = branches[branch]
-            build_id = inquery_branch["buildid"]
+            build_id = int(inquery_branch["buildid"])
+
+            self._cache.put(
+                steam_id,
+                branch,
+                build_id,
+                etag=response.headers.get("ETag", None),
+                last_modified=response.headers.get("Last-Modified", None),
+            )
         else:
             build_id = -1
 
-        return int(build_id)
+        return build_id
 
-    def is_update_required(
-        self, current_build_id: int, current_build_branch: int, current_steam_id: int
-    ) -> dict:
+    def _get_update_dict(self, current_build_id: int, published_build_id: int) -> dict:
         update_required = False
         detected_error = False
 
-        published_build_id = self._get_build_id(
-            current_steam_id, branch=current_build_branch
-        )
-
         if published_build_id is None or published_build_id == -1:
             logger.critical(
                 "SteamUpdateManager: Unable to determine if game requries update."
             )
             detected_error = True
             update_required = False
-
-        if current_build_id < published_build_id:
+        elif current_build_id < published_build_id:
             update_required = True
 
         output_dict = {
@@ -81,45 +188,169 @@ class SteamUpdateManager:
 
         return output_dict
 
+    def is_update_required(
+        self, current_build_id: int, current_build_branch: int, current_steam_id: int
+    ) -> dict:
+        published_build_id = self._get_build_id(
+            current_steam_id, branch=current_build_branch
+        )
+
+        return self._get_update_dict(current_build_id, published_build_id)
+
+    def get_published_build_ids(
+        self, keys: set, deadline_seconds: float = UPDATE_CHECK_DEADLINE_SECONDS
+    ) -> dict:
+        """
+        Look up the published build id of many (steam_id, branch) pairs concurrently on a bounded
+        thread pool. Pairs whose lookup failed or missed the deadline map to None.
+        """
+        futures = {
+            key: UPDATE_CHECK_EXECUTOR.submit(self._get_build_id, key[0], branch=key[1])
+            for key in keys
+        }
+
+        _, not_done = wait(futures.values(), timeout=deadline_seconds)
+
+        build_ids = {}
+
+        for key, future in futures.items():
+            build_ids[key] = None
+
+            if future in not_done:
+                logger.error(
+                    "SteamUpdateManager: Timed out getting the build id for steam id "
+                    f"{key[0]}, branch {key[1]}"
+                )
+                continue
+
+            try:
+                build_ids[key] = future.result()
+            except Exception:
+                logger.error(
+                    "SteamUpdateManager: Unable to get the build id for steam id "
+                    f"{key[0]}, branch {key[1]}",
+                    exc_info=True,
+                )
+
+        return build_ids
+
+    def are_updates_required(
+        self, games: list, deadline_seconds: float = UPDATE_CHECK_DEADLINE_SECONDS
+    ) -> list:
+        """
+        Check many games for updates at once. Each game dictionary needs the game_steam_id,
+        game_steam_build_id and game_steam_build_branch keys. Every distinct steam id and branch
+        is looked up once, see get_published_build_ids. Returns one update dictionary per game, in
+        order, or None for a game that could not be checked.
+        """
+        keys = [
+            (game["game_steam_id"], game["game_steam_build_branch"]) for game in games
+        ]
+        build_ids = self.get_published_build_ids(set(keys), deadline_seconds)
+
+        results = []
+
+        for game, key in zip(games, keys):
+            if build_ids[key] is None:
+                results.append(None)
+                continue
+
+            try:
+                results.append(
+                    self._get_update_dict(game["game_steam_build_id"], build_ids[key])
+                )
+            except Exception:
+                logger.error(
+                    "SteamUpdateManager: Unable to check for an update for steam id "
+                    f"{key[0]}, branch {key[1]}",
+                    exc_info=True,
+                )
+                results.append(None)
+
+        return results
+
 
 class SteamManager:
+    # One instance per steam install directory, see get_instance.
+    _instances: dict = {}
+    _instance_locks: dict = {}
+    _instances_lock = Lock()
+
     def __init__(self, steam_install_dir, force_steam_install=True) -> None:
         if not os.path.exists(steam_install_dir):
             os.makedirs(steam_install_dir, mode=0o777, exist_ok=True)
 
-        toolbox.recursive_chmod(steam_install_dir)
-
         self._steam = Steamcmd(steam_install_dir, constants.DEFAULT_INSTALL_PATH)
+        self._steamcmd_exe = self._steam.steamcmd_exe
+        self._steam_install_dir = steam_install_dir
+        self._is_steamcmd_installed = False
+        self._update_mgr = SteamUpdateManager()
 
         if not force_steam_install:
-            self._steam.install(force=True)
+            self._install_steamcmd()
+        else:
+            toolbox.recursive_chmod(steam_install_dir)
 
-        toolbox.recursive_chmod(steam_install_dir)
+    @classmethod
+    def get_instance(
+        cls, steam_install_dir, force_steam_install=True
+    ) -> "SteamManager":
+        """
+        Return the cached SteamManager of a steam install directory, creating it the first time.
+        Setting up a SteamManager fixes the permissions of the whole steam directory, so this
+        only happens once per directory instead of once per request. Each directory has a lock of
+        its own, so installing steamcmd into one directory does not hold up the others.
+        """
+        key = os.path.normcase(os.path.abspath(steam_install_dir))
 
-        self._steamcmd_exe = self._steam.steamcmd_exe
-        self._steam_install_dir = steam_install_dir
+        with cls._instances_lock:
+            instance_lock = cls._instance_locks.setdefault(key, Lock())
 
-    def _run_install_on_thread(
-        self, steam_id, installation_dir, user, password
-    ) -> Thread:
-        sm_thread = Thread(
-            target=lambda: self._install_gamefiles(
-                gameid=steam_id,
-                game_install_dir=installation_dir,
-                user=user,
-                password=password,
-                validate=True,
-            )
-        )
-        sm_thread.daemon = True
+        with instance_lock:
+            steam_mgr = cls._instances.get(key, None)
 
-        sm_thread.start()
+            if steam_mgr is None or not os.path.exists(steam_install_dir):
+                steam_mgr = cls(
+                    steam_install_dir, force_steam_install=force_steam_install
+                )
+                cls._instances[key] = steam_mgr
+            elif not force_steam_install and not steam_mgr._is_steamcmd_installed:
+                steam_mgr._install_steamcmd()
 
-        return sm_thread
+        return steam_mgr
+
+    def _install_steamcmd(self) -> None:
+        self._steam.install(force=True)
+        self._steamcmd_exe = self._steam.steamcmd_exe
+        self._is_steamcmd_installed = True
+
+        toolbox.recursive_chmod(self._steam_install_dir)
+
+    def _submit_install_job(
+        self, steam_id, installation_dir, user, password, activity: str, validate: bool
+    ) -> dict:
+        return INSTALL_SCHEDULER.submit(
+            self,
+            steam_id,
+            installation_dir,
+            user,
+            password,
+            activity,
+            validate=validate,
+        )
 
     def install_steam_app(
-        self, steam_id, installation_dir, user="anonymous", password=None
-    ) -> Thread:
+        self,
+        steam_id,
+        installation_dir,
+        user="anonymous",
+        password=None,
+        validate=False,
+    ) -> dict:
+        """
+        Queue an install of a steam app on the install scheduler. Returns the job id, and whether
+        the request joined a job that was already queued or running for the same game.
+        """
         if not os.path.exists(installation_dir):
             os.makedirs(installation_dir, mode=0o777, exist_ok=True)
 
@@ -129,20 +360,10 @@ class SteamManager:
         # If the object exists, then the user has already attempted installation once. Do not make
         # a new databse record again.
         if not game_qry.first():
-            modules_dict = toolbox._find_conforming_modules(games)
-            correct_game_object = None
-
-            for module_name in modules_dict.keys():
-                game_obj = toolbox._instantiate_object(
-                    module_name, modules_dict[module_name]
-                )
-                if game_obj._game_steam_id == steam_id:
-                    correct_game_object = game_obj
-                    del game_obj
-                    break
+            game_info = GAME_REGISTRY.get_game_info_by_steam_id(steam_id)
 
-            # Raise error if correct_game_object is not found.
-            if correct_game_object is None:
+            # Raise error if game_info is not found.
+            if game_info is None:
                 raise InvalidUsage(
                     "Unable to get game object that matches steam id.", status_code=500
                 )
@@ -150,8 +371,8 @@ class SteamManager:
             new_game = Games()
             new_game.game_steam_id = int(steam_id)
             new_game.game_install_dir = installation_dir
-            new_game.game_pretty_name = correct_game_object._game_pretty_name
-            new_game.game_name = correct_game_object._game_name
+            new_game.game_pretty_name = game_info["pretty_name"]
+            new_game.game_name = game_info["name"]
             DATABASE.session.add(new_game)
         else:
             # If it exists, just update the timestamp so the user knows the last time this game was
@@ -169,12 +390,35 @@ class SteamManager:
             logger.critical(message)
             raise InvalidUsage(message, status_code=500)
 
-        return self._run_install_on_thread(steam_id, installation_dir, user, password)
+        return self._submit_install_job(
+            steam_id,
+            installation_dir,
+            user,
+            password,
+            constants.GameActionTypes.INSTALLING.value,
+            validate,
+        )
 
     def update_steam_app(
-        self, steam_id, installation_dir, user="anonymous", password=None
-    ) -> Thread:
-        return self._run_install_on_thread(steam_id, installation_dir, user, password)
+        self,
+        steam_id,
+        installation_dir,
+        user="anonymous",
+        password=None,
+        validate=False,
+    ) -> dict:
+        """
+        Same as install_steam_app, for a steam app that is already installed. Nothing is run when
+        the installed build is already the published one, unless the files are to be validated.
+        """
+        return self._submit_install_job(
+            steam_id,
+            installation_dir,
+            user,
+            password,
+            constants.GameActionTypes.UPDATING.value,
+            validate,
+        )
 
     def get_build_id_from_app_manifest(self, installation_dir, steam_id):
         build_id = None
@@ -193,6 +437,36 @@ class SteamManager:
 
         return build_id
 
+    def is_installed_build_current(
+        self, steam_id, installation_dir, branch: str = "public"
+    ) -> bool:
+        """
+        Whether the build in the local app manifest is the published build of the branch, in which
+        case running steamcmd would not change anything. Only a published build id that
+        steamcmd.net confirmed within the cache TTL counts, a stale one is never trusted.
+        """
+        try:
+            installed_build_id = self.get_build_id_from_app_manifest(
+                installation_dir, steam_id
+            )
+        except Exception as error:
+            logger.error(f"SteamManager: Unable to read the app manifest: {error}")
+            return False
+
+        if installed_build_id is None:
+            return False
+
+        published_build_id = self._update_mgr._get_build_id(steam_id, branch=branch)
+        cache = self._update_mgr._cache
+
+        if published_build_id is None or published_build_id == -1:
+            return False
+
+        if not cache.is_fresh(cache.get_entry(steam_id, branch)):
+            return False
+
+        return int(installed_build_id) == published_build_id
+
     def _update_gamefiles(
         self, gameid, game_install_dir, user="anonymous", password=None, validate=False
     ) -> bool:
@@ -207,6 +481,7 @@ class SteamManager:
         user="anonymous",
         password=None,
         validate=False,
+        progress: InstallProgress = None,
     ) -> bool:
         """
         Installs gamefiles for dedicated server. This can also be used to update the gameserver.
@@ -215,6 +490,7 @@ class SteamManager:
         :param user: steam username (defaults anonymous)
         :param password: steam password (defaults None)
         :param validate: should steamcmd validate the gameserver files (takes a while)
+        :param progress: receives the steamcmd output and progress while it runs
         :return: boolean - true if install was sucessful.
         """
         install_sucesss = True
@@ -233,38 +509,34 @@ class SteamManager:
             "+quit",
         )
 
+        if progress is None:
+            progress = InstallProgress(gameid)
+
+        # steamcmd prints a lot during long validations, so read it line by line while it runs
+        # instead of buffering all of it. stderr is merged in so one reader can drain both.
+        popen_kwargs = {
+            "stdout": subprocess.PIPE,
+            "stderr": subprocess.STDOUT,
+            "text": True,
+            "errors": "replace",
+            "bufsize": 1,
+        }
+
         # Need to add steamservice.so to the system path
         if self._steam.platform == "Linux":
             library_path = os.path.join(self._steam_install_dir, "linux64")
             update_environ = os.environ
             update_environ["LD_LIBRARY_PATH"] = library_path
             process = subprocess.Popen(
-                steamcmd_params,
-                env=update_environ,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
+                steamcmd_params, env=update_environ, **popen_kwargs
             )
         else:
             # Otherwise, on windows, it's expected that steam is installed.
-            process = subprocess.Popen(
-                steamcmd_params, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-            )
-
-        stdout, stderr = process.communicate()
+            process = subprocess.Popen(steamcmd_params, **popen_kwargs)
 
-        stdout = stdout.decode("utf-8")
-        stderr = stderr.decode("utf-8")
-
-        logger.debug(
-            "_install_gamefiles: Update process.communicate has run... output:"
-        )
-        logger.debug(stdout)
-        logger.debug(stderr)
-        logger.debug("------------------------")
+        self._stream_output(process, progress)
 
-        success_msg = f"Success! App '{gameid}' fully installed."
-
-        if success_msg in stdout:
+        if progress.is_successful:
             logger.info("The game server successfully installed.")
             install_sucesss = True
         else:
@@ -272,3 +544,18 @@ class SteamManager:
             install_sucesss = False
 
         return install_sucesss
+
+    @staticmethod
+    def _stream_output(process: subprocess.Popen, progress: InstallProgress) -> int:
+        """Feed the output of a running steamcmd process into progress until it exits."""
+        try:
+            # Text mode translates the carriage returns of progress updates into line breaks.
+            for line in process.stdout:
+                progress.feed_line(line)
+                logger.debug(f"steamcmd: {line.rstrip()}")
+        finally:
+            process.stdout.close()
+            return_code = process.wait()
+            progress.finish(return_code)
+
+        return return_code
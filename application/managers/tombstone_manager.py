@@ -0,0 +1,134 @@
+import os
+import re
+import shutil
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+from application.common import logger
+
+
+class TombstoneManager:
+    """
+    Deletes large directory trees, such as game server installs, without blocking the caller.
+
+    The directory is first renamed to a tombstone next to it. The rename is atomic, so the original
+    path is gone right away and can be reused. The tombstone is then deleted on a background
+    thread, which walks and deletes the top level sub directories in parallel. Tombstones that a
+    crash or restart left behind are found and deleted by sweep at startup.
+    """
+
+    TOMBSTONE_SUFFIX = ".deleting"
+    TOMBSTONE_REGEX = re.compile(r".+\.deleting-\d+$")
+    MAX_WORKERS = 4
+
+    def tombstone(self, path: str) -> str:
+        """Rename a directory to a unique tombstone path and return that path."""
+        path = os.path.normpath(path)
+        tombstone_path = f"{path}{self.TOMBSTONE_SUFFIX}-{time.time_ns()}"
+        os.rename(path, tombstone_path)
+        return tombstone_path
+
+    def delete_in_background(self, path: str) -> threading.Thread:
+        """
+        Tombstone a directory and delete it on a new thread. Returns the started thread, its
+        tombstone_path is the path being deleted, or None if there was nothing to delete.
+        """
+        try:
+            target_path = self.tombstone(path)
+        except FileNotFoundError:
+            logger.warning(
+                f"TombstoneManager: {path} does not exist, nothing to delete."
+            )
+            target_path = None
+        except OSError as error:
+            # E.g. on Windows a file in the directory is still open. Delete it in place instead.
+            logger.error(f"TombstoneManager: Unable to rename {path}: {error}")
+            target_path = path
+
+        delete_thread = threading.Thread(
+            target=self._delete_tree,
+            args=(target_path,),
+            name=f"TombstoneDelete-{os.path.basename(os.path.normpath(path))}",
+            daemon=True,
+        )
+        delete_thread.tombstone_path = target_path
+        delete_thread.start()
+
+        return delete_thread
+
+    def find_tombstones(self, parent_dirs: list) -> list:
+        """Return the tombstones directly inside the given directories."""
+        tombstones = set()
+
+        for parent_dir in parent_dirs:
+            try:
+                with os.scandir(parent_dir) as entries:
+                    for entry in entries:
+                        if self.TOMBSTONE_REGEX.match(entry.name) and entry.is_dir(
+                            follow_symlinks=False
+                        ):
+                            tombstones.add(entry.path)
+            except OSError:
+                continue
+
+        return sorted(tombstones)
+
+    def sweep(self, parent_dirs: list) -> threading.Thread:
+        """
+        Delete the tombstones left behind inside the given directories, on a new thread. Returns
+        the started thread, or None if there is nothing to delete.
+        """
+        tombstones = self.find_tombstones(parent_dirs)
+
+        if len(tombstones) == 0:
+            return None
+
+        logger.info(
+            f"TombstoneManager: Sweeping {len(tombstones)} left over tombstones."
+        )
+
+        sweep_thread = threading.Thread(
+            target=lambda: [self._delete_tree(path) for path in tombstones],
+            name="TombstoneSweep",
+            daemon=True,
+        )
+        sweep_thread.start()
+
+        return sweep_thread
+
+    @staticmethod
+    def _remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError as error:
+            logger.error(f"TombstoneManager: Unable to remove {path}: {error}")
+
+    def _delete_tree(self, path: str) -> None:
+        if path is None:
+            return
+
+        start_time = time.monotonic()
+
+        try:
+            entries = list(os.scandir(path))
+        except OSError as error:
+            logger.error(f"TombstoneManager: Unable to list {path}: {error}")
+            return
+
+        with ThreadPoolExecutor(max_workers=self.MAX_WORKERS) as executor:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    executor.submit(shutil.rmtree, entry.path, True)
+                else:
+                    executor.submit(self._remove_file, entry.path)
+
+        shutil.rmtree(path, ignore_errors=True)
+
+        logger.info(
+            f"TombstoneManager: Deleted {path} in {time.monotonic() - start_time:.2f} seconds."
+        )
+
+
+TOMBSTONE_MANAGER = TombstoneManager()
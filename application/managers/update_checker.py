@@ -0,0 +1,235 @@
+import threading
+import time
+
+from datetime import datetime
+from flask import Flask
+from sqlalchemy import select, update
+from sqlalchemy.dialects.sqlite import insert
+
+from application.common import constants, logger
+from application.common.settings_cache import SETTINGS_CACHE
+from application.extensions import DATABASE
+from application.managers.steam_manager import SteamUpdateManager
+from application.models.games import Games
+from application.models.steam_build_checks import SteamBuildChecks
+
+
+class UpdateChecker:
+    """
+    Background job that keeps the published build id of every installed game up to date.
+
+    Every distinct steam id and branch of the installed games is looked up on steamcmd.net at a
+    fixed interval, and the result, the time of the check and any error are stored in the steam
+    build checks table. Update checks made by clients then read the stored result instead of
+    waiting on steamcmd.net. The settings table controls whether the job runs, and how often. The
+    app config can keep the job from starting at all, e.g. in tests.
+    """
+
+    RETRY_INTERVAL_SEC = 60
+    ERROR_MESSAGE = "Unable to get the published build id from steamcmd.net."
+
+    def __init__(self, steam_mgr: SteamUpdateManager = None) -> None:
+        self._steam_mgr = steam_mgr if steam_mgr else SteamUpdateManager()
+        self._app: Flask = None
+        self._stop_event = threading.Event()
+        self._wakeup_event = threading.Event()
+        self._thread: threading.Thread = None
+        self._lock = threading.Lock()
+        self._last_missing_check: float = None
+
+    def init_app(self, flask_app: Flask) -> None:
+        self._app = flask_app
+
+        if not flask_app.config["UPDATE_CHECK_ENABLED"]:
+            logger.info("UpdateChecker: Disabled by the app config.")
+            return
+
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="UpdateChecker", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wakeup_event.set()
+
+    def request_check(self) -> None:
+        """Run the job now instead of at the end of the current interval."""
+        self._wakeup_event.set()
+
+    def _request_missing_check(self) -> None:
+        # A game whose lookups keep failing never gets a row, so client polls would otherwise wake
+        # the job every time. Ask at most once per retry interval.
+        now = time.monotonic()
+
+        with self._lock:
+            if (
+                self._last_missing_check is not None
+                and now - self._last_missing_check < self.RETRY_INTERVAL_SEC
+            ):
+                return
+
+            self._last_missing_check = now
+
+        self.request_check()
+
+    def _get_settings(self) -> tuple:
+        config = self._app.config
+
+        # DB stores these as strings.
+        is_enabled = SETTINGS_CACHE.get(
+            constants.SETTING_UPDATE_CHECK_ENABLE,
+            config["UPDATE_CHECK_DEFAULT_ENABLED"],
+        )
+        interval_sec = SETTINGS_CACHE.get(
+            constants.SETTING_UPDATE_CHECK_INTERVAL,
+            config["UPDATE_CHECK_DEFAULT_INTERVAL_SEC"],
+        )
+
+        is_enabled = str(is_enabled).lower() in ["1", "true"]
+
+        return is_enabled, float(interval_sec)
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            interval_sec = self.RETRY_INTERVAL_SEC
+
+            try:
+                with self._app.app_context():
+                    is_enabled, interval_sec = self._get_settings()
+
+                    if is_enabled:
+                        self.run_once()
+            except Exception as error:
+                logger.error(f"UpdateChecker: Update check failed: {error}")
+
+            self._wakeup_event.wait(interval_sec)
+            self._wakeup_event.clear()
+
+    def run_once(self) -> int:
+        """Check every installed steam id and branch. Must run in an app context."""
+        keys = DATABASE.session.execute(
+            select(Games.game_steam_id, Games.game_steam_build_branch).distinct()
+        ).all()
+
+        self._check({tuple(key) for key in keys})
+
+        return len(keys)
+
+    def _check(self, keys: set) -> None:
+        if len(keys) == 0:
+            return
+
+        build_ids = self._steam_mgr.get_published_build_ids(keys)
+        checked_at = datetime.utcnow()
+
+        for (steam_id, branch), build_id in build_ids.items():
+            values = {
+                "steam_id": steam_id,
+                "branch": branch,
+                "checked_at": checked_at,
+                "error": None,
+            }
+
+            if build_id is None or build_id == -1:
+                # Keep the last known build id. A game without one stays unchecked.
+                DATABASE.session.execute(
+                    update(SteamBuildChecks)
+                    .where(
+                        SteamBuildChecks.steam_id == steam_id,
+                        SteamBuildChecks.branch == branch,
+                    )
+                    .values(checked_at=checked_at, error=self.ERROR_MESSAGE)
+                )
+                continue
+
+            values["published_build_id"] = build_id
+
+            upsert = insert(SteamBuildChecks).values(values)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=["steam_id", "branch"],
+                set_={key: upsert.excluded[key] for key in values if key != "steam_id"},
+            )
+            DATABASE.session.execute(upsert)
+
+        try:
+            DATABASE.session.commit()
+        except Exception:
+            DATABASE.session.rollback()
+            raise
+
+        logger.debug(f"UpdateChecker: Checked {len(keys)} steam apps for updates.")
+
+    @staticmethod
+    def _get_stored_checks() -> dict:
+        rows = DATABASE.session.execute(
+            select(
+                SteamBuildChecks.steam_id,
+                SteamBuildChecks.branch,
+                SteamBuildChecks.published_build_id,
+                SteamBuildChecks.checked_at,
+                SteamBuildChecks.error,
+            )
+        ).all()
+
+        return {(row.steam_id, row.branch): row for row in rows}
+
+    def get_update_dicts(self, games: list) -> list:
+        """
+        Same as SteamUpdateManager.are_updates_required, but reads the stored results of the
+        scheduled checks. Each result also has the time of the check and its error, if any, and
+        is_pending. Games that were never checked, e.g. just installed, get a pending result with
+        is_required None, and a check is requested, so this never waits on steamcmd.net. Returns
+        None for a game that could not be checked.
+        """
+        keys = [
+            (game["game_steam_id"], game["game_steam_build_branch"]) for game in games
+        ]
+
+        checks = self._get_stored_checks()
+
+        if not set(keys).issubset(checks.keys()):
+            self._request_missing_check()
+
+        results = []
+
+        for game, key in zip(games, keys):
+            check = checks.get(key, None)
+
+            if check is None:
+                results.append(
+                    {
+                        "is_required": None,
+                        "error": False,
+                        "current_version": game["game_steam_build_id"],
+                        "target_version": None,
+                        "checked_at": None,
+                        "check_error": None,
+                        "is_pending": True,
+                    }
+                )
+                continue
+
+            try:
+                update_dict = self._steam_mgr._get_update_dict(
+                    game["game_steam_build_id"], check.published_build_id
+                )
+            except Exception:
+                logger.error(
+                    f"UpdateChecker: Unable to check steam id {key[0]} for an update.",
+                    exc_info=True,
+                )
+                results.append(None)
+                continue
+
+            update_dict["checked_at"] = check.checked_at
+            update_dict["check_error"] = check.error
+            update_dict["is_pending"] = False
+            results.append(update_dict)
+
+        return results
+
+
+UPDATE_CHECKER = UpdateChecker()
@@ -0,0 +1,19 @@
+from application.extensions import DATABASE
+from application.common.pagination import PaginatedApi
+
+
+class ActionSummaries(PaginatedApi, DATABASE.Model):
+    """Daily count of each type of action per game, for actions pruned by the retention job."""
+
+    __tablename__ = "action_summaries"
+    __table_args__ = (
+        DATABASE.UniqueConstraint(
+            "game_id", "day", "type", name="uq_action_summaries_game_id_day_type"
+        ),
+    )
+
+    summary_id = DATABASE.Column(DATABASE.Integer, primary_key=True)
+    game_id = DATABASE.Column(DATABASE.Integer, nullable=False)
+    day = DATABASE.Column(DATABASE.Date, nullable=False)
+    type = DATABASE.Column(DATABASE.String(100), nullable=False)
+    count = DATABASE.Column(DATABASE.Integer, nullable=False, default=0)
@@ -1,4 +1,5 @@
 from datetime import datetime
+from sqlalchemy import desc, func, select
 
 from application.extensions import DATABASE
 from application.common.pagination import PaginatedApi
@@ -6,6 +7,9 @@ from application.common.pagination import PaginatedApi
 
 class Actions(PaginatedApi, DATABASE.Model):
     __tablename__ = "actions"
+    __table_args__ = (
+        DATABASE.Index("ix_actions_game_id_timestamp", "game_id", "timestamp"),
+    )
 
     action_id = DATABASE.Column(DATABASE.Integer, primary_key=True)
 
@@ -21,15 +25,42 @@ class Actions(PaginatedApi, DATABASE.Model):
     )
     spare = DATABASE.Column(DATABASE.String(100), nullable=True)
 
-    def to_dict(self):
-        data = {}
+    @staticmethod
+    def get_latest_by_game(game_ids: list, page: int = 1, per_page: int = 10) -> dict:
+        """
+        Return a page of the latest actions for each of the given games, newest first, keyed by
+        game ID. A window function ranks the actions of every game at once, so this is a single
+        query however many games there are.
+        """
+        latest_actions = {game_id: [] for game_id in game_ids}
+
+        if len(game_ids) == 0:
+            return latest_actions
+
+        row_number = (
+            func.row_number()
+            .over(
+                partition_by=Actions.game_id,
+                order_by=(desc(Actions.timestamp), desc(Actions.action_id)),
+            )
+            .label("row_number")
+        )
+
+        ranked = (
+            select(Actions, row_number).where(Actions.game_id.in_(game_ids)).subquery()
+        )
 
-        for column in self.__table__.columns:
-            field = column.key
+        offset = (page - 1) * per_page
+        query = (
+            select(*[ranked.c[column.key] for column in Actions.__table__.columns])
+            .where(ranked.c.row_number > offset)
+            .where(ranked.c.row_number <= offset + per_page)
+            .order_by(ranked.c.game_id, ranked.c.row_number)
+        )
 
-            if getattr(self, field) == []:
-                continue
+        rows = DATABASE.session.execute(query).all()
 
-            data[field] = getattr(self, field)
+        for action in Actions.rows_to_dicts(rows):
+            latest_actions[action["game_id"]].append(action)
 
-        return data
+        return latest_actions
@@ -5,6 +5,9 @@ from application.common.constants import FileModes
 
 class GameArguments(PaginatedApi, DATABASE.Model):
     __tablename__ = "game_arguments"
+    __table_args__ = (
+        DATABASE.Index("ix_game_arguments_game_id_game_arg", "game_id", "game_arg"),
+    )
 
     game_arg_id = DATABASE.Column(DATABASE.Integer, primary_key=True)
 
@@ -25,16 +28,3 @@ class GameArguments(PaginatedApi, DATABASE.Model):
 
     use_equals = DATABASE.Column(DATABASE.Boolean, nullable=False, default=False)
     use_quotes = DATABASE.Column(DATABASE.Boolean, nullable=False, default=True)
-
-    def to_dict(self):
-        data = {}
-
-        for column in self.__table__.columns:
-            field = column.key
-
-            if getattr(self, field) == []:
-                continue
-
-            data[field] = getattr(self, field)
-
-        return data
@@ -17,10 +17,12 @@ class Games(PaginatedApi, DATABASE.Model):
     game_install_dir = DATABASE.Column(
         DATABASE.String(256), unique=True, nullable=False
     )
-    game_name = DATABASE.Column(DATABASE.String(256), nullable=False)
+    game_name = DATABASE.Column(DATABASE.String(256), nullable=False, index=True)
     game_pretty_name = DATABASE.Column(DATABASE.String(256), nullable=False)
 
     game_pid = DATABASE.Column(DATABASE.Integer, nullable=True)
+    # Together with the PID, identifies the game server process even if the PID gets reused.
+    game_pid_create_time = DATABASE.Column(DATABASE.Float, nullable=True)
 
     game_created = DATABASE.Column(
         DATABASE.DateTime, default=datetime.utcnow, nullable=False
@@ -53,16 +55,3 @@ class Games(PaginatedApi, DATABASE.Model):
             query = Actions.query.filter_by(game_id=game_obj.game_id, type=action)
 
         return query.all()
-
-    def to_dict(self):
-        data = {}
-
-        for column in self.__table__.columns:
-            field = column.key
-
-            if getattr(self, field) == []:
-                continue
-
-            data[field] = getattr(self, field)
-
-        return data
@@ -0,0 +1,27 @@
+from application.extensions import DATABASE
+from application.common.pagination import PaginatedApi
+
+
+class InstallJobs(PaginatedApi, DATABASE.Model):
+    """Steam install and update jobs run by the install scheduler."""
+
+    __tablename__ = "install_jobs"
+    __table_args__ = (
+        DATABASE.Index("ix_install_jobs_state", "state"),
+        DATABASE.Index("ix_install_jobs_steam_id", "steam_id"),
+    )
+
+    job_id = DATABASE.Column(DATABASE.Integer, primary_key=True)
+    steam_id = DATABASE.Column(DATABASE.Integer, nullable=False)
+    install_dir = DATABASE.Column(DATABASE.String(256), nullable=False)
+    activity = DATABASE.Column(DATABASE.String(25), nullable=False)
+    state = DATABASE.Column(DATABASE.String(25), nullable=False)
+    validate = DATABASE.Column(DATABASE.Boolean, nullable=False, default=False)
+    return_code = DATABASE.Column(DATABASE.Integer, nullable=True)
+    error = DATABASE.Column(DATABASE.String(256), nullable=True)
+    created_at = DATABASE.Column(DATABASE.DateTime, nullable=False)
+    started_at = DATABASE.Column(DATABASE.DateTime, nullable=True)
+    finished_at = DATABASE.Column(DATABASE.DateTime, nullable=True)
+    # The agent process that queued the job. Only its jobs are failed when it is gone.
+    owner_pid = DATABASE.Column(DATABASE.Integer, nullable=True)
+    owner_pid_create_time = DATABASE.Column(DATABASE.Float, nullable=True)
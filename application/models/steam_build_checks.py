@@ -0,0 +1,20 @@
+from application.extensions import DATABASE
+from application.common.pagination import PaginatedApi
+
+
+class SteamBuildChecks(PaginatedApi, DATABASE.Model):
+    """Latest published build id of each installed steam app and branch, from the update checker."""
+
+    __tablename__ = "steam_build_checks"
+    __table_args__ = (
+        DATABASE.UniqueConstraint(
+            "steam_id", "branch", name="uq_steam_build_checks_steam_id_branch"
+        ),
+    )
+
+    check_id = DATABASE.Column(DATABASE.Integer, primary_key=True)
+    steam_id = DATABASE.Column(DATABASE.Integer, nullable=False)
+    branch = DATABASE.Column(DATABASE.String(256), nullable=False)
+    published_build_id = DATABASE.Column(DATABASE.Integer, nullable=True)
+    checked_at = DATABASE.Column(DATABASE.DateTime, nullable=False)
+    error = DATABASE.Column(DATABASE.String(256), nullable=True)
@@ -8,16 +8,3 @@ class Tokens(PaginatedApi, DATABASE.Model):
     token_active = DATABASE.Column(DATABASE.Boolean, nullable=False)
     token_name = DATABASE.Column(DATABASE.String(256), unique=True, nullable=False)
     token_value = DATABASE.Column(DATABASE.String(256), unique=True, nullable=False)
-
-    def to_dict(self):
-        data = {}
-
-        for column in self.__table__.columns:
-            field = column.key
-
-            if getattr(self, field) == []:
-                continue
-
-            data[field] = getattr(self, field)
-
-        return data
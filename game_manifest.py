@@ -0,0 +1,10 @@
+from application.common.game_registry import GAME_REGISTRY
+
+
+def generate_manifest():
+    manifest_path = GAME_REGISTRY.write_manifest()
+    print(f"Game manifest written to: {manifest_path}")
+
+
+if __name__ == "__main__":
+    generate_manifest()
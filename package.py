@@ -21,6 +21,7 @@ def main(debug=False):
         f"--add-data=./application/gui/resources/agent-white.png{sep}u./application/gui/resources",  # noqa: E501
         f"--add-data=./application/gui/resources/agent-green.png{sep}./application/gui/resources",  # noqa: E501
         f"--add-data=./application/games/*.py{sep}./application/games",
+        f"--add-data=./application/games/manifest.yml{sep}./application/games",
         f"--add-data=./application/games/resources/*{sep}./application/games/resources",  # noqa: E501
         f"--add-data=./application/alembic/alembic.ini{sep}./application/alembic",
         f"--add-data=./application/alembic/env.py{sep}./application/alembic",
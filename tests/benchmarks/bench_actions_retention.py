@@ -0,0 +1,99 @@
+"""
+Benchmark: Actions query latency on a table with a million rows, before and after retention.
+
+Measures the latest actions query used by /games, and a count of the history of one game, like
+the paginated action history does. Then runs the retention job and measures both again.
+
+Usage: python -m tests.benchmarks.bench_actions_retention
+"""
+import os
+import tempfile
+import time
+
+from datetime import datetime, timedelta
+from flask import Flask
+from sqlalchemy import text
+
+from application.common.sqlite_profile import init_sqlite_profile
+from application.config.config import DefaultConfig
+from application.extensions import DATABASE
+from application.managers.actions_retention import ActionsRetention
+from application.models.action_summaries import ActionSummaries  # noqa: F401
+from application.models.actions import Actions
+from application.models.games import Games  # noqa: F401 - Needed by create_all.
+
+NUM_GAMES = 20
+NUM_ACTIONS = 1000000
+RETENTION_COUNT = 100
+NUM_ROUNDS = 20
+
+
+def _populate():
+    start = datetime(2020, 1, 1)
+    rows = [
+        {
+            "game_id": index % NUM_GAMES + 1,
+            "type": "updating",
+            "owner": "NONE",
+            "timestamp": start + timedelta(minutes=index),
+        }
+        for index in range(NUM_ACTIONS)
+    ]
+    DATABASE.session.execute(
+        text(
+            "INSERT INTO actions (game_id, type, owner, timestamp) "
+            "VALUES (:game_id, :type, :owner, :timestamp)"
+        ),
+        rows,
+    )
+    DATABASE.session.commit()
+
+
+def _measure() -> tuple:
+    game_ids = list(range(1, NUM_GAMES + 1))
+
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        Actions.get_latest_by_game(game_ids, 1, 10)
+    latest = (time.perf_counter() - start) / NUM_ROUNDS
+
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        Actions.query.filter_by(game_id=1).count()
+    history = (time.perf_counter() - start) / NUM_ROUNDS
+
+    return latest, history
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_file = os.path.join(temp_dir, "bench.db")
+
+        app = Flask(__name__)
+        app.config.from_object(DefaultConfig)
+        app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{db_file}"
+        DATABASE.init_app(app)
+
+        with app.app_context():
+            init_sqlite_profile(DATABASE.engine, app.config)
+            DATABASE.create_all()
+            _populate()
+
+            latest, history = _measure()
+            size = os.path.getsize(db_file)
+            print(f"Before: {NUM_ACTIONS} actions, {size / 1024 / 1024:.1f} MB")
+            print(f"  Latest actions of all games: {latest * 1e3:8.2f} ms")
+            print(f"  History count of one game:   {history * 1e3:8.2f} ms")
+
+            start = time.perf_counter()
+            ActionsRetention().run_once(RETENTION_COUNT)
+            elapsed = time.perf_counter() - start
+            DATABASE.session.execute(text("PRAGMA wal_checkpoint(TRUNCATE)"))
+
+            latest, history = _measure()
+            size = os.path.getsize(db_file)
+            remaining = Actions.query.count()
+            print(f"Retention run: {elapsed:.1f} s")
+            print(f"After: {remaining} actions, {size / 1024 / 1024:.1f} MB")
+            print(f"  Latest actions of all games: {latest * 1e3:8.2f} ms")
+            print(f"  History count of one game:   {history * 1e3:8.2f} ms")
@@ -0,0 +1,85 @@
+"""
+Benchmark: Overhead of the authorization_required decorator for an external request with a valid
+bearer token.
+
+Without the token cache every request makes a token lookup, a secret lookup and a full HS256
+decode. With the cache, repeat requests are served from memory.
+
+Usage: python -m tests.benchmarks.bench_authorization
+"""
+import jwt
+import logging
+import time
+
+from flask import Flask
+
+from application.common import constants
+from application.common.decorators import authorization_required
+from application.common.token_cache import TOKEN_CACHE
+from application.extensions import DATABASE
+from application.models.settings import Settings
+from application.models.tokens import Tokens
+
+NUM_REQUESTS = 2000
+EXTERNAL_ADDR = "10.0.0.2"
+
+
+@authorization_required
+def _view():
+    return "Success"
+
+
+def _time_requests(app, bearer_token, use_cache: bool) -> float:
+    headers = {"Authorization": f"Bearer {bearer_token}"}
+    environ = {"REMOTE_ADDR": EXTERNAL_ADDR}
+
+    TOKEN_CACHE.clear()
+
+    start = time.perf_counter()
+    for _ in range(NUM_REQUESTS):
+        if not use_cache:
+            TOKEN_CACHE.clear()
+
+        with app.test_request_context(
+            "/v1/games", headers=headers, environ_base=environ
+        ):
+            assert _view() == "Success"
+
+    return (time.perf_counter() - start) / NUM_REQUESTS
+
+
+if __name__ == "__main__":
+    # The decorator logs every request at debug level, leave that out of the measurement.
+    logging.disable(logging.INFO)
+
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    app.config["FLASK_FORCE_AUTH"] = False
+    app.config["FLASK_DISABLE_AUTH"] = False
+    DATABASE.init_app(app)
+
+    secret = "benchmark-secret-that-is-long-enough-for-hs256"
+    bearer_token = jwt.encode({"token_name": "bench"}, secret, algorithm="HS256")
+
+    with app.app_context():
+        Settings.__table__.create(DATABASE.engine)
+        Tokens.__table__.create(DATABASE.engine)
+
+        setting = Settings()
+        setting.setting_name = constants.SETTING_NAME_APP_SECRET
+        setting.setting_value = secret
+        DATABASE.session.add(setting)
+
+        token = Tokens()
+        token.token_active = True
+        token.token_name = "bench"
+        token.token_value = bearer_token
+        DATABASE.session.add(token)
+        DATABASE.session.commit()
+
+        uncached = _time_requests(app, bearer_token, use_cache=False)
+        cached = _time_requests(app, bearer_token, use_cache=True)
+
+    print(f"Requests per run:        {NUM_REQUESTS}")
+    print(f"Uncached per request:    {uncached * 1e6:10.1f} us")
+    print(f"Cached per request:      {cached * 1e6:10.1f} us")
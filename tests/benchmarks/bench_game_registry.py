@@ -0,0 +1,33 @@
+"""
+Benchmark: Game object lookup latency, per request.
+
+Compares the old behavior, where every request discovered and executed all of the game modules,
+to a lookup against the process wide game registry.
+
+Usage: python -m tests.benchmarks.bench_game_registry
+"""
+import timeit
+
+from application.common.game_registry import GameRegistry, GAME_REGISTRY
+
+NUM_REQUESTS = 50
+
+
+def _cold_lookup():
+    # What every request used to do.
+    return GameRegistry().get_game_object("valheim")
+
+
+def _registry_lookup():
+    return GAME_REGISTRY.get_game_object("valheim")
+
+
+if __name__ == "__main__":
+    GAME_REGISTRY.load()
+
+    cold = timeit.timeit(_cold_lookup, number=NUM_REQUESTS) / NUM_REQUESTS
+    warm = timeit.timeit(_registry_lookup, number=NUM_REQUESTS) / NUM_REQUESTS
+
+    print(f"Module scan per request: {cold * 1e6:10.1f} us")
+    print(f"Registry lookup:         {warm * 1e6:10.1f} us")
+    print(f"Speedup:                 {cold / warm:10.1f}x")
@@ -0,0 +1,69 @@
+"""
+Benchmark: Process lookups by executable name against a synthetic 10k process table.
+
+The legacy lookup walked the whole process table and made one name() call per process, for
+every lookup. The process index scans once and serves the lookups from a name -> process map.
+
+Usage: python -m tests.benchmarks.bench_process_index
+"""
+import os
+import time
+
+from unittest import mock
+
+from application.common.process_index import ProcessIndex
+
+NUM_PROCESSES = 10000
+NUM_LOOKUPS = 100
+GAME_EXECUTABLES = ["valheim_server.exe", "PalServer.exe", "VRisingServer.exe"]
+
+
+class SyntheticProcess:
+    def __init__(self, pid, name):
+        self.pid = pid
+        self.info = {"pid": pid, "name": name, "create_time": 0.0, "exe": None}
+        self._name = name
+
+    def name(self):
+        # Stand in for the syscall psutil makes per process.
+        os.stat(".")
+        return self._name
+
+    def is_running(self):
+        os.stat(".")
+        return True
+
+
+PROCESS_TABLE = [
+    SyntheticProcess(pid, f"process_{pid}.exe") for pid in range(NUM_PROCESSES)
+] + [SyntheticProcess(NUM_PROCESSES + i, exe) for i, exe in enumerate(GAME_EXECUTABLES)]
+
+
+def _legacy_get_proc_by_name(process_name):
+    for proc in PROCESS_TABLE:
+        if proc.name() == process_name:
+            return proc
+    return None
+
+
+def _time_lookups(lookup) -> float:
+    start = time.perf_counter()
+    for i in range(NUM_LOOKUPS):
+        lookup(GAME_EXECUTABLES[i % len(GAME_EXECUTABLES)])
+    return (time.perf_counter() - start) / NUM_LOOKUPS
+
+
+if __name__ == "__main__":
+    with mock.patch("psutil.process_iter", return_value=PROCESS_TABLE):
+        index = ProcessIndex()
+        start = time.perf_counter()
+        index.refresh()
+        scan_time = time.perf_counter() - start
+
+        legacy = _time_lookups(_legacy_get_proc_by_name)
+        indexed = _time_lookups(index.get_process)
+
+    print(f"Processes in table:          {len(PROCESS_TABLE)}")
+    print(f"Legacy scan per lookup:      {legacy * 1e3:10.3f} ms")
+    print(f"Index build (one scan):      {scan_time * 1e3:10.3f} ms")
+    print(f"Indexed lookup:              {indexed * 1e3:10.3f} ms")
@@ -0,0 +1,56 @@
+"""
+Benchmark: Fixing the permissions of a synthetic steam directory with 100k files.
+
+The legacy walk called chmod on every entry, twice per SteamManager, and a new SteamManager was
+made for every steam request. The incremental walk uses os.scandir and skips entries that already
+have the right mode, and with the SteamManager cache it runs once per steam directory.
+
+Usage: python -m tests.benchmarks.bench_recursive_chmod
+"""
+import os
+import tempfile
+import time
+
+from application.common import toolbox
+
+NUM_DIRS = 1000
+FILES_PER_DIR = 100
+
+
+def _legacy_recursive_chmod(parent_path: str) -> None:
+    for root, dirs, files in os.walk(parent_path):
+        for d in dirs:
+            os.chmod(os.path.join(root, d), 0o777)
+        for f in files:
+            os.chmod(os.path.join(root, f), 0o777)
+
+
+def _make_tree(root: str) -> None:
+    for dir_index in range(NUM_DIRS):
+        sub_dir = os.path.join(root, f"depot_{dir_index // 50}", f"dir_{dir_index}")
+        os.makedirs(sub_dir)
+        for file_index in range(FILES_PER_DIR):
+            open(os.path.join(sub_dir, f"file_{file_index}.dat"), "w").close()
+
+
+def _timed(function, *args) -> float:
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as root:
+        _make_tree(root)
+
+        # Per request: the legacy SteamManager walked the tree twice.
+        legacy = _timed(_legacy_recursive_chmod, root) + _timed(
+            _legacy_recursive_chmod, root
+        )
+        first = _timed(toolbox.recursive_chmod, root)
+        repeat = _timed(toolbox.recursive_chmod, root)
+
+    print(f"Files in tree:                 {NUM_DIRS * FILES_PER_DIR}")
+    print(f"Legacy, every request:         {legacy * 1e3:10.1f} ms")
+    print(f"Incremental, first run:        {first * 1e3:10.1f} ms")
+    print(f"Incremental, already fixed:    {repeat * 1e3:10.1f} ms")
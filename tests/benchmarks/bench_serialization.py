@@ -0,0 +1,84 @@
+"""
+Benchmark: Serializing a large page of game arguments, as /game/arguments does with 10k per page.
+
+Compares the old path, ORM objects plus a per-row walk of the table columns plus the default
+JSON provider, to serializing the row tuples with the precomputed column keys and orjson.
+
+Usage: python -m tests.benchmarks.bench_serialization
+"""
+import time
+import tracemalloc
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from application.common.json_provider import OrjsonProvider
+from application.extensions import DATABASE
+from application.models.game_arguments import GameArguments
+from application.models.games import Games
+
+NUM_ROWS = 10000
+NUM_ROUNDS = 5
+
+
+def _legacy_to_dict(item):
+    data = {}
+
+    for column in item.__table__.columns:
+        field = column.key
+
+        if getattr(item, field) == []:
+            continue
+
+        data[field] = getattr(item, field)
+
+    return data
+
+
+def _legacy(provider):
+    DATABASE.session.expunge_all()
+    items = [_legacy_to_dict(item) for item in GameArguments.query.all()]
+    return provider.dumps({"items": items})
+
+
+def _fast(provider):
+    rows = GameArguments.select_rows(GameArguments.query).all()
+    return provider.dumps({"items": GameArguments.rows_to_dicts(rows)})
+
+
+def _measure(function, provider) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        function(provider)
+    elapsed = (time.perf_counter() - start) / NUM_ROUNDS
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+if __name__ == "__main__":
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    DATABASE.init_app(app)
+
+    with app.app_context():
+        Games.__table__.create(DATABASE.engine)
+        GameArguments.__table__.create(DATABASE.engine)
+
+        for index in range(NUM_ROWS):
+            game_arg = GameArguments()
+            game_arg.game_id = index % 10
+            game_arg.game_arg = f"-argument_{index}"
+            game_arg.game_arg_value = str(index)
+            DATABASE.session.add(game_arg)
+        DATABASE.session.commit()
+
+        legacy_time, legacy_peak = _measure(_legacy, DefaultJSONProvider(app))
+        fast_time, fast_peak = _measure(_fast, OrjsonProvider(app))
+
+    print(f"Rows serialized:     {NUM_ROWS}")
+    print(
+        f"Legacy: {legacy_time * 1e3:8.1f} ms, peak {legacy_peak / 1024 / 1024:6.1f} MB"
+    )
+    print(f"Fast:   {fast_time * 1e3:8.1f} ms, peak {fast_peak / 1024 / 1024:6.1f} MB")
@@ -0,0 +1,103 @@
+"""
+Benchmark: Concurrent reads and writes against a SQLite file, with and without the SQLite profile.
+
+Writer threads insert actions one transaction at a time, like the install threads and requests
+do, while reader threads page through them. Reports operations per second and the number of
+"database is locked" errors.
+
+Usage: python -m tests.benchmarks.bench_sqlite_profile
+"""
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from application.common.sqlite_profile import init_sqlite_profile
+from application.config.config import DefaultConfig
+
+NUM_WRITERS = 4
+NUM_READERS = 8
+DURATION_SECONDS = 3.0
+
+
+def _writer(engine, stop_event, counts):
+    while not stop_event.is_set():
+        try:
+            with engine.begin() as connection:
+                connection.execute(
+                    text("INSERT INTO actions (game_id, type) VALUES (1, 'starting')")
+                )
+            counts["writes"] += 1
+        except OperationalError:
+            counts["errors"] += 1
+
+
+def _reader(engine, stop_event, counts):
+    while not stop_event.is_set():
+        try:
+            with engine.connect() as connection:
+                connection.execute(
+                    text("SELECT * FROM actions ORDER BY action_id DESC LIMIT 10")
+                ).all()
+            counts["reads"] += 1
+        except OperationalError:
+            counts["errors"] += 1
+
+
+def _run(use_profile: bool) -> dict:
+    config = {
+        key: getattr(DefaultConfig, key)
+        for key in dir(DefaultConfig)
+        if key.startswith("SQLITE_")
+    }
+    config["SQLITE_PROFILE_ENABLED"] = use_profile
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(temp_dir, 'bench.db')}",
+            **DefaultConfig.SQLALCHEMY_ENGINE_OPTIONS,
+        )
+        init_sqlite_profile(engine, config)
+
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    "CREATE TABLE actions (action_id INTEGER PRIMARY KEY, "
+                    "game_id INTEGER, type VARCHAR(100))"
+                )
+            )
+
+        counts = {"reads": 0, "writes": 0, "errors": 0}
+        stop_event = threading.Event()
+        threads = [
+            threading.Thread(target=_writer, args=(engine, stop_event, counts))
+            for _ in range(NUM_WRITERS)
+        ] + [
+            threading.Thread(target=_reader, args=(engine, stop_event, counts))
+            for _ in range(NUM_READERS)
+        ]
+
+        for thread in threads:
+            thread.start()
+        time.sleep(DURATION_SECONDS)
+        stop_event.set()
+        for thread in threads:
+            thread.join()
+
+        engine.dispose()
+
+    return counts
+
+
+if __name__ == "__main__":
+    for use_profile in [False, True]:
+        counts = _run(use_profile)
+        label = "With profile:   " if use_profile else "Without profile:"
+        print(
+            f"{label} {counts['writes'] / DURATION_SECONDS:8.0f} writes/s, "
+            f"{counts['reads'] / DURATION_SECONDS:8.0f} reads/s, "
+            f"{counts['errors']} lock errors"
+        )
@@ -0,0 +1,65 @@
+"""
+Benchmark: Update checks for a handful of games, as the GUI refresh and /agent/info make them,
+against a local stand-in for api.steamcmd.net with 50 ms of latency.
+
+The legacy check made a new connection and downloaded the app info every time. The cached check
+serves repeat lookups from memory and revalidates with the shared session once the TTL expires.
+
+Usage: python -m tests.benchmarks.bench_steam_update_check
+"""
+import requests
+import time
+
+from application.managers.steam_manager import SteamAppInfoCache, SteamUpdateManager
+from tests.steamcmd_api_stub import SteamcmdApiStub
+
+STEAM_IDS = [896660, 1690800, 2394010, 1829350, 2278520]
+NUM_ROUNDS = 20
+LATENCY_SECONDS = 0.05
+
+
+def _legacy_get_build_id(base_format_url, steam_id, branch="public"):
+    response = requests.get(base_format_url.format(STEAM_ID=steam_id))
+    app_data = response.json()["data"][str(steam_id)]
+    return int(app_data["depots"]["branches"][branch]["buildid"])
+
+
+def _time_rounds(get_build_id) -> float:
+    start = time.perf_counter()
+    for _ in range(NUM_ROUNDS):
+        for steam_id in STEAM_IDS:
+            get_build_id(steam_id)
+    return (time.perf_counter() - start) / NUM_ROUNDS
+
+
+if __name__ == "__main__":
+    stub = SteamcmdApiStub(latency_seconds=LATENCY_SECONDS).start()
+
+    for index, steam_id in enumerate(STEAM_IDS):
+        stub.set_build_id(steam_id, 1000 + index)
+
+    try:
+        legacy = _time_rounds(
+            lambda steam_id: _legacy_get_build_id(stub.base_format_url, steam_id)
+        )
+        legacy_requests = stub.num_requests
+
+        stub.num_requests = 0
+        steam_mgr = SteamUpdateManager(
+            base_format_url=stub.base_format_url, cache=SteamAppInfoCache()
+        )
+        cached = _time_rounds(steam_mgr._get_build_id)
+        cached_requests = stub.num_requests
+    finally:
+        stub.stop()
+
+    num_lookups = NUM_ROUNDS * len(STEAM_IDS)
+
+    print(f"Lookups per run:           {num_lookups}")
+    print(
+        f"Legacy per refresh:        {legacy * 1e3:10.1f} ms, {legacy_requests} requests"
+    )
+    print(
+        f"Cached per refresh:        {cached * 1e3:10.1f} ms, {cached_requests} requests"
+    )
+    print(f"Cache hit rate:            {1 - cached_requests / num_lookups:10.1%}")
@@ -2,14 +2,25 @@ from datetime import datetime
 from pytest import fixture
 from application.config.config import DefaultConfig
 from application.factory import create_app
+from tests.steamcmd_api_stub import SteamcmdApiStub
 
 
 @fixture(scope="session")
 def fake_app():
     config = DefaultConfig(deploy_type="python")
     config.HISTORY_START_YEAR = datetime.now().year
+    config.UPDATE_CHECK_ENABLED = False
     config.obtain_environment_variables()
 
     app = create_app(config=config)
 
     yield app
+
+
+@fixture
+def steamcmd_api():
+    stub = SteamcmdApiStub().start()
+
+    yield stub
+
+    stub.stop()
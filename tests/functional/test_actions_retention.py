@@ -0,0 +1,137 @@
+from datetime import datetime, timedelta
+from sqlalchemy import func
+
+from application.extensions import DATABASE
+from application.managers.actions_retention import ActionsRetention
+from application.models.action_summaries import ActionSummaries
+from application.models.actions import Actions
+
+TEST_GAME_ID = 999300000
+NUM_ACTIONS = 30
+RETENTION_COUNT = 10
+
+
+class TestActionsRetention:
+    @classmethod
+    def setup_class(cls):
+        cls.retention = ActionsRetention()
+        cls.retention.BATCH_SIZE = 4
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _create_actions(self) -> None:
+        start = datetime(2024, 1, 1)
+
+        for index in range(NUM_ACTIONS):
+            new_action = Actions()
+            new_action.game_id = TEST_GAME_ID
+            new_action.type = "starting" if index % 2 else "stopping"
+            # Three actions per day.
+            new_action.timestamp = start + timedelta(hours=8 * index)
+            DATABASE.session.add(new_action)
+
+        DATABASE.session.commit()
+
+    def _cleanup(self) -> None:
+        Actions.query.filter_by(game_id=TEST_GAME_ID).delete()
+        ActionSummaries.query.filter_by(game_id=TEST_GAME_ID).delete()
+        DATABASE.session.commit()
+
+    def test_keeps_latest_and_rolls_up(self, fake_app):
+        with fake_app.app_context():
+            self._create_actions()
+
+            try:
+                expected = [
+                    action.action_id
+                    for action in Actions.query.filter_by(game_id=TEST_GAME_ID)
+                    .order_by(Actions.timestamp.desc())
+                    .limit(RETENTION_COUNT)
+                ]
+
+                self.retention.run_once(RETENTION_COUNT)
+
+                remaining = [
+                    action.action_id
+                    for action in Actions.query.filter_by(game_id=TEST_GAME_ID)
+                    .order_by(Actions.timestamp.desc())
+                    .all()
+                ]
+                summaries = ActionSummaries.query.filter_by(game_id=TEST_GAME_ID)
+                total = summaries.with_entities(func.sum(ActionSummaries.count))
+
+                assert remaining == expected
+                assert total.scalar() == NUM_ACTIONS - RETENTION_COUNT
+
+                first_day = summaries.filter_by(day=datetime(2024, 1, 1).date()).all()
+                assert {(s.type, s.count) for s in first_day} == {
+                    ("stopping", 2),
+                    ("starting", 1),
+                }
+
+                # Running again has nothing left to prune.
+                assert self.retention.run_once(RETENTION_COUNT) == 0
+            finally:
+                self._cleanup()
+
+    def test_rollup_accumulates(self, fake_app):
+        with fake_app.app_context():
+            self._create_actions()
+
+            try:
+                self.retention.run_once(RETENTION_COUNT)
+                self.retention.run_once(1)
+
+                total = ActionSummaries.query.filter_by(
+                    game_id=TEST_GAME_ID
+                ).with_entities(func.sum(ActionSummaries.count))
+
+                assert Actions.query.filter_by(game_id=TEST_GAME_ID).count() == 1
+                assert total.scalar() == NUM_ACTIONS - 1
+            finally:
+                self._cleanup()
+
+    def _get_freelist_count(self) -> int:
+        with DATABASE.engine.connect() as connection:
+            return connection.exec_driver_sql("PRAGMA freelist_count").scalar()
+
+    def test_database_uses_incremental_vacuum(self, fake_app):
+        retention = ActionsRetention()
+        retention.VACUUM_PAGES = 100000
+
+        with fake_app.app_context():
+            retention._enable_incremental_vacuum()
+
+            with DATABASE.engine.connect() as connection:
+                auto_vacuum = connection.exec_driver_sql("PRAGMA auto_vacuum").scalar()
+
+            assert auto_vacuum == 2
+
+            try:
+                # Large actions, so deleting them frees whole pages.
+                for index in range(400):
+                    new_action = Actions()
+                    new_action.game_id = TEST_GAME_ID
+                    new_action.type = "starting"
+                    new_action.spare = "x" * 2000
+                    new_action.timestamp = datetime(2024, 1, 1) + timedelta(
+                        minutes=index
+                    )
+                    DATABASE.session.add(new_action)
+                DATABASE.session.commit()
+
+                Actions.query.filter(
+                    Actions.game_id == TEST_GAME_ID,
+                    Actions.timestamp < datetime(2024, 1, 1, 2),
+                ).delete()
+                DATABASE.session.commit()
+
+                num_free_pages = self._get_freelist_count()
+                assert num_free_pages > 0
+
+                assert retention.run_once(1) > 0
+                assert self._get_freelist_count() < num_free_pages
+            finally:
+                self._cleanup()
@@ -0,0 +1,83 @@
+import psutil
+import subprocess
+import sys
+import time
+
+from application.common.constants import GameActionTypes, GameStates
+from application.extensions import DATABASE
+from application.managers.game_supervisor import GAME_SUPERVISOR, GameSupervisor
+from application.models.actions import Actions
+from application.models.games import Games
+
+TEST_STEAM_ID = 999000001
+EXIT_TIMEOUT_SECONDS = 5
+
+
+class TestGameSupervisor:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _create_game(self, pid: int) -> int:
+        new_game = Games()
+        new_game.game_steam_id = TEST_STEAM_ID
+        new_game.game_install_dir = "/tmp/supervisor_test_game"
+        new_game.game_name = "supervisor_test_game"
+        new_game.game_pretty_name = "Supervisor Test Game"
+        new_game.game_pid = pid
+        DATABASE.session.add(new_game)
+        DATABASE.session.commit()
+        return new_game.game_id
+
+    def _delete_game(self, game_id: int) -> None:
+        Actions.query.filter_by(game_id=game_id).delete()
+        Games.query.filter_by(game_id=game_id).delete()
+        DATABASE.session.commit()
+
+    def test_game_exit_is_recorded(self, fake_app):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.5)"])
+
+        with fake_app.app_context():
+            game_id = self._create_game(child.pid)
+
+            try:
+                GAME_SUPERVISOR.watch(game_id, psutil.Process(child.pid))
+                child.wait()
+
+                deadline = time.monotonic() + EXIT_TIMEOUT_SECONDS
+                while time.monotonic() < deadline:
+                    DATABASE.session.expire_all()
+                    game_obj = Games.query.filter_by(game_id=game_id).first()
+                    if game_obj.game_pid is None:
+                        break
+                    time.sleep(0.05)
+
+                action = Actions.query.filter_by(game_id=game_id).first()
+
+                assert game_obj.game_pid is None
+                assert game_obj.game_state == GameStates.STOPPED.value
+                assert action.type == GameActionTypes.EXITED.value
+                assert action.owner == GAME_SUPERVISOR.ACTION_OWNER
+                assert GAME_SUPERVISOR.get_process(child.pid) is None
+            finally:
+                self._delete_game(game_id)
+
+    def test_exited_process_is_not_returned(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+
+        # Without init_app there is no thread to notice the exit.
+        supervisor = GameSupervisor()
+        supervisor.watch(1, psutil.Process(child.pid))
+
+        try:
+            assert supervisor.get_process(child.pid).pid == child.pid
+        finally:
+            child.kill()
+            child.wait()
+
+        assert child.pid in supervisor._watched
+        assert supervisor.get_process(child.pid) is None
@@ -0,0 +1,101 @@
+import os
+import tempfile
+
+from datetime import date, datetime
+
+from application.common.constants import GameActionTypes, InstallJobStates
+from application.common.game_base import BaseGame
+from application.extensions import DATABASE
+from application.models.action_summaries import ActionSummaries
+from application.models.actions import Actions
+from application.models.game_arguments import GameArguments
+from application.models.games import Games
+from application.models.install_jobs import InstallJobs
+
+TEST_STEAM_ID = 999400000
+
+
+class UninstallTestGame(BaseGame):
+    _game_name = "uninstall_test"
+    _game_pretty_name = "Uninstall Test"
+    _game_executable = "uninstall_test.exe"
+    _game_steam_id = str(TEST_STEAM_ID)
+
+    def startup(self) -> None:
+        pass
+
+    def shutdown(self) -> None:
+        pass
+
+
+class TestGameUninstall:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_uninstall(self, fake_app):
+        with fake_app.app_context(), tempfile.TemporaryDirectory() as parent_dir:
+            install_dir = os.path.join(parent_dir, "uninstall_test")
+            os.makedirs(os.path.join(install_dir, "data"))
+
+            new_game = Games()
+            new_game.game_steam_id = TEST_STEAM_ID
+            new_game.game_install_dir = install_dir
+            new_game.game_name = UninstallTestGame._game_name
+            new_game.game_pretty_name = UninstallTestGame._game_pretty_name
+            DATABASE.session.add(new_game)
+            DATABASE.session.flush()
+            game_id = new_game.game_id
+
+            for index in range(3):
+                new_arg = GameArguments()
+                new_arg.game_id = game_id
+                new_arg.game_arg = f"-arg{index}"
+                new_arg.game_arg_value = str(index)
+                DATABASE.session.add(new_arg)
+
+                new_action = Actions()
+                new_action.game_id = game_id
+                new_action.type = "starting"
+                DATABASE.session.add(new_action)
+
+            new_summary = ActionSummaries()
+            new_summary.game_id = game_id
+            new_summary.day = date(2024, 1, 1)
+            new_summary.type = "starting"
+            new_summary.count = 5
+            DATABASE.session.add(new_summary)
+
+            new_job = InstallJobs()
+            new_job.steam_id = TEST_STEAM_ID
+            new_job.install_dir = install_dir
+            new_job.activity = GameActionTypes.INSTALLING.value
+            new_job.state = InstallJobStates.SUCCEEDED.value
+            new_job.created_at = datetime.utcnow()
+            DATABASE.session.add(new_job)
+            DATABASE.session.commit()
+
+            try:
+                delete_thread = UninstallTestGame().uninstall()
+
+                assert delete_thread is not None
+                assert delete_thread.tombstone_path.startswith(
+                    install_dir + ".deleting-"
+                )
+                assert not os.path.exists(install_dir)
+                assert InstallJobs.query.filter_by(steam_id=TEST_STEAM_ID).count() == 0
+
+                for model in [Games, GameArguments, Actions, ActionSummaries]:
+                    assert model.query.filter_by(game_id=game_id).count() == 0
+
+                delete_thread.join(timeout=10)
+                assert os.listdir(parent_dir) == []
+            finally:
+                for model in [GameArguments, Actions, ActionSummaries, Games]:
+                    model.query.filter_by(game_id=game_id).delete()
+                InstallJobs.query.filter_by(steam_id=TEST_STEAM_ID).delete()
+                DATABASE.session.commit()
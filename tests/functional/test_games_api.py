@@ -0,0 +1,197 @@
+import pytest
+
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from types import SimpleNamespace
+
+from application.api.controllers import games as games_controller
+from application.common.exceptions import InvalidUsage
+from application.common.pagination import _encode_cursor
+from application.extensions import DATABASE
+from application.models.actions import Actions
+from application.models.game_arguments import GameArguments
+from application.models.games import Games
+
+TEST_STEAM_ID_BASE = 999100000
+NUM_ACTIONS = 15
+
+
+class TestGamesApi:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _create_games(self, num_games: int, first_index: int = 0) -> list:
+        game_ids = []
+        start = datetime(2024, 1, 1)
+
+        for index in range(first_index, first_index + num_games):
+            new_game = Games()
+            new_game.game_steam_id = TEST_STEAM_ID_BASE + index
+            new_game.game_install_dir = f"/tmp/games_api_test_{index}"
+            new_game.game_name = f"games_api_test_{index}"
+            new_game.game_pretty_name = f"Games Api Test {index}"
+            DATABASE.session.add(new_game)
+            DATABASE.session.flush()
+
+            for action_index in range(NUM_ACTIONS):
+                new_action = Actions()
+                new_action.game_id = new_game.game_id
+                new_action.type = "starting"
+                new_action.result = str(action_index)
+                new_action.timestamp = start + timedelta(minutes=action_index)
+                DATABASE.session.add(new_action)
+
+            game_ids.append(new_game.game_id)
+
+        DATABASE.session.commit()
+        return game_ids
+
+    def _delete_games(self, game_ids: list) -> None:
+        GameArguments.query.filter(GameArguments.game_id.in_(game_ids)).delete()
+        Actions.query.filter(Actions.game_id.in_(game_ids)).delete()
+        Games.query.filter(Games.game_id.in_(game_ids)).delete()
+        DATABASE.session.commit()
+
+    def _count_statements(self, fake_app) -> int:
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(DATABASE.engine, "before_cursor_execute", _before_cursor_execute)
+
+        try:
+            with fake_app.test_request_context("/v1/games?per_page=1000"):
+                games_controller.get_all_games()
+        finally:
+            event.remove(
+                DATABASE.engine, "before_cursor_execute", _before_cursor_execute
+            )
+
+        return len(statements)
+
+    def test_get_all_games_latest_actions(self, fake_app):
+        with fake_app.app_context():
+            game_ids = self._create_games(2)
+
+            try:
+                latest_actions = Actions.get_latest_by_game(game_ids, 2, 5)
+
+                for game_id in game_ids:
+                    results = [action["result"] for action in latest_actions[game_id]]
+                    assert results == ["9", "8", "7", "6", "5"]
+            finally:
+                self._delete_games(game_ids)
+
+    def test_get_all_games_keyset_page(self, fake_app):
+        with fake_app.app_context():
+            game_ids = self._create_games(3)
+
+            try:
+                with fake_app.test_request_context("/v1/games?per_page=2"):
+                    assert games_controller.get_all_games()["_meta"]["next_cursor"]
+
+                # Start right before the test games. A page number next to a cursor is ignored,
+                # for the games and for their actions.
+                cursor = _encode_cursor(
+                    SimpleNamespace(game_id=game_ids[0] - 1), [Games.game_id]
+                )
+
+                with fake_app.test_request_context(
+                    f"/v1/games?per_page=2&page=3&after={cursor}"
+                ):
+                    games_dict = games_controller.get_all_games()
+
+                assert games_dict["_meta"]["page"] is None
+                assert [game["game_id"] for game in games_dict["items"]] == game_ids[:2]
+
+                for game in games_dict["items"]:
+                    results = [action["result"] for action in game["actions"]]
+                    assert results == ["14", "13"]
+            finally:
+                self._delete_games(game_ids)
+
+    def test_get_all_games_statement_count(self, fake_app):
+        with fake_app.app_context():
+            game_ids = self._create_games(2)
+
+            try:
+                few_games = self._count_statements(fake_app)
+                game_ids += self._create_games(10, first_index=2)
+                many_games = self._count_statements(fake_app)
+
+                assert few_games == many_games
+            finally:
+                self._delete_games(game_ids)
+
+    def test_bulk_update_arguments(self, fake_app):
+        client = fake_app.test_client()
+
+        with fake_app.app_context():
+            game_ids = self._create_games(1)
+            game_name = "games_api_test_0"
+            url = f"/v1/game/{game_name}/arguments/bulk"
+
+            try:
+                response = client.post(
+                    url,
+                    json=[
+                        {"game_arg": "-port", "game_arg_value": 2456},
+                        {"game_arg": "-name", "game_arg_value": "Test"},
+                        {"game_arg": "-world", "game_arg_value": "W", "file_mode": 0},
+                    ],
+                )
+                assert response.status_code == 200
+                created = response.json["created"]
+                assert len(created) == 3
+                assert [item["result"] for item in response.json["items"]] == [
+                    "created"
+                ] * 3
+
+                response = client.post(
+                    url,
+                    json=[
+                        {"game_arg": "-port", "game_arg_value": "2457"},
+                        {"game_arg_id": created[1], "game_arg_value": "Test"},
+                        {"game_arg": "-world", "delete": True},
+                        {"game_arg": "-public", "game_arg_value": "1"},
+                    ],
+                )
+                assert response.status_code == 200
+                assert response.json["updated"] == [created[0]]
+                assert response.json["unchanged"] == [created[1]]
+                assert response.json["deleted"] == [created[2]]
+                assert len(response.json["created"]) == 1
+
+                args = GameArguments.query.filter_by(game_id=game_ids[0]).all()
+                values = {arg.game_arg: arg.game_arg_value for arg in args}
+                assert values == {"-port": "2457", "-name": "Test", "-public": "1"}
+
+                # One bad item rolls back the whole request.
+                with pytest.raises(InvalidUsage):
+                    games_controller.bulk_update_arguments(
+                        game_name,
+                        [
+                            {"game_arg": "-port", "game_arg_value": "9999"},
+                            {"game_arg": "-bad", "game_arg_value": "x", "file_mode": 7},
+                        ],
+                    )
+
+                DATABASE.session.expire_all()
+                port_arg = GameArguments.query.filter_by(
+                    game_id=game_ids[0], game_arg="-port"
+                ).first()
+                assert port_arg.game_arg_value == "2457"
+                assert (
+                    GameArguments.query.filter_by(
+                        game_id=game_ids[0], game_arg="-bad"
+                    ).first()
+                    is None
+                )
+            finally:
+                self._delete_games(game_ids)
@@ -0,0 +1,508 @@
+import os
+import psutil
+import pytest
+import stat
+import tempfile
+import threading
+import time
+
+from datetime import datetime, timedelta
+
+from application.api.v1.blueprints.steam import _get_validate
+from application.common.constants import GameActionTypes, InstallJobStates
+from application.common.exceptions import InvalidUsage
+from application.extensions import DATABASE
+from application.managers.install_progress import INSTALL_PROGRESS
+from application.managers.install_scheduler import (
+    INSTALL_SCHEDULER,
+    InstallScheduler,
+    _Job,
+)
+from application.managers.steam_manager import (
+    SteamAppInfoCache,
+    SteamManager,
+    SteamUpdateManager,
+)
+from application.models.install_jobs import InstallJobs
+
+TEST_STEAM_ID = 999600000
+
+
+class FakeSteamManager:
+    """Stands in for steamcmd, each job blocks until released."""
+
+    def __init__(self) -> None:
+        self.release_event = threading.Event()
+        self.num_runs = 0
+        self.thread_names = []
+
+    def _install_gamefiles(
+        self, gameid, game_install_dir, user, password, validate, progress
+    ) -> bool:
+        self.num_runs += 1
+        self.thread_names.append(threading.current_thread().name)
+        self.release_event.wait(10)
+
+        # Workers run in an app context, so jobs can use the database.
+        assert DATABASE.session.get(InstallJobs, progress.job_id) is not None
+
+        if gameid != TEST_STEAM_ID:
+            progress.finish(1)
+            return False
+
+        progress.feed_line(f"Success! App '{gameid}' fully installed.")
+        progress.finish(0)
+        return True
+
+
+class TestInstallScheduler:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _get_scheduler(self, fake_app, num_workers: int, queue_size: int):
+        config = fake_app.config
+        default_config = (
+            config["INSTALL_JOB_WORKERS"],
+            config["INSTALL_JOB_QUEUE_SIZE"],
+        )
+
+        config["INSTALL_JOB_WORKERS"] = num_workers
+        config["INSTALL_JOB_QUEUE_SIZE"] = queue_size
+
+        try:
+            scheduler = InstallScheduler()
+            scheduler.init_app(fake_app)
+        finally:
+            (
+                config["INSTALL_JOB_WORKERS"],
+                config["INSTALL_JOB_QUEUE_SIZE"],
+            ) = default_config
+
+        return scheduler
+
+    def _delete_jobs(self) -> None:
+        InstallJobs.query.filter(
+            InstallJobs.steam_id.in_([TEST_STEAM_ID, TEST_STEAM_ID + 1])
+        ).delete()
+        DATABASE.session.commit()
+
+    def test_duplicate_requests_are_coalesced(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=2, queue_size=8)
+        steam_mgr = FakeSteamManager()
+
+        with fake_app.app_context():
+            try:
+                first = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/job_test", "anonymous", None, "x"
+                )
+                second = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/job_test/", "anonymous", None, "x"
+                )
+                other = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID + 1, "/tmp/job_test_2", "user", "pw", "x"
+                )
+
+                assert not first["is_coalesced"]
+                assert second == {
+                    "job_id": first["job_id"],
+                    "is_coalesced": True,
+                    "is_validate_applied": True,
+                }
+                assert other["job_id"] != first["job_id"]
+                assert scheduler.is_job_active(first["job_id"])
+
+                steam_mgr.release_event.set()
+                scheduler.stop()
+                for worker in scheduler._workers:
+                    worker.join(timeout=10)
+
+                assert steam_mgr.num_runs == 2
+                assert all(
+                    name.startswith("InstallScheduler-")
+                    for name in steam_mgr.thread_names
+                )
+                assert not scheduler.is_job_active(first["job_id"])
+
+                DATABASE.session.expire_all()
+                job_obj = DATABASE.session.get(InstallJobs, first["job_id"])
+                assert job_obj.state == InstallJobStates.SUCCEEDED.value
+                assert job_obj.return_code == 0
+                assert job_obj.finished_at is not None
+
+                job_obj = DATABASE.session.get(InstallJobs, other["job_id"])
+                assert job_obj.state == InstallJobStates.FAILED.value
+                assert job_obj.return_code == 1
+            finally:
+                steam_mgr.release_event.set()
+                self._delete_jobs()
+
+    def test_install_dir_permissions_are_fixed(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=8)
+        steam_mgr = FakeSteamManager()
+        steam_mgr.release_event.set()
+
+        with fake_app.app_context(), tempfile.TemporaryDirectory() as install_dir:
+            try:
+                game_file = os.path.join(install_dir, "server.exe")
+                with open(game_file, "w") as f:
+                    f.write("data")
+                os.chmod(game_file, 0o600)
+
+                job_id = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, install_dir, "anonymous", None, "x"
+                )["job_id"]
+
+                assert scheduler.wait_for_job(job_id, timeout=10)
+                assert stat.S_IMODE(os.stat(game_file).st_mode) == 0o777
+            finally:
+                scheduler.stop()
+                self._delete_jobs()
+
+    def test_job_error_fails_job(self, fake_app):
+        # Config values from the environment are strings.
+        scheduler = self._get_scheduler(fake_app, num_workers="1", queue_size="8")
+        steam_mgr = FakeSteamManager()
+
+        def _is_validate_due(job):
+            raise RuntimeError("database is locked")
+
+        scheduler._is_validate_due = _is_validate_due
+
+        with fake_app.app_context():
+            try:
+                job_id = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/job_test", "anonymous", None, "x"
+                )["job_id"]
+                progress = INSTALL_PROGRESS.get(job_id)
+
+                assert scheduler.wait_for_job(job_id, timeout=10)
+                assert progress.is_finished
+                assert not progress.is_successful
+                assert steam_mgr.num_runs == 0
+
+                DATABASE.session.expire_all()
+                job_obj = DATABASE.session.get(InstallJobs, job_id)
+                assert job_obj.state == InstallJobStates.FAILED.value
+                assert job_obj.error == "database is locked"
+                assert job_obj.finished_at is not None
+            finally:
+                scheduler.stop()
+                self._delete_jobs()
+
+    def test_validate_is_not_applied_to_running_job(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=8)
+        steam_mgr = FakeSteamManager()
+
+        with fake_app.app_context():
+            try:
+                running = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/running", "u", None, "x"
+                )
+                queued = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/queued", "u", None, "x"
+                )
+
+                for _ in range(100):
+                    if steam_mgr.num_runs == 1:
+                        break
+                    threading.Event().wait(0.05)
+
+                job = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/running", "u", None, "x", True
+                )
+                assert job["job_id"] == running["job_id"]
+                assert not job["is_validate_applied"]
+
+                job = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/queued", "u", None, "x", True
+                )
+                assert job["job_id"] == queued["job_id"]
+                assert job["is_validate_applied"]
+
+                steam_mgr.release_event.set()
+                assert scheduler.wait_for_job(queued["job_id"], 10)
+
+                DATABASE.session.expire_all()
+                assert not DATABASE.session.get(InstallJobs, running["job_id"]).validate
+                assert DATABASE.session.get(InstallJobs, queued["job_id"]).validate
+            finally:
+                steam_mgr.release_event.set()
+                scheduler.stop()
+                for worker in scheduler._workers:
+                    worker.join(timeout=10)
+                self._delete_jobs()
+
+    def test_only_jobs_of_gone_agents_are_failed(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=8)
+        scheduler.stop()
+
+        process = psutil.Process()
+        owners = {
+            "live": (process.pid, process.create_time()),
+            "restarted": (process.pid, process.create_time() - 3600),
+            "unknown": (None, None),
+        }
+
+        with fake_app.app_context():
+            try:
+                job_ids = {}
+                for name, (owner_pid, owner_pid_create_time) in owners.items():
+                    job_obj = InstallJobs()
+                    job_obj.steam_id = TEST_STEAM_ID
+                    job_obj.install_dir = f"/tmp/{name}"
+                    job_obj.activity = GameActionTypes.UPDATING.value
+                    job_obj.state = InstallJobStates.RUNNING.value
+                    job_obj.created_at = datetime.utcnow()
+                    job_obj.owner_pid = owner_pid
+                    job_obj.owner_pid_create_time = owner_pid_create_time
+                    DATABASE.session.add(job_obj)
+                    DATABASE.session.commit()
+                    job_ids[name] = job_obj.job_id
+
+                scheduler._fail_interrupted_jobs()
+
+                DATABASE.session.expire_all()
+                states = {
+                    name: DATABASE.session.get(InstallJobs, job_id).state
+                    for name, job_id in job_ids.items()
+                }
+                assert states == {
+                    "live": InstallJobStates.RUNNING.value,
+                    "restarted": InstallJobStates.FAILED.value,
+                    "unknown": InstallJobStates.FAILED.value,
+                }
+            finally:
+                self._delete_jobs()
+
+    def test_validate_is_parsed(self):
+        for value in [True, "true", "True", "1", 1]:
+            assert _get_validate({"validate": value})
+
+        for value in [False, "false", "0", 0]:
+            assert not _get_validate({"validate": value})
+
+        assert not _get_validate({})
+
+        with pytest.raises(InvalidUsage):
+            _get_validate({"validate": "yes"})
+
+    def test_full_queue_is_refused(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=1)
+        steam_mgr = FakeSteamManager()
+
+        with fake_app.app_context():
+            try:
+                scheduler.submit(steam_mgr, TEST_STEAM_ID, "/tmp/a", "u", None, "x")
+
+                # Wait for the worker to pick up the first job, the second one fills the queue.
+                for _ in range(100):
+                    if steam_mgr.num_runs == 1:
+                        break
+                    threading.Event().wait(0.05)
+
+                scheduler.submit(steam_mgr, TEST_STEAM_ID, "/tmp/b", "u", None, "x")
+
+                with pytest.raises(InvalidUsage) as error:
+                    scheduler.submit(steam_mgr, TEST_STEAM_ID, "/tmp/c", "u", None, "x")
+
+                assert error.value.status_code == 503
+            finally:
+                steam_mgr.release_event.set()
+                scheduler.stop()
+                for worker in scheduler._workers:
+                    worker.join(timeout=10)
+                self._delete_jobs()
+
+    def test_wait_and_events(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=8)
+        steam_mgr = FakeSteamManager()
+
+        with fake_app.app_context():
+            try:
+                after_event_id = scheduler.get_last_event_id()
+                job = scheduler.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/wait", "u", None, "x"
+                )
+                job_id = job["job_id"]
+
+                assert not scheduler.wait_for_job(job_id, 0.1)
+
+                # Waiting wakes up as soon as the job is done, not after the timeout.
+                threading.Timer(0.2, steam_mgr.release_event.set).start()
+                start_time = time.monotonic()
+                assert scheduler.wait_for_job(job_id, 10)
+                assert time.monotonic() - start_time < 5
+
+                events = scheduler.get_events(after_event_id, 1)
+                assert [event["state"] for event in events] == [
+                    InstallJobStates.QUEUED.value,
+                    InstallJobStates.RUNNING.value,
+                    InstallJobStates.SUCCEEDED.value,
+                ]
+                assert all(event["job_id"] == job_id for event in events)
+
+                # Nothing new happens, so this waits for the timeout.
+                assert scheduler.get_events(events[-1]["event_id"], 0.1) == []
+
+                # Jobs that are not running are done right away.
+                assert scheduler.wait_for_job(job_id, 10)
+            finally:
+                steam_mgr.release_event.set()
+                scheduler.stop()
+                for worker in scheduler._workers:
+                    worker.join(timeout=10)
+                self._delete_jobs()
+
+    def test_wait_endpoints(self, fake_app):
+        client = fake_app.test_client()
+        steam_mgr = FakeSteamManager()
+
+        with fake_app.app_context():
+            try:
+                after_event_id = INSTALL_SCHEDULER.get_last_event_id()
+                job_id = INSTALL_SCHEDULER.submit(
+                    steam_mgr, TEST_STEAM_ID, "/tmp/wait_api", "u", None, "x"
+                )["job_id"]
+
+                response = client.get(f"/v1/steam/app/job/{job_id}/wait?timeout=0.1")
+                assert response.status_code == 200
+                assert not response.json["is_finished"]
+
+                response = client.get(f"/v1/thread/status/{job_id}?wait=0.1")
+                assert response.json["alive"]
+
+                threading.Timer(0.2, steam_mgr.release_event.set).start()
+
+                response = client.get(f"/v1/steam/app/job/{job_id}/wait?timeout=10")
+                assert response.json["is_finished"]
+                assert response.json["state"] == InstallJobStates.SUCCEEDED.value
+
+                response = client.get(f"/v1/thread/status/{job_id}")
+                assert not response.json["alive"]
+
+                response = client.get(
+                    f"/v1/steam/app/job/events?after={after_event_id}", buffered=False
+                )
+                assert response.mimetype == "text/event-stream"
+
+                chunk = next(response.response).decode("utf-8")
+                response.close()
+
+                assert f"id: {after_event_id + 1}" in chunk
+                assert f'"job_id":{job_id}' in chunk
+                assert '"state":"queued"' in chunk
+            finally:
+                steam_mgr.release_event.set()
+                self._delete_jobs()
+
+    def _write_app_manifest(self, install_dir: str, build_id: int) -> None:
+        steamapps_dir = os.path.join(install_dir, "steamapps")
+        os.makedirs(steamapps_dir, exist_ok=True)
+
+        manifest_file = os.path.join(steamapps_dir, f"appmanifest_{TEST_STEAM_ID}.acf")
+
+        with open(manifest_file, "w") as file:
+            file.write(
+                '"AppState"\n{\n'
+                f'\t"appid"\t\t"{TEST_STEAM_ID}"\n'
+                f'\t"buildid"\t\t"{build_id}"\n'
+                "}\n"
+            )
+
+    def _submit_and_wait(self, scheduler, steam_mgr, install_dir, validate=False):
+        job_id = scheduler.submit(
+            steam_mgr,
+            TEST_STEAM_ID,
+            install_dir,
+            "anonymous",
+            None,
+            GameActionTypes.UPDATING.value,
+            validate=validate,
+        )["job_id"]
+
+        assert scheduler.wait_for_job(job_id, 10)
+
+        DATABASE.session.expire_all()
+        return DATABASE.session.get(InstallJobs, job_id)
+
+    def test_update_skipped_when_build_is_current(self, fake_app, steamcmd_api):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=8)
+        fake_steam_mgr = FakeSteamManager()
+        fake_steam_mgr.release_event.set()
+
+        # Only the manifest check of the real SteamManager is needed, not steamcmd.
+        steam_mgr = SteamManager.__new__(SteamManager)
+        steam_mgr._update_mgr = SteamUpdateManager(
+            base_format_url=steamcmd_api.base_format_url, cache=SteamAppInfoCache()
+        )
+        steam_mgr._install_gamefiles = fake_steam_mgr._install_gamefiles
+
+        with fake_app.app_context(), tempfile.TemporaryDirectory() as install_dir:
+            try:
+                self._write_app_manifest(install_dir, 200)
+                steamcmd_api.set_build_id(TEST_STEAM_ID, 200)
+
+                job_obj = self._submit_and_wait(scheduler, steam_mgr, install_dir)
+                assert job_obj.state == InstallJobStates.SKIPPED.value
+                assert not job_obj.validate
+                assert fake_steam_mgr.num_runs == 0
+
+                # Validating on request always runs steamcmd.
+                job_obj = self._submit_and_wait(
+                    scheduler, steam_mgr, install_dir, validate=True
+                )
+                assert job_obj.state == InstallJobStates.SUCCEEDED.value
+                assert job_obj.validate
+                assert fake_steam_mgr.num_runs == 1
+
+                steam_mgr._update_mgr._cache.clear()
+                steamcmd_api.set_build_id(TEST_STEAM_ID, 201)
+
+                job_obj = self._submit_and_wait(scheduler, steam_mgr, install_dir)
+                assert job_obj.state == InstallJobStates.SUCCEEDED.value
+                assert fake_steam_mgr.num_runs == 2
+            finally:
+                scheduler.stop()
+                for worker in scheduler._workers:
+                    worker.join(timeout=10)
+                self._delete_jobs()
+
+    def test_validate_is_due_on_schedule(self, fake_app):
+        scheduler = self._get_scheduler(fake_app, num_workers=1, queue_size=8)
+        scheduler.stop()
+
+        job = _Job(1, None, TEST_STEAM_ID, "/tmp/validate", "u", None, "x", False)
+        interval = timedelta(days=fake_app.config["INSTALL_JOB_VALIDATE_INTERVAL_DAYS"])
+
+        def add_job(created_at, validate):
+            job_obj = InstallJobs()
+            job_obj.steam_id = TEST_STEAM_ID
+            job_obj.install_dir = job.install_dir
+            job_obj.activity = GameActionTypes.UPDATING.value
+            job_obj.state = InstallJobStates.SUCCEEDED.value
+            job_obj.validate = validate
+            job_obj.created_at = created_at
+            job_obj.finished_at = created_at
+            DATABASE.session.add(job_obj)
+            DATABASE.session.commit()
+
+        with fake_app.app_context():
+            try:
+                # A game the agent has not managed for a whole interval yet.
+                assert not scheduler._is_validate_due(job)
+                add_job(datetime.utcnow(), validate=False)
+                assert not scheduler._is_validate_due(job)
+
+                # Managed for longer than the interval, and never validated.
+                add_job(datetime.utcnow() - interval * 2, validate=False)
+                assert scheduler._is_validate_due(job)
+
+                add_job(datetime.utcnow(), validate=True)
+                assert not scheduler._is_validate_due(job)
+            finally:
+                self._delete_jobs()
@@ -0,0 +1,191 @@
+from datetime import datetime, timedelta
+
+from application.extensions import DATABASE
+from application.models.actions import Actions
+from application.models.games import Games
+
+TEST_STEAM_ID = 999200000
+NUM_ACTIONS = 23
+PER_PAGE = 5
+ENDPOINT = "game.get_all_games"
+
+
+class TestPagination:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _create_game(self) -> int:
+        new_game = Games()
+        new_game.game_steam_id = TEST_STEAM_ID
+        new_game.game_install_dir = "/tmp/pagination_test_game"
+        new_game.game_name = "pagination_test_game"
+        new_game.game_pretty_name = "Pagination Test Game"
+        DATABASE.session.add(new_game)
+        DATABASE.session.flush()
+
+        start = datetime(2024, 1, 1)
+
+        for index in range(NUM_ACTIONS):
+            new_action = Actions()
+            new_action.game_id = new_game.game_id
+            new_action.type = "starting"
+            # Pairs of actions share a timestamp, the primary key breaks the tie.
+            new_action.timestamp = start + timedelta(minutes=index // 2)
+            DATABASE.session.add(new_action)
+
+        DATABASE.session.commit()
+        return new_game.game_id
+
+    def _delete_game(self, game_id: int) -> None:
+        Actions.query.filter_by(game_id=game_id).delete()
+        Games.query.filter_by(game_id=game_id).delete()
+        DATABASE.session.commit()
+
+    def _get_page(self, fake_app, query, query_string: str, **kwargs) -> dict:
+        with fake_app.test_request_context(f"/v1/games?{query_string}"):
+            return Actions.to_collection_dict(query, 1, PER_PAGE, ENDPOINT, **kwargs)
+
+    def _walk(self, fake_app, query, cursor_arg: str, **kwargs) -> list:
+        pages = []
+        page = self._get_page(fake_app, query, "", **kwargs)
+        pages.append(page)
+
+        while page["_meta"]["next_cursor"]:
+            page = self._get_page(
+                fake_app,
+                query,
+                f"{cursor_arg}={page['_meta']['next_cursor']}",
+                **kwargs,
+            )
+            pages.append(page)
+
+        return pages
+
+    def test_offset_links(self, fake_app):
+        with fake_app.app_context():
+            game_id = self._create_game()
+
+            try:
+                query = Actions.query.filter_by(game_id=game_id)
+
+                with fake_app.test_request_context("/v1/games?page=2"):
+                    page = Actions.to_collection_dict(query, 2, PER_PAGE, ENDPOINT)
+
+                assert len(page["items"]) == PER_PAGE
+                assert page["_meta"]["total_items"] == NUM_ACTIONS
+                assert page["_meta"]["total_pages"] == 5
+                assert f"per_page={PER_PAGE}" in page["_links"]["next"]
+                assert "page=1" in page["_links"]["prev"]
+
+                with fake_app.test_request_context("/v1/games?page=5"):
+                    page = Actions.to_collection_dict(query, 5, PER_PAGE, ENDPOINT)
+
+                assert len(page["items"]) == 3
+                assert page["_links"]["next"] is None
+            finally:
+                self._delete_game(game_id)
+
+    def test_keyset_matches_offset(self, fake_app):
+        with fake_app.app_context():
+            game_id = self._create_game()
+
+            try:
+                query = Actions.query.filter_by(game_id=game_id).order_by(
+                    Actions.action_id
+                )
+                expected = [action.action_id for action in query.all()]
+
+                pages = self._walk(fake_app, query, "after")
+                action_ids = [
+                    item["action_id"] for page in pages for item in page["items"]
+                ]
+
+                assert action_ids == expected
+                assert pages[-1]["_links"]["next"] is None
+                assert pages[1]["_meta"]["page"] is None
+            finally:
+                self._delete_game(game_id)
+
+    def test_keyset_by_timestamp(self, fake_app):
+        with fake_app.app_context():
+            game_id = self._create_game()
+
+            try:
+                query = Actions.query.filter_by(game_id=game_id).order_by(
+                    Actions.timestamp.desc(), Actions.action_id.desc()
+                )
+                expected = [action.action_id for action in query.all()]
+
+                kwargs = {"cursor_column": Actions.timestamp, "descending": True}
+                pages = self._walk(fake_app, query, "after", **kwargs)
+                action_ids = [
+                    item["action_id"] for page in pages for item in page["items"]
+                ]
+
+                assert action_ids == expected
+
+                # Walk back from the last page with the before cursor.
+                prev_cursor = pages[-1]["_meta"]["prev_cursor"]
+                page = self._get_page(
+                    fake_app, query, f"before={prev_cursor}", **kwargs
+                )
+
+                assert page["items"] == pages[-2]["items"]
+            finally:
+                self._delete_game(game_id)
+
+    def test_offset_cursor_needs_cursor_order(self, fake_app):
+        with fake_app.app_context():
+            game_id = self._create_game()
+
+            try:
+                query = Actions.query.filter_by(game_id=game_id)
+                by_timestamp = query.order_by(Actions.timestamp.desc())
+
+                # Only a page in the order of the cursor columns has cursors.
+                page = self._get_page(fake_app, query.order_by(Actions.action_id), "")
+                assert page["_meta"]["next_cursor"]
+
+                for other_query in [query, by_timestamp]:
+                    page = self._get_page(fake_app, other_query, "")
+                    assert page["_meta"]["next_cursor"] is None
+                    assert page["_links"]["next"] is not None
+
+                page = self._get_page(
+                    fake_app,
+                    by_timestamp,
+                    "",
+                    cursor_column=Actions.timestamp,
+                    descending=True,
+                )
+                assert page["_meta"]["next_cursor"] is None
+
+                page = self._get_page(
+                    fake_app,
+                    by_timestamp.order_by(Actions.action_id.desc()),
+                    "",
+                    cursor_column=Actions.timestamp,
+                    descending=True,
+                )
+                assert page["_meta"]["next_cursor"]
+            finally:
+                self._delete_game(game_id)
+
+    def test_without_total(self, fake_app):
+        with fake_app.app_context():
+            game_id = self._create_game()
+
+            try:
+                query = Actions.query.filter_by(game_id=game_id)
+                page = self._get_page(fake_app, query, "with_total=0")
+
+                assert page["_meta"]["total_items"] is None
+                assert page["_meta"]["total_pages"] is None
+                assert "with_total=0" in page["_links"]["next"]
+            finally:
+                self._delete_game(game_id)
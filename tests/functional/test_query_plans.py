@@ -0,0 +1,73 @@
+from sqlalchemy import desc, text
+
+from application.extensions import DATABASE
+from application.models.actions import Actions
+from application.models.game_arguments import GameArguments
+from application.models.games import Games
+from application.models.tokens import Tokens
+
+
+class TestQueryPlans:
+    """Hot lookups must be served by an index, not a full table scan."""
+
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _get_query_plan(self, query) -> list:
+        statement = query.statement.compile(
+            dialect=DATABASE.engine.dialect, compile_kwargs={"literal_binds": True}
+        )
+        rows = DATABASE.session.execute(text(f"EXPLAIN QUERY PLAN {statement}"))
+        return [row[-1] for row in rows]
+
+    def _assert_uses_index(self, query, index_name: str) -> list:
+        plan = self._get_query_plan(query)
+
+        assert any(index_name in detail for detail in plan), plan
+        assert not any(detail.startswith("SCAN") for detail in plan), plan
+
+        return plan
+
+    def test_games_by_name(self, fake_app):
+        with fake_app.app_context():
+            query = Games.query.filter_by(game_name="valheim")
+            self._assert_uses_index(query, "ix_games_game_name")
+
+    def test_action_history(self, fake_app):
+        with fake_app.app_context():
+            query = Actions.query.filter_by(game_id=1).order_by(
+                desc(Actions.timestamp), desc(Actions.action_id)
+            )
+            plan = self._assert_uses_index(query, "ix_actions_game_id_timestamp")
+
+            # The index also provides the order, no sorting step.
+            assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+    def _get_unique_index_name(self, table_name: str, column_name: str) -> str:
+        # SQLite names the indexes of unique constraints itself, e.g. sqlite_autoindex_tokens_1.
+        for index in DATABASE.session.execute(text(f"PRAGMA index_list({table_name})")):
+            columns = DATABASE.session.execute(text(f"PRAGMA index_info({index[1]})"))
+
+            if index[2] and [column[2] for column in columns] == [column_name]:
+                return index[1]
+
+        return None
+
+    def test_token_lookup(self, fake_app):
+        with fake_app.app_context():
+            index_name = self._get_unique_index_name("tokens", "token_value")
+            assert index_name is not None
+
+            # The unique index on the token value is enough, there is no composite index.
+            query = Tokens.query.filter_by(token_active=True, token_value="token")
+            self._assert_uses_index(query, f"USING INDEX {index_name} ")
+
+    def test_game_argument_by_name(self, fake_app):
+        with fake_app.app_context():
+            query = GameArguments.query.filter_by(game_id=1, game_arg="-port")
+            self._assert_uses_index(query, "ix_game_arguments_game_id_game_arg")
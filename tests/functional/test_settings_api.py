@@ -1,7 +1,14 @@
 import os
 
+from sqlalchemy import event
+
+from application.common import constants
+from application.common.settings_cache import SETTINGS_CACHE
+from application.extensions import DATABASE
 from application.models.settings import Settings
 
+TEST_SETTING_NAME = "settings_cache_test"
+
 
 class TestAppSettingsApi:
     @classmethod
@@ -12,5 +19,121 @@ class TestAppSettingsApi:
     def teardown_class(cls):
         pass
 
+    def _delete_test_setting(self) -> None:
+        Settings.query.filter_by(setting_name=TEST_SETTING_NAME).delete()
+        DATABASE.session.commit()
+        SETTINGS_CACHE.reload()
+
     def test_create(self, fake_app):
         pass
+
+    def test_cached_reads(self, fake_app):
+        statements = []
+
+        def _before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        with fake_app.app_context():
+            SETTINGS_CACHE.reload()
+
+            event.listen(
+                DATABASE.engine, "before_cursor_execute", _before_cursor_execute
+            )
+
+            try:
+                for _ in range(10):
+                    assert SETTINGS_CACHE.get(constants.SETTING_NAME_APP_SECRET)
+            finally:
+                event.remove(
+                    DATABASE.engine, "before_cursor_execute", _before_cursor_execute
+                )
+
+        assert len(statements) == 0
+
+    def test_writes_update_cache(self, fake_app):
+        client = fake_app.test_client()
+
+        with fake_app.app_context():
+            try:
+                version = SETTINGS_CACHE.get_all(verify=True)[
+                    constants.SETTING_NAME_SETTINGS_VERSION
+                ]
+
+                response = client.post(
+                    "/v1/settings",
+                    json={"setting_name": TEST_SETTING_NAME, "setting_value": "one"},
+                )
+                assert response.status_code == 200
+                assert SETTINGS_CACHE.get(TEST_SETTING_NAME) == "one"
+
+                response = client.patch(
+                    f"/v1/settings/name/{TEST_SETTING_NAME}",
+                    json={"setting_name": TEST_SETTING_NAME, "setting_value": "two"},
+                )
+                assert response.status_code == 200
+                assert SETTINGS_CACHE.get(TEST_SETTING_NAME) == "two"
+                assert SETTINGS_CACHE.version == int(version) + 2
+            finally:
+                self._delete_test_setting()
+
+    def test_delete_updates_cache(self, fake_app):
+        client = fake_app.test_client()
+
+        with fake_app.app_context():
+            try:
+                response = client.post(
+                    "/v1/settings",
+                    json={"setting_name": TEST_SETTING_NAME, "setting_value": "one"},
+                )
+                setting_id = response.json["setting_id"]
+                version = SETTINGS_CACHE.version
+
+                response = client.delete(f"/v1/settings/{setting_id}")
+                assert response.status_code == 204
+                assert SETTINGS_CACHE.get(TEST_SETTING_NAME) is None
+                assert SETTINGS_CACHE.version == version + 1
+            finally:
+                self._delete_test_setting()
+
+    def test_settings_version_is_protected(self, fake_app):
+        client = fake_app.test_client()
+        version_name = constants.SETTING_NAME_SETTINGS_VERSION
+
+        with fake_app.app_context():
+            version_obj = Settings.query.filter_by(setting_name=version_name).first()
+            version = version_obj.setting_value
+
+            response = client.get("/v1/settings?per_page=10000")
+            names = [item["setting_name"] for item in response.json["items"]]
+            assert version_name not in names
+
+            response = client.patch(
+                f"/v1/settings/name/{version_name}",
+                json={"setting_name": version_name, "setting_value": "0"},
+            )
+            assert response.status_code != 200
+
+            response = client.delete(f"/v1/settings/{version_obj.setting_id}")
+            assert response.status_code != 204
+
+            DATABASE.session.expire_all()
+            assert Settings.query.filter_by(setting_name=version_name).count() == 1
+            assert SETTINGS_CACHE.get(version_name, verify=True) == version
+
+    def test_stale_copy_is_detected(self, fake_app):
+        with fake_app.app_context():
+            try:
+                SETTINGS_CACHE.reload()
+
+                # Another process writes a setting and bumps the version.
+                new_setting = Settings()
+                new_setting.setting_name = TEST_SETTING_NAME
+                new_setting.setting_value = os.name
+                DATABASE.session.add(new_setting)
+                SETTINGS_CACHE.bump_version()
+                DATABASE.session.commit()
+
+                assert SETTINGS_CACHE.get(TEST_SETTING_NAME) is None
+                assert SETTINGS_CACHE.get(TEST_SETTING_NAME, verify=True) == os.name
+            finally:
+                self._delete_test_setting()
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+
+from application.common.sqlite_profile import get_sqlite_pragmas
+from application.extensions import DATABASE
+
+
+class TestSqliteProfile:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _pragma(self, name: str):
+        return DATABASE.session.execute(text(f"PRAGMA {name}")).scalar()
+
+    def test_profile_applied(self, fake_app):
+        with fake_app.app_context():
+            assert self._pragma("journal_mode") == "wal"
+            assert self._pragma("synchronous") == 1  # NORMAL
+            assert (
+                self._pragma("busy_timeout")
+                == fake_app.config["SQLITE_BUSY_TIMEOUT_MS"]
+            )
+            assert (
+                self._pragma("cache_size") == -fake_app.config["SQLITE_CACHE_SIZE_KB"]
+            )
+
+    def test_pragmas_from_environment_strings(self, fake_app):
+        config = dict(fake_app.config)
+        config["SQLITE_BUSY_TIMEOUT_MS"] = "250"
+
+        assert "PRAGMA busy_timeout=250" in get_sqlite_pragmas(config)
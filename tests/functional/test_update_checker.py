@@ -0,0 +1,123 @@
+from application.extensions import DATABASE
+from application.managers.steam_manager import SteamAppInfoCache, SteamUpdateManager
+from application.managers.update_checker import UpdateChecker
+from application.models.games import Games
+from application.models.steam_build_checks import SteamBuildChecks
+
+TEST_STEAM_ID = 999500000
+
+
+class TestUpdateChecker:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _get_checker(self, steamcmd_api) -> UpdateChecker:
+        return UpdateChecker(
+            SteamUpdateManager(
+                base_format_url=steamcmd_api.base_format_url, cache=SteamAppInfoCache()
+            )
+        )
+
+    def _get_failing_checker(self) -> UpdateChecker:
+        # Nothing listens on port 1.
+        return UpdateChecker(
+            SteamUpdateManager(
+                base_format_url="http://127.0.0.1:1/v1/info/{STEAM_ID}",
+                cache=SteamAppInfoCache(),
+            )
+        )
+
+    def _get_game_dict(self, build_id: int) -> dict:
+        return {
+            "game_steam_id": TEST_STEAM_ID,
+            "game_steam_build_id": build_id,
+            "game_steam_build_branch": "public",
+        }
+
+    def _delete_checks(self) -> None:
+        SteamBuildChecks.query.filter_by(steam_id=TEST_STEAM_ID).delete()
+        Games.query.filter_by(game_steam_id=TEST_STEAM_ID).delete()
+        DATABASE.session.commit()
+
+    def test_run_once_stores_build_ids(self, fake_app, steamcmd_api):
+        steamcmd_api.set_build_id(TEST_STEAM_ID, 200)
+        checker = self._get_checker(steamcmd_api)
+
+        with fake_app.app_context():
+            new_game = Games()
+            new_game.game_steam_id = TEST_STEAM_ID
+            new_game.game_install_dir = "/tmp/update_checker_test"
+            new_game.game_name = "update_checker_test"
+            new_game.game_pretty_name = "Update Checker Test"
+            DATABASE.session.add(new_game)
+            DATABASE.session.commit()
+
+            try:
+                checker.run_once()
+
+                check = SteamBuildChecks.query.filter_by(steam_id=TEST_STEAM_ID).one()
+                assert check.published_build_id == 200
+                assert check.error is None
+
+                # Reading the result does not go upstream.
+                num_requests = steamcmd_api.num_requests
+                update_dict = checker.get_update_dicts([self._get_game_dict(150)])[0]
+                assert update_dict["is_required"]
+                assert update_dict["target_version"] == 200
+                assert steamcmd_api.num_requests == num_requests
+            finally:
+                self._delete_checks()
+
+    def test_failed_check_keeps_last_build_id(self, fake_app, steamcmd_api):
+        steamcmd_api.set_build_id(TEST_STEAM_ID, 200)
+        checker = self._get_checker(steamcmd_api)
+
+        with fake_app.app_context():
+            try:
+                checker._check({(TEST_STEAM_ID, "public")})
+
+                update_dict = checker.get_update_dicts([self._get_game_dict(200)])[0]
+                assert not update_dict["is_required"]
+
+                checker = self._get_failing_checker()
+                checker._check({(TEST_STEAM_ID, "public")})
+
+                update_dict = checker.get_update_dicts([self._get_game_dict(200)])[0]
+                assert update_dict["target_version"] == 200
+                assert update_dict["check_error"] == UpdateChecker.ERROR_MESSAGE
+            finally:
+                self._delete_checks()
+
+    def test_unchecked_game_does_not_wait(self, fake_app, steamcmd_api):
+        steamcmd_api.set_build_id(TEST_STEAM_ID, 200)
+        checker = self._get_checker(steamcmd_api)
+
+        with fake_app.app_context():
+            try:
+                # Never checked before, so the background job is asked to check it.
+                num_requests = steamcmd_api.num_requests
+                update_dict = checker.get_update_dicts([self._get_game_dict(200)])[0]
+
+                assert update_dict["is_pending"]
+                assert update_dict["is_required"] is None
+                assert checker._wakeup_event.is_set()
+                assert steamcmd_api.num_requests == num_requests
+
+                # Polling again does not wake the job again right away.
+                checker._wakeup_event.clear()
+                checker.get_update_dicts([self._get_game_dict(200)])
+                assert not checker._wakeup_event.is_set()
+
+                # A failed first check stores nothing.
+                self._get_failing_checker()._check({(TEST_STEAM_ID, "public")})
+                assert (
+                    SteamBuildChecks.query.filter_by(steam_id=TEST_STEAM_ID).count()
+                    == 0
+                )
+            finally:
+                self._delete_checks()
@@ -0,0 +1,81 @@
+"""
+Local stand-in for the api.steamcmd.net app info endpoint, so the Steam update checks can be
+tested and benchmarked without network access.
+"""
+import json
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class SteamcmdApiStub:
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        self.latency_seconds = latency_seconds
+        self.build_ids: dict = {}  # steam_id -> {branch: build_id}
+        self.num_requests = 0
+        self.num_not_modified = 0
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, args=(0.05,), daemon=True
+        )
+
+    @property
+    def base_format_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}/v1/info/{{STEAM_ID}}"
+
+    def set_build_id(self, steam_id, build_id: int, branch: str = "public") -> None:
+        self.build_ids.setdefault(str(steam_id), {})[branch] = build_id
+
+    def start(self) -> "SteamcmdApiStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _get_body(self, steam_id: str) -> bytes:
+        branches = {
+            branch: {"buildid": str(build_id)}
+            for branch, build_id in self.build_ids.get(steam_id, {}).items()
+        }
+        data = {steam_id: {"depots": {"branches": branches}}}
+        return json.dumps({"status": "success", "data": data}).encode("utf-8")
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                stub.num_requests += 1
+
+                if stub.latency_seconds:
+                    time.sleep(stub.latency_seconds)
+
+                steam_id = self.path.rstrip("/").split("/")[-1]
+                body = stub._get_body(steam_id)
+                etag = f'"{hash(body)}"'
+
+                if self.headers.get("If-None-Match", None) == etag:
+                    stub.num_not_modified += 1
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
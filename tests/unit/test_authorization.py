@@ -1,4 +1,7 @@
+import time
+
 from application.common import authorization
+from application.common.token_cache import TOKEN_CACHE, TokenCache
 
 
 class FakeRequest:
@@ -23,7 +26,10 @@ class TestAuthorization:
 
     @classmethod
     def teardown_class(cls):
-        pass
+        TOKEN_CACHE.clear()
+
+    def setup_method(self):
+        TOKEN_CACHE.clear()
 
     def test_verify_bearer_token(self, mocker):
         # Arrange
@@ -43,3 +49,44 @@ class TestAuthorization:
         return_code = authorization._verify_bearer_token(fake_request)
 
         assert return_code == 200
+
+    def test_verify_bearer_token_cached(self, mocker):
+        fake_request = FakeRequest(headers={"Authorization": "Bearer 1234"})
+
+        get_token = mocker.patch(
+            "application.common.authorization._get_token", return_value=FakeToken()
+        )
+        mocker.patch(
+            "application.common.authorization._get_setting",
+            return_value=FakeSetting(),
+        )
+        decode = mocker.patch("jwt.decode", return_value={"token_name": "foo"})
+
+        assert authorization._verify_bearer_token(fake_request) == 200
+        assert authorization._verify_bearer_token(fake_request) == 200
+
+        assert get_token.call_count == 1
+        assert decode.call_count == 1
+
+        # Once invalidated, the token goes through the full check again.
+        TOKEN_CACHE.invalidate("foo")
+        get_token.return_value = None
+
+        assert authorization._verify_bearer_token(fake_request) == 403
+        assert get_token.call_count == 2
+
+    def test_token_cache_ttl_and_size(self, mocker):
+        cache = TokenCache(ttl_seconds=60, max_size=2)
+
+        cache.put("token_a", "a")
+        cache.put("token_b", "b")
+        assert cache.get("token_a") == "a"
+
+        # token_b is now the least recently used.
+        cache.put("token_c", "c")
+        assert cache.get("token_b") is None
+        assert cache.get("token_a") == "a"
+        assert cache.get("token_c") == "c"
+
+        mocker.patch("time.monotonic", return_value=time.monotonic() + 61)
+        assert cache.get("token_a") is None
@@ -1,3 +1,10 @@
+import os
+import pytest
+
+from application.common.game_argument import GameArgumentSpec, GameArgument
+from application.common.game_registry import GAME_REGISTRY
+
+
 class TestGameFramework:
     @classmethod
     def setup_class(cls):
@@ -7,5 +14,68 @@ class TestGameFramework:
     def teardown_class(cls):
         pass
 
-    def test_xyz(self):
-        pass
+    def test_argument_schema_is_read_only(self):
+        spec = GameArgumentSpec("-port", value=1234)
+
+        with pytest.raises(AttributeError):
+            spec.value = 5678
+
+        assert not hasattr(spec, "__dict__")
+        assert not hasattr(GameArgument("-port"), "__dict__")
+
+    def test_argument_schema_is_shared(self):
+        game_1 = GAME_REGISTRY.get_game_object("valheim")
+        game_2 = GAME_REGISTRY.get_game_object("valheim")
+
+        assert not hasattr(game_1, "__dict__")
+        assert game_1._game_argument_schema is game_2._game_argument_schema
+
+        game_1._update_argument("-port", 1234)
+
+        assert game_1._get_argument_dict()["-port"]._value == 1234
+        assert game_2._get_argument_dict()["-port"]._value == 2456
+        assert list(game_2._game_args_overlay.keys()) == []
+
+    def test_default_paths(self):
+        install_dir = os.path.join("C:", "AgentSmith")
+
+        game_obj = GAME_REGISTRY.get_game_object(
+            "valheim", {"default_install_dir": install_dir}
+        )
+        args = game_obj._get_argument_dict()
+
+        assert args["-savedir"]._value == os.path.join(
+            install_dir, "games", "valheim", "saves"
+        )
+        assert args["-logFile"]._value == os.path.join(
+            install_dir, "games", "valheim", "logs", "valheim.txt"
+        )
+
+        game_obj = GAME_REGISTRY.get_game_object("valheim")
+
+        assert game_obj._get_argument_dict()["-savedir"]._value is None
+
+    def test_reset_arguments(self):
+        game_obj = GAME_REGISTRY.get_game_object("valheim")
+
+        game_obj._reset_arguments()
+        game_obj._add_argument(GameArgument("-port", value=1234))
+
+        assert game_obj._get_argument_list() == ["-port"]
+
+    def test_default_arguments_are_cached(self):
+        game_1 = GAME_REGISTRY.get_game_object("valheim")
+        game_2 = GAME_REGISTRY.get_game_object("valheim")
+
+        # The defaults are built once per game class, not on every call.
+        assert (
+            game_1._get_argument_dict()["-port"] is game_2._get_argument_dict()["-port"]
+        )
+
+        game_1._update_argument("-port", 1234)
+
+        assert game_1._get_argument_dict()["-port"]._value == 1234
+        assert game_2._get_argument_dict()["-port"]._value == 2456
+        assert (
+            game_1._get_argument_dict()["-name"] is game_2._get_argument_dict()["-name"]
+        )
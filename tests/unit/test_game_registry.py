@@ -0,0 +1,61 @@
+from application.common.game_registry import GameRegistry
+
+
+class TestGameRegistry:
+    @classmethod
+    def setup_class(cls):
+        cls.registry = GameRegistry()
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_get_game_object(self):
+        game_obj = self.registry.get_game_object("valheim")
+
+        assert game_obj._game_name == "valheim"
+        assert game_obj._game_executable == "valheim_server.exe"
+
+    def test_get_game_object_by_steam_id(self):
+        by_str = self.registry.get_game_object_by_steam_id("896660")
+        by_int = self.registry.get_game_object_by_steam_id(896660)
+
+        assert by_str._game_name == "valheim"
+        assert by_int._game_name == "valheim"
+
+    def test_unsupported_game(self):
+        assert self.registry.get_game_object("not_a_game") is None
+        assert self.registry.get_game_object_by_steam_id(1) is None
+
+    def test_objects_are_not_shared(self):
+        game_obj_1 = self.registry.get_game_object("valheim")
+        game_obj_2 = self.registry.get_game_object("valheim")
+
+        game_obj_1._update_argument("-port", 1234)
+
+        assert game_obj_1 is not game_obj_2
+        assert game_obj_2._get_argument_dict()["-port"]._value == 2456
+
+    def test_all_games_loaded(self):
+        game_names = self.registry.get_game_names()
+
+        assert len(self.registry.get_all_game_objects()) == len(game_names)
+        for game_name in ["ark", "palworld", "satisfactory", "valheim", "vrising"]:
+            assert game_name in game_names
+
+    def test_manifest_is_up_to_date(self):
+        # If this fails, regenerate the manifest with: python game_manifest.py
+        assert self.registry._read_manifest() == GameRegistry().build_manifest()
+
+    def test_lazy_plugin_import(self):
+        registry = GameRegistry()
+
+        game_info = registry.get_game_info_by_steam_id(896660)
+
+        assert game_info["name"] == "valheim"
+        assert game_info["executable"] == "valheim_server.exe"
+        assert len(registry._game_classes) == 0
+
+        registry.get_game_object("valheim")
+
+        assert list(registry._game_classes.keys()) == ["valheim"]
@@ -0,0 +1,100 @@
+import subprocess
+import sys
+
+from application.managers.install_progress import (
+    InstallProgress,
+    InstallProgressRegistry,
+)
+from application.managers.steam_manager import SteamManager
+
+FAKE_STEAMCMD = """
+import sys
+for index in range(1, 5):
+    sys.stdout.write(
+        f" Update state (0x61) downloading, progress: {index * 25}.00 ({index * 100} / 400)\\r"
+    )
+    sys.stdout.flush()
+sys.stdout.write("\\nSuccess! App '1234' fully installed.\\n")
+sys.stderr.write("some warning\\n")
+"""
+
+
+class TestInstallProgress:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_parse_line(self):
+        line = " Update state (0x5) verifying install, progress: 12.34 (1234 / 10000)"
+        progress = InstallProgress.parse_line(line)
+
+        assert progress == {
+            "state": "verifying install",
+            "state_code": "0x5",
+            "bytes_downloaded": 1234,
+            "total_bytes": 10000,
+            "percent": 12.34,
+        }
+        assert InstallProgress.parse_line("Loading Steam API...OK") is None
+
+    def test_ring_buffer_is_bounded(self):
+        progress = InstallProgress("1234", max_lines=10)
+
+        for index in range(1000):
+            progress.feed_line(
+                f"Update state (0x61) downloading, progress: 1.00 ({index} / 1000)"
+            )
+
+        assert progress.num_lines == 1000
+        assert len(progress.get_lines()) == 10
+        assert progress.bytes_downloaded == 999
+        assert progress.get_lines()[-1].endswith("(999 / 1000)")
+
+    def test_failure(self):
+        progress = InstallProgress("1234")
+        progress.feed_line("Error! App '1234' state is 0x202 after update job.")
+        progress.finish(8)
+
+        assert progress.is_finished
+        assert not progress.is_successful
+        assert progress.to_dict()["state"] == "failed"
+
+    def test_stream_output(self):
+        progress = InstallProgress("1234")
+        process = subprocess.Popen(
+            [sys.executable, "-c", FAKE_STEAMCMD],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+        )
+
+        return_code = SteamManager._stream_output(process, progress)
+        progress_dict = progress.to_dict()
+
+        assert return_code == 0
+        assert progress_dict["is_finished"]
+        assert progress_dict["is_successful"]
+        assert progress_dict["bytes_downloaded"] == 400
+        assert progress_dict["total_bytes"] == 400
+        assert progress_dict["num_lines"] == 6
+        assert "some warning" in progress_dict["lines"]
+
+    def test_registry_evicts_finished_jobs_first(self):
+        registry = InstallProgressRegistry(max_jobs=2)
+
+        running = InstallProgress("1")
+        finished = InstallProgress("2")
+        finished.finish(0)
+
+        registry.register(1, running)
+        registry.register(2, finished)
+        registry.register(3, InstallProgress("3"))
+
+        assert registry.get(1) is running
+        assert registry.get(2) is None
+        assert registry.get(3).job_id == 3
@@ -0,0 +1,41 @@
+import json
+
+from datetime import datetime
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from application.common.json_provider import OrjsonProvider
+
+
+class TestOrjsonProvider:
+    @classmethod
+    def setup_class(cls):
+        cls.app = Flask(__name__)
+        cls.provider = OrjsonProvider(cls.app)
+        cls.default_provider = DefaultJSONProvider(cls.app)
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_matches_default_provider(self):
+        data = {
+            "items": [
+                {"game_id": 1, "timestamp": datetime(2024, 1, 2, 3, 4, 5)},
+                {"game_id": 2, "result": None, "active": True, "value": 1.5},
+            ],
+            "_meta": {"page": 1, "per_page": 10},
+        }
+
+        dumped = self.provider.dumps(data)
+
+        assert json.loads(dumped) == json.loads(self.default_provider.dumps(data))
+        assert "Tue, 02 Jan 2024 03:04:05 GMT" in dumped
+
+    def test_response(self):
+        with self.app.app_context():
+            response = self.provider.response({"b": 1, "a": [1, 2]})
+
+        assert response.mimetype == "application/json"
+        assert response.get_data(as_text=True) == '{"a":[1,2],"b":1}\n'
+        assert self.provider.loads(response.get_data()) == {"a": [1, 2], "b": 1}
@@ -0,0 +1,295 @@
+import os
+import psutil
+import subprocess
+import sys
+import time
+
+from application.common import toolbox
+from application.common.process_index import ProcessIndex
+
+
+class FakeProcess:
+    def __init__(self, pid, name, running=True, exe=None):
+        self.pid = pid
+        self.info = {"pid": pid, "name": name, "create_time": 1.0, "exe": exe}
+        self._running = running
+
+    def is_running(self):
+        return self._running
+
+
+class TestProcessIndex:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_single_scan_for_many_lookups(self, mocker):
+        fake_procs = [
+            FakeProcess(1, "valheim_server.exe"),
+            FakeProcess(2, "nginx.exe"),
+            FakeProcess(3, "nginx.exe"),
+            FakeProcess(4, " "),
+        ]
+        process_iter = mocker.patch("psutil.process_iter", return_value=fake_procs)
+        index = ProcessIndex()
+
+        assert index.get_process("valheim_server.exe").pid == 1
+        assert len(index.get_processes("nginx.exe")) == 2
+        assert index.get_process(" ") is None
+        assert index.get_process("PalServer.exe") is None
+        assert process_iter.call_count == 1
+
+        index.get_process("nginx.exe", refresh=True)
+
+        assert process_iter.call_count == 2
+
+    def test_exited_processes_are_skipped(self, mocker):
+        fake_procs = [
+            FakeProcess(1, "nginx.exe", running=False),
+            FakeProcess(2, "nginx.exe"),
+        ]
+        mocker.patch("psutil.process_iter", return_value=fake_procs)
+        index = ProcessIndex()
+
+        assert index.get_process("nginx.exe").pid == 2
+
+    def test_ttl_expiry(self, mocker):
+        process_iter = mocker.patch("psutil.process_iter", return_value=[])
+        index = ProcessIndex(ttl_seconds=0)
+
+        index.get_process("nginx.exe")
+        index.get_process("nginx.exe")
+
+        assert process_iter.call_count == 2
+
+
+class TestPidLookup:
+    @classmethod
+    def setup_class(cls):
+        cls.process = psutil.Process(os.getpid())
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_pid_matches(self):
+        process = toolbox._get_proc_by_pid(
+            self.process.pid, self.process.create_time(), self.process.name()
+        )
+
+        assert process.pid == self.process.pid
+
+    def test_reused_pid_is_rejected(self):
+        create_time = self.process.create_time() - 60.0
+
+        assert toolbox._get_proc_by_pid(self.process.pid, create_time) is None
+        assert (
+            toolbox._get_proc_by_pid(self.process.pid, None, "not_a_game.exe") is None
+        )
+
+    def test_stale_pid_falls_back_to_name(self, mocker):
+        other_server = FakeProcess(
+            11, "valheim_server.exe", exe="/other/valheim/valheim_server.exe"
+        )
+        own_server = FakeProcess(
+            12, "valheim_server.exe", exe="/games/valheim/valheim_server.exe"
+        )
+        get_processes = mocker.patch(
+            "application.common.toolbox.PROCESS_INDEX.get_processes",
+            return_value=[other_server, own_server],
+        )
+
+        # Only a process running from the game's install directory is returned.
+        process = toolbox._get_game_proc(
+            None, None, "valheim_server.exe", "/games/valheim"
+        )
+        assert process is own_server
+        get_processes.assert_called_once_with("valheim_server.exe")
+
+        process = toolbox._get_game_proc(
+            None, None, "valheim_server.exe", "/games/valheim_2"
+        )
+        assert process is None
+
+    def test_live_pid_skips_name_scan(self, mocker):
+        get_processes = mocker.patch(
+            "application.common.toolbox.PROCESS_INDEX.get_processes"
+        )
+
+        process = toolbox._get_game_proc(
+            self.process.pid,
+            self.process.create_time(),
+            self.process.name(),
+            "/games/valheim",
+        )
+
+        assert process.pid == self.process.pid
+        get_processes.assert_not_called()
+
+    def test_pid_update_dict(self):
+        assert toolbox._get_pid_update_dict(None) == {
+            "game_pid": None,
+            "game_pid_create_time": None,
+        }
+        assert toolbox._get_pid_update_dict(self.process) == {
+            "game_pid": self.process.pid,
+            "game_pid_create_time": self.process.create_time(),
+        }
+
+
+class TestGameProcessResolver:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_resolve_many_games(self, mocker):
+        live_proc = FakeProcess(10, "valheim_server.exe")
+        other_proc = FakeProcess(11, "valheim_server.exe")
+
+        mocker.patch(
+            "application.common.toolbox._get_proc_by_pid",
+            side_effect=lambda pid, *args: live_proc if pid == 10 else None,
+        )
+        pal_proc = FakeProcess(12, "PalServer.exe", exe="/games/palworld/PalServer.exe")
+        procs_by_name = {
+            "valheim_server.exe": [live_proc, other_proc],
+            "PalServer.exe": [pal_proc],
+        }
+        get_processes = mocker.patch(
+            "application.common.toolbox.PROCESS_INDEX.get_processes",
+            side_effect=lambda name: procs_by_name.get(name, []),
+        )
+
+        games = [
+            {"game_name": "valheim", "game_pid": 10, "game_pid_create_time": 1.0},
+            {
+                "game_name": "palworld",
+                "game_pid": 20,
+                "game_pid_create_time": 1.0,
+                "game_install_dir": "/games/palworld",
+            },
+            {"game_name": "vrising", "game_pid": None},
+        ]
+
+        game_procs = toolbox._get_game_procs(games)
+
+        # The stale PID falls back to the scan of its own executable.
+        assert game_procs["valheim"] is live_proc
+        assert game_procs["palworld"] is pal_proc
+        assert game_procs["vrising"] is None
+        assert get_processes.call_count == 2
+
+    def test_process_outside_install_dir_is_not_adopted(self, mocker):
+        other_server = FakeProcess(
+            11, "valheim_server.exe", exe="/other/valheim/valheim_server.exe"
+        )
+        unknown_exe = FakeProcess(12, "valheim_server.exe")
+        own_server = FakeProcess(
+            13, "valheim_server.exe", exe="/games/valheim/bin/valheim_server.exe"
+        )
+
+        mocker.patch("application.common.toolbox._get_proc_by_pid", return_value=None)
+        mocker.patch(
+            "application.common.toolbox.PROCESS_INDEX.get_processes",
+            return_value=[other_server, unknown_exe, own_server],
+        )
+        unknown_exe.exe = lambda: None
+
+        game = {
+            "game_name": "valheim",
+            "game_pid": 20,
+            "game_pid_create_time": 1.0,
+            "game_install_dir": "/games/valheim",
+        }
+
+        assert toolbox._get_game_procs([game])["valheim"] is own_server
+
+        game["game_install_dir"] = "/games/valheim_2"
+        assert toolbox._get_game_procs([game])["valheim"] is None
+
+    def test_process_is_never_claimed_twice(self, mocker):
+        live_proc = FakeProcess(
+            10, "valheim_server.exe", exe="/games/valheim/valheim_server.exe"
+        )
+
+        mocker.patch(
+            "application.common.toolbox._get_proc_by_pid",
+            side_effect=lambda pid, *args: live_proc if pid == 10 else None,
+        )
+        mocker.patch(
+            "application.common.toolbox.PROCESS_INDEX.get_processes",
+            side_effect=lambda name: [live_proc]
+            if name == "valheim_server.exe"
+            else [],
+        )
+        mocker.patch(
+            "application.common.toolbox._get_supported_game_info",
+            return_value={"executable": "valheim_server.exe"},
+        )
+
+        games = [
+            {"game_name": "valheim", "game_pid": 10, "game_pid_create_time": 1.0},
+            {
+                "game_name": "valheim_2",
+                "game_pid": 20,
+                "game_pid_create_time": 1.0,
+                "game_install_dir": "/games/valheim",
+            },
+        ]
+
+        game_procs = toolbox._get_game_procs(games)
+
+        assert game_procs["valheim"] is live_proc
+        assert game_procs["valheim_2"] is None
+
+    def test_game_server_statuses(self, mocker):
+        process = psutil.Process(os.getpid())
+        mocker.patch(
+            "application.common.toolbox._get_game_procs",
+            return_value={"valheim": process, "palworld": None},
+        )
+
+        statuses = toolbox._get_game_server_statuses(
+            [
+                {"game_name": "valheim", "game_pid": process.pid},
+                {"game_name": "palworld", "game_pid": None},
+            ]
+        )
+
+        assert statuses["valheim"]["game_status"] == "Running"
+        assert statuses["valheim"]["game_exe"] == "valheim_server.exe"
+        assert statuses["valheim"]["is_pid_alive"] is True
+        assert statuses["valheim"]["process_pid"] == process.pid
+        assert statuses["valheim"]["memory_usage"] is not None
+        assert statuses["palworld"]["game_status"] == "Not Running"
+        assert statuses["palworld"]["cpu_percent"] is None
+
+    def test_cpu_of_busy_process(self, mocker):
+        busy_proc = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+
+        try:
+            # Every status request resolves a new Process object, like a PID lookup does.
+            mocker.patch(
+                "application.common.toolbox._get_game_procs",
+                side_effect=lambda games: {"valheim": psutil.Process(busy_proc.pid)},
+            )
+            games = [{"game_name": "valheim", "game_pid": busy_proc.pid}]
+
+            statuses = toolbox._get_game_server_statuses(games)
+            assert statuses["valheim"]["cpu_percent"] is None
+
+            time.sleep(0.5)
+
+            statuses = toolbox._get_game_server_statuses(games)
+            assert statuses["valheim"]["cpu_percent"] > 0.0
+        finally:
+            busy_proc.kill()
+            busy_proc.wait()
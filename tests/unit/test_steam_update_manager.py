@@ -0,0 +1,122 @@
+import time
+
+from application.managers.steam_manager import SteamAppInfoCache, SteamUpdateManager
+
+STEAM_ID = 896660
+
+
+class TestSteamUpdateManager:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def test_build_id_is_cached(self, steamcmd_api):
+        steamcmd_api.set_build_id(STEAM_ID, 100)
+        steam_mgr = SteamUpdateManager(
+            base_format_url=steamcmd_api.base_format_url, cache=SteamAppInfoCache()
+        )
+
+        for _ in range(5):
+            assert steam_mgr._get_build_id(STEAM_ID) == 100
+
+        assert steamcmd_api.num_requests == 1
+
+        update_dict = steam_mgr.is_update_required(90, "public", STEAM_ID)
+        assert update_dict["is_required"]
+        assert update_dict["target_version"] == 100
+        assert steamcmd_api.num_requests == 1
+
+    def test_expired_entry_is_revalidated(self, steamcmd_api, mocker):
+        steamcmd_api.set_build_id(STEAM_ID, 100)
+        steam_mgr = SteamUpdateManager(
+            base_format_url=steamcmd_api.base_format_url,
+            cache=SteamAppInfoCache(ttl_seconds=60),
+        )
+
+        assert steam_mgr._get_build_id(STEAM_ID) == 100
+
+        # Unchanged upstream, a 304 renews the entry.
+        now = time.monotonic()
+        mocker.patch("time.monotonic", return_value=now + 61)
+        assert steam_mgr._get_build_id(STEAM_ID) == 100
+        assert steamcmd_api.num_not_modified == 1
+
+        # A new build is picked up at the next revalidation.
+        steamcmd_api.set_build_id(STEAM_ID, 101)
+        mocker.patch("time.monotonic", return_value=now + 122)
+        assert steam_mgr._get_build_id(STEAM_ID) == 101
+        assert steamcmd_api.num_requests == 3
+
+    def test_unreachable_api_uses_last_known_build_id(self, steamcmd_api, mocker):
+        steamcmd_api.set_build_id(STEAM_ID, 100)
+        cache = SteamAppInfoCache(ttl_seconds=60)
+        steam_mgr = SteamUpdateManager(
+            base_format_url=steamcmd_api.base_format_url, cache=cache
+        )
+
+        assert steam_mgr._get_build_id(STEAM_ID) == 100
+
+        # Nothing listens on port 1.
+        steam_mgr = SteamUpdateManager(
+            base_format_url="http://127.0.0.1:1/v1/info/{STEAM_ID}", cache=cache
+        )
+        mocker.patch("time.monotonic", return_value=time.monotonic() + 61)
+
+        assert steam_mgr._get_build_id(STEAM_ID) == 100
+        assert steam_mgr._get_build_id(STEAM_ID, branch="beta") is None
+
+    def _get_games(self, steam_ids: list) -> list:
+        return [
+            {
+                "game_steam_id": steam_id,
+                "game_steam_build_id": 1,
+                "game_steam_build_branch": "public",
+            }
+            for steam_id in steam_ids
+        ]
+
+    def test_updates_checked_concurrently(self, steamcmd_api):
+        steam_ids = [STEAM_ID + index for index in range(4)]
+
+        for steam_id in steam_ids:
+            steamcmd_api.set_build_id(steam_id, 2)
+
+        steamcmd_api.latency_seconds = 0.2
+        steam_mgr = SteamUpdateManager(
+            base_format_url=steamcmd_api.base_format_url, cache=SteamAppInfoCache()
+        )
+
+        # The same game twice is looked up once.
+        games = self._get_games(steam_ids + [STEAM_ID])
+
+        start = time.monotonic()
+        update_dicts = steam_mgr.are_updates_required(games)
+        elapsed = time.monotonic() - start
+
+        assert elapsed < 0.2 * len(steam_ids)
+        assert steamcmd_api.num_requests == len(steam_ids)
+        assert [update_dict["is_required"] for update_dict in update_dicts] == [
+            True
+        ] * len(games)
+
+    def test_slow_upstream_misses_deadline(self, steamcmd_api):
+        steamcmd_api.set_build_id(STEAM_ID, 2)
+        steamcmd_api.latency_seconds = 0.3
+        steam_mgr = SteamUpdateManager(
+            base_format_url=steamcmd_api.base_format_url, cache=SteamAppInfoCache()
+        )
+
+        start = time.monotonic()
+        update_dicts = steam_mgr.are_updates_required(
+            self._get_games([STEAM_ID]), deadline_seconds=0.05
+        )
+
+        assert time.monotonic() - start < 0.3
+        assert update_dicts == [None]
+
+        # Let the late lookup finish before the stub is stopped.
+        time.sleep(0.5)
@@ -0,0 +1,72 @@
+import os
+import tempfile
+
+from application.managers.tombstone_manager import TombstoneManager
+
+
+class TestTombstoneManager:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _make_tree(self, root: str) -> None:
+        for dir_index in range(5):
+            sub_dir = os.path.join(root, f"dir_{dir_index}", "nested")
+            os.makedirs(sub_dir)
+            for file_index in range(3):
+                with open(os.path.join(sub_dir, f"file_{file_index}.dat"), "w") as f:
+                    f.write("data")
+
+        with open(os.path.join(root, "top_level.dat"), "w") as f:
+            f.write("data")
+
+    def test_delete_in_background(self):
+        with tempfile.TemporaryDirectory() as parent_dir:
+            install_dir = os.path.join(parent_dir, "game_install")
+            self._make_tree(install_dir)
+
+            delete_thread = TombstoneManager().delete_in_background(install_dir)
+
+            # The install path is free right away, the tombstone goes away in the background.
+            assert not os.path.exists(install_dir)
+
+            delete_thread.join(timeout=10)
+
+            assert not delete_thread.is_alive()
+            assert os.listdir(parent_dir) == []
+
+    def test_delete_missing_directory(self):
+        with tempfile.TemporaryDirectory() as parent_dir:
+            install_dir = os.path.join(parent_dir, "not_installed")
+
+            delete_thread = TombstoneManager().delete_in_background(install_dir)
+            delete_thread.join(timeout=10)
+
+            assert not delete_thread.is_alive()
+            assert os.listdir(parent_dir) == []
+
+    def test_sweep_left_over_tombstones(self):
+        with tempfile.TemporaryDirectory() as parent_dir:
+            manager = TombstoneManager()
+            install_dir = os.path.join(parent_dir, "game_install")
+            self._make_tree(install_dir)
+
+            # A crash right after the rename leaves the tombstone behind.
+            tombstone = manager.tombstone(install_dir)
+            os.makedirs(os.path.join(parent_dir, "other_game"))
+            os.makedirs(os.path.join(parent_dir, "my.deleting-files"))
+
+            assert manager.find_tombstones([parent_dir, "/does/not/exist"]) == [
+                tombstone
+            ]
+
+            sweep_thread = manager.sweep([parent_dir])
+            sweep_thread.join(timeout=10)
+
+            assert not sweep_thread.is_alive()
+            assert sorted(os.listdir(parent_dir)) == ["my.deleting-files", "other_game"]
+            assert manager.sweep([parent_dir]) is None
@@ -0,0 +1,85 @@
+import os
+import stat
+import tempfile
+import threading
+
+from application.common import toolbox
+from application.managers.steam_manager import SteamManager
+
+
+class TestToolbox:
+    @classmethod
+    def setup_class(cls):
+        pass
+
+    @classmethod
+    def teardown_class(cls):
+        pass
+
+    def _get_mode(self, path: str) -> int:
+        return stat.S_IMODE(os.stat(path).st_mode)
+
+    def test_recursive_chmod_is_incremental(self):
+        with tempfile.TemporaryDirectory() as root:
+            nested_dir = os.path.join(root, "a", "b")
+            os.makedirs(nested_dir)
+            file_path = os.path.join(nested_dir, "file.txt")
+
+            with open(file_path, "w") as f:
+                f.write("data")
+
+            os.chmod(file_path, 0o644)
+
+            # Two directories and one file.
+            assert toolbox.recursive_chmod(root) == 3
+            assert self._get_mode(file_path) == 0o777
+            assert self._get_mode(nested_dir) == 0o777
+
+            # Nothing left to change the second time.
+            assert toolbox.recursive_chmod(root) == 0
+
+    def test_steam_manager_cached_per_path(self, mocker):
+        mocker.patch("application.managers.steam_manager.Steamcmd")
+        chmod = mocker.patch("application.common.toolbox.recursive_chmod")
+
+        with tempfile.TemporaryDirectory() as steam_dir:
+            steam_mgr = SteamManager.get_instance(steam_dir)
+
+            assert SteamManager.get_instance(steam_dir) is steam_mgr
+            assert SteamManager.get_instance(steam_dir + os.sep) is steam_mgr
+            assert chmod.call_count == 1
+
+            # Installing steamcmd is only done the first time it is asked for.
+            SteamManager.get_instance(steam_dir, force_steam_install=False)
+            SteamManager.get_instance(steam_dir, force_steam_install=False)
+            assert steam_mgr._steam.install.call_count == 1
+
+    def test_steam_manager_locks_per_path(self, mocker):
+        steamcmd = mocker.patch("application.managers.steam_manager.Steamcmd")
+        mocker.patch("application.common.toolbox.recursive_chmod")
+        started = threading.Event()
+        release = threading.Event()
+
+        def _slow_install(force):
+            started.set()
+            release.wait(10)
+
+        steamcmd.return_value.install.side_effect = _slow_install
+
+        with tempfile.TemporaryDirectory() as slow_dir, tempfile.TemporaryDirectory() as other_dir:
+            slow_thread = threading.Thread(
+                target=SteamManager.get_instance,
+                args=(slow_dir,),
+                kwargs={"force_steam_install": False},
+            )
+            slow_thread.start()
+
+            try:
+                assert started.wait(10)
+
+                # Another steam directory does not wait for the steamcmd install.
+                assert SteamManager.get_instance(other_dir) is not None
+                assert slow_thread.is_alive()
+            finally:
+                release.set()
+                slow_thread.join(timeout=10)